@@ -7,6 +7,7 @@ from config import (
     get_web_browser_label,
     load_settings,
     save_settings,
+    DEFAULT_CACHE_BUDGET_MB,
     THUMBNAIL_CACHE_DIR,
     get_status_source_diagnostics,
 )
@@ -21,11 +22,14 @@ from ui import (
     create_navigation_rail,
 )
 from status_handler import (
-    count_statuses,
+    download_statuses,
     get_status_item_key,
     get_status_preview_path,
     load_statuses,
+    prune_status_caches,
+    query_statuses,
     refresh_status_cache,
+    stream_statuses,
     warm_status_previews,
 )
 from live_text_hydration import (
@@ -35,6 +39,12 @@ from live_text_hydration import (
 from utils import get_cached_thumbnail
 
 
+def _format_cache_budget(size_mb):
+    if size_mb >= 1024:
+        return f"{size_mb / 1024:g} GB"
+    return f"{size_mb} MB"
+
+
 def show_snack_bar(page, message):
     normalized_message = message.strip()
     lowered_message = normalized_message.lower()
@@ -46,6 +56,12 @@ def show_snack_bar(page, message):
             .replace("Downloaded:", "Saved")
             .strip()
         )
+    elif lowered_message.startswith("downloaded "):
+        display_message = (
+            normalized_message.split(" to ", 1)[0]
+            .replace("Downloaded", "Saved", 1)
+            .strip()
+        )
     elif lowered_message.startswith("deleted:"):
         display_message = normalized_message.replace("Deleted:", "Removed").strip()
     elif lowered_message.startswith("error"):
@@ -75,6 +91,8 @@ async def main(page: ft.Page):
     MEDIA_BATCH_SIZE = 24
     PREVIEW_BATCH_SIZE = 8
     LOAD_MORE_THRESHOLD_PX = 160
+    CACHE_PRUNE_INTERVAL_SECONDS = 15 * 60
+    CACHE_BUDGET_CHOICES_MB = (512, 1024, 2048, 5120, 10240)
 
     page.title = "WhatsApp Status Saver"
     page.window.width = 1200
@@ -103,6 +121,10 @@ async def main(page: ft.Page):
         current_web_browser = "chrome"
     current_web_profile = settings.get("web_profile", "")
     auto_refresh_enabled = bool(settings.get("auto_refresh_enabled", False))
+    try:
+        cache_budget_mb = max(1, int(settings.get("cache_budget_mb", DEFAULT_CACHE_BUDGET_MB)))
+    except (TypeError, ValueError):
+        cache_budget_mb = DEFAULT_CACHE_BUDGET_MB
     current_scroll_pixels = 0.0
     pending_auto_refresh = {
         "index": None,
@@ -141,6 +163,7 @@ async def main(page: ft.Page):
         "total_count": 0,
         "has_more": False,
         "is_loading_more": False,
+        "is_scanning": False,
         "card_handles": {},
         "footer_label": None,
     }
@@ -461,7 +484,9 @@ async def main(page: ft.Page):
         total = current_view["total_count"]
         ftype = current_view["file_type"]
         footer = f"Showing {shown} of {total} {ftype} from {get_source_label()}"
-        if current_view["is_loading_more"]:
+        if current_view["is_scanning"]:
+            footer += " - Still scanning..."
+        elif current_view["is_loading_more"]:
             footer += " - Loading more..."
         elif not current_view["has_more"]:
             footer += " - All loaded"
@@ -570,7 +595,7 @@ async def main(page: ft.Page):
         else:
             show_snack_bar(page, message)
 
-    async def warm_current_batch(load_token, index, items):
+    async def warm_current_batch(load_token, index, items, prefetch=False):
         if not items:
             return
         text_items_to_prepare = [
@@ -583,7 +608,7 @@ async def main(page: ft.Page):
                 page,
                 f"Preparing {len(text_items_to_prepare)} text preview{'s' if len(text_items_to_prepare) != 1 else ''}",
             )
-        warmed_paths = await asyncio.to_thread(warm_status_previews, items)
+        warmed_paths = await asyncio.to_thread(warm_status_previews, items, prefetch)
         if warmed_paths:
             await asyncio.to_thread(warm_thumbnails, warmed_paths)
         if current_view["token"] != load_token or current_view["index"] != index:
@@ -604,6 +629,50 @@ async def main(page: ft.Page):
             )
             page.run_task(hydrate_texts_in_background, load_token, index, list(items))
 
+    async def render_streamed_statuses(load_token, index, file_type):
+        # Shows the newest cards found so far while a source is scanned for
+        # the first time; show_content reconciles them with the final index.
+        stream = stream_statuses(
+            file_type,
+            current_source,
+            current_web_browser,
+            current_web_profile,
+        )
+        discovered = {}
+        shown = False
+        while True:
+            batch = await asyncio.to_thread(next, stream, None)
+            if batch is None:
+                break
+            if current_view["token"] != load_token or current_view["index"] != index:
+                # A newer load owns current_view and runs its own scan; stop
+                # reading this one instead of finishing it in the background.
+                await asyncio.to_thread(stream.close)
+                return False
+
+            for item in batch:
+                discovered[get_status_item_key(item)] = item
+            if not shown and len(discovered) < MEDIA_BATCH_SIZE:
+                continue
+
+            if not shown:
+                current_view["items"] = sorted(
+                    discovered.values(),
+                    key=lambda item: item.timestamp or 0.0,
+                    reverse=True,
+                )[:MEDIA_BATCH_SIZE]
+                current_view["loaded_count"] = len(current_view["items"])
+                current_view["is_scanning"] = True
+                append_media_items(current_view["items"])
+                shown = True
+            current_view["total_count"] = len(discovered)
+            render_media_content()
+            page.update()
+
+        if shown and current_view["token"] == load_token and current_view["index"] == index:
+            current_view["is_scanning"] = False
+        return shown
+
     async def refresh_downloads():
         await show_content(3)
 
@@ -616,18 +685,9 @@ async def main(page: ft.Page):
         load_token = current_view["token"] + 1
         current_view["token"] = load_token
 
-        total_count = await asyncio.to_thread(
-            count_statuses,
-            file_type,
-            save_dir,
-            current_source,
-            current_web_browser,
-            current_web_profile,
-        )
-        target_count = max(current_view["loaded_count"], MEDIA_BATCH_SIZE)
-        target_count = min(max(target_count + 12, MEDIA_BATCH_SIZE), max(total_count, MEDIA_BATCH_SIZE))
-        latest_items = await asyncio.to_thread(
-            load_statuses,
+        target_count = max(current_view["loaded_count"], MEDIA_BATCH_SIZE) + 12
+        result = await asyncio.to_thread(
+            query_statuses,
             file_type,
             save_dir,
             1,
@@ -637,12 +697,13 @@ async def main(page: ft.Page):
             current_web_browser,
             current_web_profile,
         )
+        total_count = result["total_count"]
 
         if current_view["index"] != index or current_view["token"] != load_token:
             return
 
         previous_keys = {get_status_item_key(item) for item in current_view["items"]}
-        current_view["items"] = list(latest_items)
+        current_view["items"] = list(result["items"])
         current_view["loaded_count"] = len(current_view["items"])
         current_view["total_count"] = total_count
         current_view["has_more"] = current_view["loaded_count"] < total_count
@@ -676,16 +737,8 @@ async def main(page: ft.Page):
             source_signature = get_source_signature()
             snapshot = {}
             for file_type in get_media_file_types():
-                total = await asyncio.to_thread(
-                    count_statuses,
-                    file_type,
-                    save_dir,
-                    current_source,
-                    current_web_browser,
-                    current_web_profile,
-                )
-                latest_items = await asyncio.to_thread(
-                    load_statuses,
+                result = await asyncio.to_thread(
+                    query_statuses,
                     file_type,
                     save_dir,
                     1,
@@ -695,8 +748,7 @@ async def main(page: ft.Page):
                     current_web_browser,
                     current_web_profile,
                 )
-                latest_key = get_status_item_key(latest_items[0]) if latest_items else None
-                snapshot[file_type] = (total, latest_key)
+                snapshot[file_type] = (result["total_count"], result["newest_key"])
 
             previous_snapshot = auto_refresh_snapshots.get(source_signature)
             auto_refresh_snapshots[source_signature] = snapshot
@@ -728,6 +780,12 @@ async def main(page: ft.Page):
                 pending_auto_refresh["message"] = message
                 show_snack_bar(page, message)
 
+    # ── Cache maintenance ──────────────────────────────────────────────────────
+    async def cache_maintenance_loop():
+        while True:
+            await asyncio.sleep(CACHE_PRUNE_INTERVAL_SECONDS)
+            await asyncio.to_thread(prune_status_caches, cache_budget_mb)
+
     # ── Infinite scroll ────────────────────────────────────────────────────────
     async def maybe_load_more():
         if (
@@ -833,12 +891,17 @@ async def main(page: ft.Page):
             page.update()
             return
 
-        page_number = (current_view["loaded_count"] // MEDIA_BATCH_SIZE) + 1
+        streamed = False
         if not append:
             render_loading("Reading local status records...", f"Preparing {file_type} from {get_source_label()}")
             page.update()
-        batch_items = await asyncio.to_thread(
-            load_statuses,
+            streamed = await render_streamed_statuses(load_token, index, file_type)
+            if current_view["token"] != load_token or current_view["index"] != index:
+                return
+
+        page_number = 1 if not append else (current_view["loaded_count"] // MEDIA_BATCH_SIZE) + 1
+        result = await asyncio.to_thread(
+            query_statuses,
             file_type,
             save_dir,
             page_number,
@@ -848,19 +911,8 @@ async def main(page: ft.Page):
             current_web_browser,
             current_web_profile,
         )
-        total_count = current_view["total_count"]
-        if not append or total_count <= 0:
-            if not append:
-                render_loading("Counting available statuses...", f"Building the {file_type} view")
-                page.update()
-            total_count = await asyncio.to_thread(
-                count_statuses,
-                file_type,
-                save_dir,
-                current_source,
-                current_web_browser,
-                current_web_profile,
-            )
+        batch_items = result["items"]
+        total_count = result["total_count"]
 
         if current_view["token"] != load_token or current_view["index"] != index:
             return
@@ -879,10 +931,13 @@ async def main(page: ft.Page):
             page.update()
             return
 
-        if not append:
+        if not append and not streamed:
             render_loading("Preparing the view...", "Laying out cards and warming previews")
             page.update()
-        append_media_items(batch_items if append else current_view["items"])
+        if append:
+            append_media_items(batch_items)
+        else:
+            sync_media_items(current_view["items"])
         render_media_content()
         page.update()
 
@@ -891,7 +946,7 @@ async def main(page: ft.Page):
         if preview_items:
             page.run_task(warm_current_batch, load_token, index, preview_items)
         if remaining_items:
-            page.run_task(warm_current_batch, load_token, index, remaining_items)
+            page.run_task(warm_current_batch, load_token, index, remaining_items, True)
 
     # ── Settings view ──────────────────────────────────────────────────────────
     def show_settings():
@@ -944,6 +999,30 @@ async def main(page: ft.Page):
         )
         auto_refresh_switch = ft.Switch(value=auto_refresh_enabled, on_change=on_auto_refresh_change)
 
+        async def on_cache_budget_change(e):
+            nonlocal cache_budget_mb
+            cache_budget_mb = int(e.control.value)
+            settings["cache_budget_mb"] = cache_budget_mb
+            save_settings(settings)
+            result = await asyncio.to_thread(prune_status_caches, cache_budget_mb)
+            if result and result["removed_files"]:
+                show_snack_bar(page, f"Cache limit updated, freed {result['removed_bytes'] // (1024 * 1024)} MB")
+            else:
+                show_snack_bar(page, "Cache limit updated")
+
+        cache_budget_options = sorted({*CACHE_BUDGET_CHOICES_MB, cache_budget_mb})
+        cache_budget_dropdown = ft.Dropdown(
+            value=str(cache_budget_mb),
+            options=[
+                ft.dropdown.Option(key=str(size_mb), text=_format_cache_budget(size_mb))
+                for size_mb in cache_budget_options
+            ],
+            dense=True,
+            width=140,
+            border_radius=12,
+            on_select=on_cache_budget_change,
+        )
+
         def _row_setting(icon, title, subtitle, action):
             return ft.Container(
                 content=ft.Row(
@@ -1043,6 +1122,12 @@ async def main(page: ft.Page):
                             "Refresh statuses quietly in the background without interrupting your browsing",
                             auto_refresh_switch,
                         ),
+                        _row_setting(
+                            ft.Icons.STORAGE,
+                            "Cache size limit",
+                            "Least recently viewed media and previews are removed above this size",
+                            cache_budget_dropdown,
+                        ),
                         _row_setting(
                             ft.Icons.AUTO_DELETE,
                             "Thumbnail cache",
@@ -1088,6 +1173,31 @@ async def main(page: ft.Page):
 
     theme_icon_btn.on_click = theme_changed
 
+    # ── Save all ───────────────────────────────────────────────────────────────
+    save_all_btn = ft.IconButton(
+        icon=ft.Icons.DOWNLOAD_FOR_OFFLINE_OUTLINED,
+        icon_color=ft.Colors.ON_SURFACE_VARIANT,
+        tooltip="Save all loaded statuses",
+        icon_size=20,
+    )
+
+    async def save_all_loaded(_):
+        items = list(current_view["items"])
+        if current_view["index"] not in get_media_tab_indexes() or not items:
+            show_snack_bar(page, "No statuses to save")
+            return
+
+        save_all_btn.disabled = True
+        save_all_btn.update()
+        try:
+            result = await download_statuses(items, save_dir)
+        finally:
+            save_all_btn.disabled = False
+            save_all_btn.update()
+        show_snack_bar(page, result)
+
+    save_all_btn.on_click = save_all_loaded
+
     # ── Tab change ─────────────────────────────────────────────────────────────
     async def on_tab_change(e):
         await show_content(e.control.selected_index)
@@ -1124,7 +1234,7 @@ async def main(page: ft.Page):
 
     # ── Page layout ────────────────────────────────────────────────────────────
     rail = create_navigation_rail(on_tab_change)
-    title_bar = create_title_bar(page, refresh_current_view, theme_icon_btn)
+    title_bar = create_title_bar(page, refresh_current_view, theme_icon_btn, save_all_btn)
 
     page.add(
         ft.Column(
@@ -1146,5 +1256,6 @@ async def main(page: ft.Page):
     )
 
     page.run_task(background_refresh_loop)
+    page.run_task(cache_maintenance_loop)
     page.run_task(show_content, 0)
     return page
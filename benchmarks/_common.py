@@ -0,0 +1,103 @@
+"""Helpers shared by the benchmark scripts.
+
+``load_module_at`` imports a module as it was at an earlier git revision, so
+every benchmark can compare the current code against the code it replaced
+without keeping old copies in the tree. The baseline still imports the
+current versions of its sibling modules.
+
+Every script takes the baseline as a required ``--baseline`` revision, such
+as the branch the change is compared against; hashes of individual commits
+do not survive a rebase and are missing from shallow clones.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import types
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_revision(revision: str) -> str:
+    """``argparse`` type that resolves ``revision`` to a commit hash."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise argparse.ArgumentTypeError(
+            f"{revision!r} is not a commit in this repository (a shallow clone or archive may lack it)"
+        )
+    return result.stdout.strip()
+
+
+def load_module_at(revision: str, module_name: str = "webview_status_source") -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{module_name}.py"],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    ).stdout
+    baseline_name = f"{module_name}_at_{revision.replace('~', '_').replace('^', '_')}"
+    module = types.ModuleType(baseline_name)
+    module.__file__ = os.path.join(REPO_ROOT, f"{module_name}.py")
+    # dataclasses look their module up in sys.modules while the class is built.
+    sys.modules[baseline_name] = module
+    exec(compile(source, f"{module_name}.py@{revision}", "exec"), module.__dict__)
+    return module
+
+
+def best_of(runs: int, function) -> float:
+    """Smallest wall time of ``runs`` calls of ``function``, in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_working_set()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _windows_peak_working_set() -> int | None:
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return None
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
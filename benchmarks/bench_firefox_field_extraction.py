@@ -0,0 +1,241 @@
+"""Firefox blob field extraction, per-field helpers versus the single extractor.
+
+Builds 3000 synthetic WhatsApp Web messages (photo, video and text statuses,
+some with embedded music) as SpiderMonkey structured clones, and times
+
+* ``fields``: the baseline's twelve ``_extract_firefox_*`` helpers against
+  ``_extract_firefox_fields``;
+* ``record``: the baseline's byte-searching ``_build_status_record_from_firefox_message``
+  against the current ``_build_status_record_from_firefox_blob``.
+
+Both run on the raw clones and, when python-snappy or cramjam is installed,
+on the snappy-compressed values Firefox actually stores. Timings are the best
+of N interleaved runs.
+
+    python -m benchmarks.bench_firefox_field_extraction --baseline REV [--blobs N] [--runs N]
+"""
+
+import argparse
+import base64
+import random
+import struct
+
+from benchmarks._common import best_of, git_revision, load_module_at
+import webview_status_source
+
+try:
+    import snappy
+
+    HAS_SNAPPY = True
+except ImportError:
+    HAS_SNAPPY = False
+
+try:
+    import cramjam
+
+    HAS_CRAMJAM = True
+except ImportError:
+    HAS_CRAMJAM = False
+
+
+SOURCE_CONFIG = {"key": "firefox-benchmark", "label": "WhatsApp Web (Firefox)", "indexeddb_dir": "", "blob_dir": None}
+RECORD_FIELDS = (
+    "status_id", "kind", "mimetype", "url", "direct_path", "filehash", "enc_filehash",
+    "media_key", "source_offset", "timestamp", "text_subtype", "background_color",
+    "text_color", "font_id",
+) + webview_status_source.STATUS_EXTRA_FIELDS
+
+SCTAG_HEADER = 0xFFF10000
+SCTAG_NULL = 0xFFFF0000
+SCTAG_BOOLEAN = 0xFFFF0002
+SCTAG_INT32 = 0xFFFF0003
+SCTAG_STRING = 0xFFFF0004
+SCTAG_ARRAY_OBJECT = 0xFFFF0007
+SCTAG_OBJECT_OBJECT = 0xFFFF0008
+SCTAG_END_OF_KEYS = 0xFFFF0013
+
+
+def _pair(tag: int, data: int) -> bytes:
+    return struct.pack("<II", data & 0xFFFFFFFF, tag)
+
+
+def _string(value: str) -> bytes:
+    try:
+        raw, length = value.encode("latin-1"), len(value) | 0x80000000
+    except UnicodeEncodeError:
+        raw, length = value.encode("utf-16-le"), len(value)
+    return _pair(SCTAG_STRING, length) + raw + b"\x00" * (-len(raw) % 8)
+
+
+def _value(value) -> bytes:
+    if value is None:
+        return _pair(SCTAG_NULL, 0)
+    if isinstance(value, bool):
+        return _pair(SCTAG_BOOLEAN, int(value))
+    if isinstance(value, int) and -2**31 <= value < 2**31:
+        return _pair(SCTAG_INT32, value)
+    if isinstance(value, (int, float)):
+        return struct.pack("<d", float(value))
+    if isinstance(value, str):
+        return _string(value)
+    if isinstance(value, dict):
+        body = b"".join(_string(key) + _value(item) for key, item in value.items())
+        return _pair(SCTAG_OBJECT_OBJECT, 0) + body + _pair(SCTAG_END_OF_KEYS, 0)
+    if isinstance(value, list):
+        body = b"".join(_pair(SCTAG_INT32, index) + _value(item) for index, item in enumerate(value))
+        return _pair(SCTAG_ARRAY_OBJECT, len(value)) + body + _pair(SCTAG_END_OF_KEYS, 0)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def serialize_structured_clone(value) -> bytes:
+    return _pair(SCTAG_HEADER, 2) + _value(value)
+
+
+def compress_snappy(data: bytes) -> bytes | None:
+    if HAS_SNAPPY:
+        return snappy.compress(data)
+    if HAS_CRAMJAM:
+        return bytes(cramjam.snappy.compress_raw(data))
+    return None
+
+
+def synthetic_message(rnd: random.Random, index: int) -> dict:
+    def b64(size):
+        return base64.b64encode(rnd.randbytes(size)).decode("ascii")
+
+    kind = rnd.choice(["image", "video", "chat"])
+    timestamp = 1_700_000_000 + index * 37
+    author = f"2547{rnd.randrange(10**8):08d}@c.us"
+    message = {
+        "id": f"false_status@broadcast_3EB0{rnd.randrange(16**16):016X}_{author}",
+        "type": kind,
+        "t": timestamp,
+        "from": "status@broadcast",
+        "to": "254700000000@c.us",
+        "author": author,
+        "ack": rnd.randrange(4),
+        "isNewMsg": False,
+        "star": False,
+    }
+    if kind == "chat":
+        message.update({
+            "body": f"Status text {index} ✨" if index % 3 == 0 else f"Status text {index}",
+            "backgroundColor": -rnd.randrange(2**24),
+            "textColor": -1,
+            "font": rnd.randrange(5),
+            "subtype": "text" if index % 2 else None,
+        })
+        return message
+
+    message.update({
+        "body": b64(rnd.randrange(600, 1500)),
+        "mimetype": "image/jpeg" if kind == "image" else "video/mp4",
+        "filehash": b64(32),
+        "encFilehash": b64(32),
+        "mediaKey": b64(32),
+        "mediaKeyTimestamp": timestamp,
+        "directPath": (
+            f"/v/t62.7118-24/{rnd.randrange(10**8)}_{rnd.randrange(10**15)}_n.enc"
+            f"?ccb=11-4&oh=01_{b64(20)}&oe={rnd.randrange(16**8):08X}&_nc_sid=5e03e0"
+        ),
+        "deprecatedMms3Url": "https://mmg.whatsapp.net/v/t62.7118-24/x.enc",
+        "size": rnd.randrange(10**6),
+        "width": 1080,
+        "height": 1920,
+        "caption": f"caption {index}" if index % 4 == 0 else None,
+        "isViewOnce": False,
+    })
+    if index % 5 == 0:
+        message["embeddedMusic"] = {
+            "title": f"Song {index}",
+            "author": "Artist",
+            "artworkDirectPath": f"/v/t62.1-24/art{index}.enc",
+            "artworkSha256": b64(32),
+            "artworkEncSha256": b64(32),
+            "artworkMediaKey": b64(32),
+            "overlapDurationInMs": 15000,
+        }
+    return message
+
+
+def baseline_fields(module, blob: bytes) -> tuple:
+    return (
+        module._extract_firefox_message_type(blob),
+        module._extract_firefox_status_id(blob),
+        module._extract_firefox_direct_path(blob),
+        module._extract_firefox_filehash(blob),
+        module._extract_firefox_media_key(blob),
+        module._extract_firefox_enc_filehash(blob),
+        module._extract_firefox_timestamp(blob),
+        module._extract_firefox_subtype(blob),
+        module._extract_firefox_background_color(blob),
+        module._extract_firefox_text_color(blob),
+        module._extract_firefox_font_id(blob),
+        module._extract_embedded_music_from_blob(blob),
+    )
+
+
+def record_key(record) -> tuple | None:
+    if record is None:
+        return None
+    return tuple(getattr(record, name) for name in RECORD_FIELDS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline",
+        type=git_revision,
+        required=True,
+        help="git revision to compare against, from before _extract_firefox_fields",
+    )
+    parser.add_argument("--blobs", type=int, default=3000)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    baseline = load_module_at(args.baseline)
+    current = webview_status_source
+    rnd = random.Random(7)
+    clones = [serialize_structured_clone(synthetic_message(rnd, index)) for index in range(args.blobs)]
+    corpora = [("raw", clones)]
+    if compress_snappy(b"") is not None:
+        corpora.insert(0, ("snappy", [compress_snappy(clone) for clone in clones]))
+    else:
+        print("python-snappy and cramjam are not installed; measuring raw structured clones only")
+
+    for corpus_name, blobs in corpora:
+        baseline_records = [
+            record_key(baseline._build_status_record_from_firefox_message(blob, "f", index, SOURCE_CONFIG))
+            for index, blob in enumerate(blobs)
+        ]
+        current_records = [
+            record_key(current._build_status_record_from_firefox_blob(blob, "f", index, SOURCE_CONFIG))
+            for index, blob in enumerate(blobs)
+        ]
+        found = sum(record is not None for record in current_records)
+        print(
+            f"{corpus_name}: {sum(map(len, blobs)) // len(blobs)} bytes per blob, "
+            f"{found} records, identical records: {baseline_records == current_records}"
+        )
+
+        variants = {
+            "fields before": lambda: [baseline_fields(baseline, blob) for blob in blobs],
+            "fields after": lambda: [current._extract_firefox_fields(blob) for blob in blobs],
+            "record before": lambda: [
+                baseline._build_status_record_from_firefox_message(blob, "f", 0, SOURCE_CONFIG) for blob in blobs
+            ],
+            "record after": lambda: [
+                current._build_status_record_from_firefox_blob(blob, "f", 0, SOURCE_CONFIG) for blob in blobs
+            ],
+        }
+        best = dict.fromkeys(variants, float("inf"))
+        # Interleave the variants so drift in machine load hits all of them.
+        for _ in range(args.runs):
+            for name, function in variants.items():
+                best[name] = min(best[name], best_of(1, function))
+        for name, seconds in best.items():
+            print(f"  {name:>13}: {seconds / len(blobs) * 1e6:5.1f} us/blob")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Peak RSS and throughput of the regex fallback scan on a synthetic LevelDB table.
+
+Writes one large ``.ldb`` file of status-like records mixed with chat filler,
+then scans it with ``_load_records_from_regex_fallback`` from the current
+tree and from a baseline revision. Each scan runs in its own process so the
+peak resident set sizes do not mix; the file is read once beforehand so both
+run against a warm page cache.
+
+    python -m benchmarks.bench_regex_fallback_scan --baseline REV [--size-mib N] [--status-ratio R]
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks._common import REPO_ROOT, git_revision, load_module_at, peak_rss_bytes
+
+
+FILLER_WORDS = [
+    b"body", b"type", b"chat", b"from", b"notifyName", b"ack", b"star",
+    b"isForwarded", b"\x00\x01", b"quotedMsg", b"hello", b"media", b"edited",
+]
+
+
+def write_synthetic_table(path: str, size_mib: int, status_ratio: float, seed: int = 1) -> None:
+    """Write ``size_mib`` of filler with a media record roughly every 24 KB.
+
+    ``status_ratio`` of the records are status broadcasts; the rest are the
+    same records sent to a chat, which the scanner must skip.
+    """
+    rnd = random.Random(seed)
+    filler = b'"'.join(rnd.choice(FILLER_WORDS) + bytes([rnd.randrange(256)]) for _ in range(1 << 14))
+    target_bytes = size_mib << 20
+    written = 0
+    index = 0
+    with open(path, "wb") as handle:
+        while written < target_bytes:
+            gap = rnd.randrange(12_000, 36_000)
+            offset = rnd.randrange(0, len(filler) - 1)
+            chunk = (filler[offset:] + filler)[:gap]
+            chat = b"status@broadcast" if rnd.random() < status_ratio else b"1234@c.us"
+            mimetype = rnd.choice([b"image/jpeg", b"video/mp4"])
+            record = (
+                b'"\x02id"\x1efalse_' + chat + b"_3EB0%08d" % index
+                + b'"\x08mimetype"\x0a' + mimetype + b'"'
+                + b'filehash",' + base64.b64encode(rnd.randbytes(32)).rstrip(b"=") + b'"'
+                + b'"\x0bencFilehash",' + base64.b64encode(rnd.randbytes(32)).rstrip(b"=") + b'"'
+                + b'"\x0adirectPath"\x40/v/t62.7118-24/' + str(index).encode() + b'.enc?ccb=11"'
+                + b'"mediaKey",' + base64.b64encode(rnd.randbytes(32)) + b'"'
+                + b'deprecatedMms3Url"\x60https://mmg.whatsapp.net/v/t62.7118-24/'
+                + str(index).encode() + b'.enc"'
+            )
+            handle.write(chunk)
+            handle.write(record)
+            written += len(chunk) + len(record)
+            index += 1
+
+
+def run_scan(revision: str, directory: str) -> dict:
+    if revision == "current":
+        import webview_status_source as module
+    else:
+        module = load_module_at(revision)
+
+    source_config = {
+        "key": f"benchmark-{os.getpid()}",
+        "label": "Benchmark",
+        "indexeddb_dir": directory,
+        "blob_dir": None,
+    }
+    started = time.perf_counter()
+    records = module._load_records_from_regex_fallback(source_config)
+    elapsed = time.perf_counter() - started
+
+    scan_cache_file = getattr(module, "_regex_scan_cache_file_for_source", None)
+    if scan_cache_file is not None and os.path.exists(scan_cache_file(source_config["key"])):
+        os.remove(scan_cache_file(source_config["key"]))
+    return {
+        "records": len(records),
+        "seconds": elapsed,
+        "peak_rss": peak_rss_bytes(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mib", type=int, default=512)
+    parser.add_argument("--status-ratio", type=float, default=0.5)
+    parser.add_argument(
+        "--baseline",
+        type=git_revision,
+        required=True,
+        help="git revision to compare against, from before the scanner used mmap",
+    )
+    parser.add_argument("--scan", nargs=2, metavar=("REVISION", "DIRECTORY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scan:
+        print(json.dumps(run_scan(*args.scan)))
+        return
+
+    directory = tempfile.mkdtemp()
+    try:
+        table_path = os.path.join(directory, "000020.ldb")
+        write_synthetic_table(table_path, args.size_mib, args.status_ratio)
+        with open(table_path, "rb") as handle:
+            while handle.read(1 << 24):
+                pass
+
+        size_mib = os.path.getsize(table_path) / 2**20
+        print(f"{size_mib:.0f} MiB table, {args.status_ratio:.0%} status records")
+        for label, revision in (("before", args.baseline), ("after", "current")):
+            output = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_regex_fallback_scan",
+                    "--baseline", args.baseline, "--scan", revision, directory,
+                ],
+                cwd=REPO_ROOT,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            peak_rss = (
+                f"{result['peak_rss'] / 2**20:.0f} MiB peak RSS"
+                if result["peak_rss"] is not None
+                else "peak RSS unavailable"
+            )
+            print(
+                f"{label:>6}: {result['records']} records, {result['seconds']:.2f}s, "
+                f"{size_mib / result['seconds']:.0f} MiB/s, {peak_rss}"
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Memory per StatusRecord, before and after the slotted record layout.
+
+Builds 10k synthetic Chromium image records (realistic ids, direct paths and
+hashes spread over 40 origin files) with ``_build_status_record_from_message``
+and reports the bytes traced by tracemalloc, for the current tree and for a
+baseline revision.
+
+    python -m benchmarks.bench_status_record_memory --baseline REV [--records N]
+
+REV is any git revision from before the slotted layout, e.g. ``main``.
+"""
+
+import argparse
+import gc
+import os
+import tracemalloc
+
+from benchmarks._common import git_revision, load_module_at
+import webview_status_source
+
+
+SOURCE_CONFIG = {
+    "key": "chrome-profile-1",
+    "label": "WhatsApp Web (Chrome)",
+    "indexeddb_dir": (
+        r"C:\Users\someone\AppData\Local\Google\Chrome\User Data\Profile 1"
+        r"\IndexedDB\https_web.whatsapp.com_0.indexeddb.leveldb"
+    ),
+    "blob_dir": (
+        r"C:\Users\someone\AppData\Local\Google\Chrome\User Data\Profile 1"
+        r"\IndexedDB\https_web.whatsapp.com_0.indexeddb.blob"
+    ),
+}
+ORIGIN_FILES = 40
+
+
+def synthetic_message(index: int) -> dict:
+    return {
+        "type": "image",
+        "mimetype": "image/jpeg",
+        "filehash": "A" * 43 + str(index % 10),
+        "encFilehash": "B" * 43 + str(index % 10),
+        "mediaKey": "C" * 43 + "=",
+        "directPath": (
+            f"/v/t62.7118-24/{index}_{index * 7}_n.enc"
+            f"?ccb=11-4&oh=01_Q5AaI{index}&oe=6{index}&_nc_sid=5e03e0"
+        ),
+        "id": f"false_status@broadcast_3EB0{index:016X}_2547000{index:05d}@c.us",
+        "t": 1_700_000_000 + index,
+        "author": {"_serialized": f"2547000{index:05d}@c.us"},
+    }
+
+
+def measure(module, record_count: int) -> int:
+    messages = [synthetic_message(index) for index in range(record_count)]
+    origins = [
+        os.path.join(SOURCE_CONFIG["indexeddb_dir"], f"{index % ORIGIN_FILES:06d}.ldb")
+        for index in range(record_count)
+    ]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [
+        module._build_status_record_from_message(message, origin, index, SOURCE_CONFIG)
+        for index, (message, origin) in enumerate(zip(messages, origins))
+    ]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    assert all(records)
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline",
+        type=git_revision,
+        required=True,
+        help="git revision to compare against, from before StatusRecord was slotted",
+    )
+    parser.add_argument("--records", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for label, module in (
+        ("before", load_module_at(args.baseline)),
+        ("after", webview_status_source),
+    ):
+        traced_bytes = measure(module, args.records)
+        print(
+            f"{label:>6}: {traced_bytes / 2**20:5.1f} MiB total, "
+            f"{traced_bytes / args.records:7.0f} bytes per record"
+        )
+
+
+if __name__ == "__main__":
+    main()
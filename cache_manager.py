@@ -0,0 +1,221 @@
+"""Keep the status media and thumbnail caches within a byte budget.
+
+Neither cache was pruned before, so expired statuses piled up forever.
+Reads are recorded with ``record_cache_access`` (in memory, no I/O) and
+written to a small SQLite index when ``prune_caches`` runs, which then
+removes, in order:
+
+* interrupted ``.part`` downloads and ``.tmp`` files left behind;
+* entries not read for ``CACHE_MAX_AGE_SECONDS``;
+* media whose record is in none of the loaded source indexes (text status
+  images are exempt: their names depend on hydrated text the indexes lack);
+* the least recently read entries, until the caches fit the budget.
+
+Filesystem atime is not used; it is often disabled or coarse.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from config import SETTINGS_DIR, STATUS_MEDIA_CACHE_DIR, THUMBNAIL_CACHE_DIR
+
+
+CACHE_ACCESS_INDEX_FILE = os.path.join(SETTINGS_DIR, "cache_access_index.sqlite")
+CACHE_ACCESS_INDEX_SCHEMA_VERSION = 1
+CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# Media of a source that was not loaded this session is not in any index;
+# only entries left unread this long are treated as orphaned.
+CACHE_ORPHAN_GRACE_SECONDS = 6 * 60 * 60
+# Generated text status images are named after their hydrated text, which the
+# source indexes do not hold, so only the age and budget rules apply to them.
+CACHE_ORPHAN_EXEMPT_KINDS = ("texts",)
+# Entries read this recently may still be on screen and are never evicted
+# to meet the budget.
+CACHE_RECENT_ACCESS_SECONDS = 10 * 60
+STALE_PARTIAL_SUFFIXES = (".part", ".tmp")
+STALE_PARTIAL_MAX_AGE_SECONDS = 24 * 60 * 60
+
+_PENDING_CACHE_ACCESSES: dict[str, float] = {}
+_PENDING_CACHE_ACCESSES_LOCK = threading.Lock()
+_PRUNE_LOCK = threading.Lock()
+
+
+def record_cache_access(paths) -> None:
+    """Note that the given cache files were just read."""
+    now = time.time()
+    with _PENDING_CACHE_ACCESSES_LOCK:
+        for path in paths:
+            if path:
+                _PENDING_CACHE_ACCESSES[path] = now
+
+
+def prune_caches(
+    budget_bytes: int,
+    live_media_paths: set[str] | None = None,
+) -> dict[str, int]:
+    """Evict cache entries as described in the module docstring.
+
+    ``live_media_paths`` holds the cache paths of every indexed record;
+    ``None`` skips the orphan check. Returns the number of files and bytes
+    removed and the bytes left in the caches. Returns zeros without doing
+    anything while another prune is running.
+    """
+    stats = {"removed_files": 0, "removed_bytes": 0, "cache_bytes": 0}
+    if not _PRUNE_LOCK.acquire(blocking=False):
+        return stats
+
+    try:
+        now = time.time()
+        access_index = _open_cache_access_index()
+        accessed_at = _flush_cache_accesses(access_index)
+
+        evicted: list[tuple[str, int]] = []
+        candidates: list[tuple[float, str, int]] = []
+        cache_entries = _collect_cache_entries()
+        for path, size, modified_at in cache_entries:
+            if path.endswith(STALE_PARTIAL_SUFFIXES):
+                if now - modified_at > STALE_PARTIAL_MAX_AGE_SECONDS:
+                    evicted.append((path, size))
+                continue
+
+            last_access = max(accessed_at.get(path, 0.0), modified_at)
+            idle_seconds = now - last_access
+            if idle_seconds > CACHE_MAX_AGE_SECONDS:
+                evicted.append((path, size))
+            elif (
+                live_media_paths is not None
+                and idle_seconds > CACHE_ORPHAN_GRACE_SECONDS
+                and _is_orphan_candidate(path)
+                and path not in live_media_paths
+            ):
+                evicted.append((path, size))
+            else:
+                candidates.append((last_access, path, size))
+
+        cache_bytes = sum(size for _, _, size in candidates)
+        candidates.sort()
+        for last_access, path, size in candidates:
+            if cache_bytes <= budget_bytes or now - last_access < CACHE_RECENT_ACCESS_SECONDS:
+                break
+            if not size:
+                continue
+            evicted.append((path, size))
+            cache_bytes -= size
+
+        removed_paths: set[str] = set()
+        for path, size in evicted:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error pruning cache file {path}: {str(e)}")
+                continue
+            removed_paths.add(path)
+            stats["removed_files"] += 1
+            stats["removed_bytes"] += size
+
+        if access_index is not None:
+            existing_paths = {path for path, _, _ in cache_entries} - removed_paths
+            _forget_cache_accesses(
+                access_index,
+                [path for path in accessed_at if path not in existing_paths],
+            )
+            access_index.close()
+
+        stats["cache_bytes"] = cache_bytes
+        return stats
+    finally:
+        _PRUNE_LOCK.release()
+
+
+def _is_orphan_candidate(path: str) -> bool:
+    kind_dir = os.path.dirname(path)
+    return (
+        os.path.dirname(kind_dir) == STATUS_MEDIA_CACHE_DIR
+        and os.path.basename(kind_dir) not in CACHE_ORPHAN_EXEMPT_KINDS
+    )
+
+
+def _collect_cache_entries() -> list[tuple[str, int, float]]:
+    """Return ``(path, size, mtime)`` for every cache file.
+
+    Files hardlinked elsewhere, such as statuses saved by ``clone_file``,
+    count as size 0: removing them from the cache frees no disk space.
+    """
+    cache_entries: list[tuple[str, int, float]] = []
+    for cache_dir in (STATUS_MEDIA_CACHE_DIR, THUMBNAIL_CACHE_DIR):
+        for root, _, file_names in os.walk(cache_dir):
+            # The media cache keeps its source indexes and the negative
+            # cache at the top level; only the per-kind folders hold media.
+            if cache_dir == STATUS_MEDIA_CACHE_DIR and root == STATUS_MEDIA_CACHE_DIR:
+                continue
+            for file_name in file_names:
+                path = os.path.join(root, file_name)
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    continue
+                size = stat_result.st_size if stat_result.st_nlink <= 1 else 0
+                cache_entries.append((path, size, stat_result.st_mtime))
+    return cache_entries
+
+
+def _flush_cache_accesses(access_index: sqlite3.Connection | None) -> dict[str, float]:
+    with _PENDING_CACHE_ACCESSES_LOCK:
+        pending_accesses = dict(_PENDING_CACHE_ACCESSES)
+        _PENDING_CACHE_ACCESSES.clear()
+
+    if access_index is None:
+        return pending_accesses
+
+    try:
+        with access_index:
+            access_index.executemany(
+                "INSERT INTO accesses (path, accessed_at) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET accessed_at = MAX(accessed_at, excluded.accessed_at)",
+                pending_accesses.items(),
+            )
+        return dict(access_index.execute("SELECT path, accessed_at FROM accesses"))
+    except sqlite3.Error as e:
+        print(f"Error updating cache access index: {str(e)}")
+        return pending_accesses
+
+
+def _forget_cache_accesses(access_index: sqlite3.Connection, paths: list[str]) -> None:
+    try:
+        with access_index:
+            access_index.executemany(
+                "DELETE FROM accesses WHERE path = ?",
+                [(path,) for path in paths],
+            )
+    except sqlite3.Error as e:
+        print(f"Error updating cache access index: {str(e)}")
+
+
+def _open_cache_access_index() -> sqlite3.Connection | None:
+    try:
+        connection = sqlite3.connect(CACHE_ACCESS_INDEX_FILE, timeout=1)
+    except sqlite3.Error:
+        return None
+
+    try:
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)")
+            schema_version = connection.execute(
+                "SELECT value FROM meta WHERE name = 'schema_version'"
+            ).fetchone()
+            if schema_version is None or schema_version[0] != CACHE_ACCESS_INDEX_SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS accesses")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('schema_version', ?)",
+                    (CACHE_ACCESS_INDEX_SCHEMA_VERSION,),
+                )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS accesses (path TEXT PRIMARY KEY, accessed_at REAL)"
+            )
+    except sqlite3.Error:
+        connection.close()
+        return None
+    return connection
@@ -349,6 +349,10 @@ DEFAULT_SAVE_DIR = os.path.join(os.path.expanduser('~'), 'Downloads', 'WhatsappS
 SETTINGS_FILE = os.path.join(SETTINGS_DIR, "settings.json")
 THUMBNAIL_CACHE_DIR = os.path.join(SETTINGS_DIR, "thumbnail_cache")
 STATUS_MEDIA_CACHE_DIR = os.path.join(SETTINGS_DIR, "status_media_cache")
+# Default combined size limit of the status media and thumbnail caches.
+DEFAULT_CACHE_BUDGET_MB = 2048
+# Worker processes used to decode WebView message records; 1 decodes serially.
+MESSAGE_DECODE_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
 
 def load_settings():
     defaults = {
@@ -358,6 +362,7 @@ def load_settings():
         "web_browser": "chrome",
         "web_profile": "",
         "auto_refresh_enabled": False,
+        "cache_budget_mb": DEFAULT_CACHE_BUDGET_MB,
     }
     if os.path.exists(SETTINGS_FILE):
         with open(SETTINGS_FILE, 'r') as f:
@@ -0,0 +1,124 @@
+"""Place a cached status file in the save directory without copying its bytes.
+
+Saving used to ``shutil.copy`` every file out of the media cache, writing
+each video a second time. ``clone_file`` tries, in order, a hardlink, a
+copy-on-write reflink and an in-kernel copy, and only streams the bytes
+through Python when none of those are available.
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# ioctl request that shares the source's extents with the destination on
+# Btrfs, XFS and other copy-on-write Linux file systems.
+FICLONE = 0x40049409
+
+# Errors meaning the method is not available for this pair of files; the
+# next one is tried.
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.EMLINK,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+
+COPY_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def clone_file(source_path: str, dest_path: str) -> str:
+    """Make ``dest_path`` hold the contents of ``source_path``; return the method used.
+
+    The result is one of ``"existing"``, ``"hardlink"``, ``"reflink"``,
+    ``"copy_file_range"`` or ``"copy"``. The destination is written under a
+    temporary name and moved into place, so it is never left half written.
+    A copy gets the time of the save as its modification time; a hardlink
+    keeps the source's, because the cache orders its entries by that time.
+    """
+    if os.path.exists(dest_path) and os.path.samefile(source_path, dest_path):
+        return "existing"
+
+    dest_dir = os.path.dirname(dest_path) or "."
+    handle, temp_path = tempfile.mkstemp(dir=dest_dir, prefix=".", suffix=".saving")
+    os.close(handle)
+    try:
+        method = _clone_to_temp(source_path, temp_path)
+        if method != "hardlink":
+            os.utime(temp_path)
+        os.replace(temp_path, dest_path)
+        return method
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _clone_to_temp(source_path: str, temp_path: str) -> str:
+    try:
+        os.remove(temp_path)
+        os.link(source_path, temp_path)
+        return "hardlink"
+    except (OSError, NotImplementedError) as error:
+        if isinstance(error, OSError) and error.errno not in UNSUPPORTED_ERRNOS:
+            raise
+
+    with open(source_path, "rb") as source, open(temp_path, "wb") as dest:
+        if _reflink(source, dest):
+            return "reflink"
+        if _copy_file_range(source, dest):
+            return "copy_file_range"
+
+    # copyfile still uses sendfile on Linux and fcopyfile on macOS before it
+    # falls back to a buffered read/write loop.
+    shutil.copyfile(source_path, temp_path)
+    return "copy"
+
+
+def _reflink(source, dest) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+    except OSError as error:
+        if error.errno in UNSUPPORTED_ERRNOS:
+            return False
+        raise
+    return True
+
+
+def _copy_file_range(source, dest) -> bool:
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        return False
+
+    remaining = os.fstat(source.fileno()).st_size
+    copied = 0
+    while remaining > 0:
+        try:
+            sent = copy_file_range(source.fileno(), dest.fileno(), min(remaining, COPY_CHUNK_BYTES))
+        except OSError as error:
+            if copied == 0 and error.errno in UNSUPPORTED_ERRNOS:
+                return False
+            raise
+        if sent == 0:
+            # The source ended early or the file system gave up; the caller
+            # rewrites the whole file with a plain copy.
+            return False
+        copied += sent
+        remaining -= sent
+    return True
@@ -0,0 +1,374 @@
+"""Decoder for the values Firefox keeps in its IndexedDB ``object_data`` table.
+
+Firefox stores every IndexedDB value as a SpiderMonkey structured clone,
+compressed with raw (unframed) snappy. ``decode_structured_clone`` undoes both
+and returns plain Python values in the same shape the Chromium V8 reader
+produces: objects become dicts, arrays lists, strings str, numbers int/float
+and array buffers or typed arrays bytes. Sparse arrays, whose declared length
+is more than their data could fill, become dicts keyed by index.
+
+Only the parts of the format that page data can contain are supported. DOM
+objects such as Blob references raise ``ValueError`` like any other malformed
+input, so callers can fall back to something else.
+"""
+
+import struct
+
+try:
+    import snappy
+
+    HAS_SNAPPY = True
+except ImportError:
+    HAS_SNAPPY = False
+
+
+SCTAG_FLOAT_MAX = 0xFFF00000
+SCTAG_HEADER = 0xFFF10000
+SCTAG_NULL = 0xFFFF0000
+SCTAG_UNDEFINED = 0xFFFF0001
+SCTAG_BOOLEAN = 0xFFFF0002
+SCTAG_INT32 = 0xFFFF0003
+SCTAG_STRING = 0xFFFF0004
+SCTAG_DATE_OBJECT = 0xFFFF0005
+SCTAG_REGEXP_OBJECT = 0xFFFF0006
+SCTAG_ARRAY_OBJECT = 0xFFFF0007
+SCTAG_OBJECT_OBJECT = 0xFFFF0008
+SCTAG_ARRAY_BUFFER_OBJECT_V2 = 0xFFFF0009
+SCTAG_BOOLEAN_OBJECT = 0xFFFF000A
+SCTAG_STRING_OBJECT = 0xFFFF000B
+SCTAG_NUMBER_OBJECT = 0xFFFF000C
+SCTAG_BACK_REFERENCE_OBJECT = 0xFFFF000D
+SCTAG_TYPED_ARRAY_OBJECT_V2 = 0xFFFF0010
+SCTAG_MAP_OBJECT = 0xFFFF0011
+SCTAG_SET_OBJECT = 0xFFFF0012
+SCTAG_END_OF_KEYS = 0xFFFF0013
+SCTAG_DATA_VIEW_OBJECT_V2 = 0xFFFF0015
+SCTAG_BIGINT = 0xFFFF001D
+SCTAG_BIGINT_OBJECT = 0xFFFF001E
+SCTAG_ARRAY_BUFFER_OBJECT = 0xFFFF001F
+SCTAG_TYPED_ARRAY_OBJECT = 0xFFFF0020
+SCTAG_DATA_VIEW_OBJECT = 0xFFFF0021
+SCTAG_RESIZABLE_ARRAY_BUFFER_OBJECT = 0xFFFF0023
+SCTAG_TYPED_ARRAY_V1_MIN = 0xFFFF0100
+SCTAG_TYPED_ARRAY_V1_MAX = 0xFFFF01FF
+
+STRING_LATIN1_FLAG = 0x80000000
+BIGINT_NEGATIVE_FLAG = 0x80000000
+# Element sizes indexed by SpiderMonkey's Scalar::Type.
+TYPED_ARRAY_ELEMENT_SIZES = (1, 1, 2, 2, 4, 4, 4, 8, 1, 8, 8, 2)
+
+_PAIR = struct.Struct("<II")
+_UINT64 = struct.Struct("<Q")
+_DOUBLE = struct.Struct("<d")
+
+
+def decode_structured_clone(data: bytes):
+    """Decode one ``object_data.data`` value, decompressing it first if needed.
+
+    Raises ``ValueError`` when the value is not a structured clone this
+    decoder understands.
+    """
+    if not _starts_with_header(data):
+        data = decompress_snappy(data)
+        if not _starts_with_header(data):
+            raise ValueError("Value is not a structured clone")
+    return _StructuredCloneReader(data).read_root()
+
+
+def decompress_snappy(data: bytes) -> bytes:
+    """Decompress a raw snappy block, using python-snappy when it is installed."""
+    if HAS_SNAPPY:
+        try:
+            return snappy.uncompress(data)
+        except Exception as error:
+            raise ValueError(f"Invalid snappy data: {error}") from None
+    return _decompress_snappy_block(data)
+
+
+def _starts_with_header(data: bytes) -> bool:
+    return len(data) >= 8 and _PAIR.unpack_from(data, 0)[1] == SCTAG_HEADER
+
+
+def _decompress_snappy_block(data: bytes) -> bytes:
+    expected_length = 0
+    shift = 0
+    position = 0
+    while True:
+        if position >= len(data) or shift > 28:
+            raise ValueError("Invalid snappy length preamble")
+        byte = data[position]
+        position += 1
+        expected_length |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+
+    output = bytearray()
+    written = 0
+    data_length = len(data)
+    while position < data_length:
+        tag = data[position]
+        position += 1
+        element_type = tag & 3
+        if element_type == 0:
+            size = tag >> 2
+            if size >= 60:
+                extra_bytes = size - 59
+                size = int.from_bytes(data[position:position + extra_bytes], "little")
+                position += extra_bytes
+            size += 1
+            if position + size > data_length:
+                raise ValueError("Truncated snappy literal")
+            output += data[position:position + size]
+            position += size
+            written += size
+            continue
+
+        if element_type == 1:
+            if position >= data_length:
+                raise ValueError("Truncated snappy copy")
+            size = ((tag >> 2) & 0x07) + 4
+            offset = ((tag >> 5) << 8) | data[position]
+            position += 1
+        elif element_type == 2:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[position:position + 2], "little")
+            position += 2
+        else:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[position:position + 4], "little")
+            position += 4
+        if position > data_length or offset == 0 or offset > written:
+            raise ValueError("Invalid snappy copy")
+
+        start = written - offset
+        if size <= offset:
+            output += output[start:start + size]
+        else:
+            # Overlapping copies repeat the last ``offset`` bytes.
+            output += (output[start:] * (size // offset + 1))[:size]
+        written += size
+        if written > expected_length:
+            raise ValueError("Snappy data longer than declared")
+
+    if written != expected_length:
+        raise ValueError("Snappy data shorter than declared")
+    return bytes(output)
+
+
+class _StructuredCloneReader:
+    __slots__ = ("data", "position", "objects")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+        # Every object is numbered in read order for back references.
+        self.objects: list = []
+
+    def read_root(self):
+        tag, _ = self.read_pair()
+        if tag != SCTAG_HEADER:
+            raise ValueError("Missing structured clone header")
+        try:
+            return self.read_value()
+        except RecursionError:
+            raise ValueError("Structured clone nests too deeply") from None
+
+    def read_pair(self) -> tuple[int, int]:
+        try:
+            data, tag = _PAIR.unpack_from(self.data, self.position)
+        except struct.error:
+            raise ValueError("Truncated structured clone") from None
+        self.position += 8
+        return tag, data
+
+    def read_uint64(self) -> int:
+        try:
+            (value,) = _UINT64.unpack_from(self.data, self.position)
+        except struct.error:
+            raise ValueError("Truncated structured clone") from None
+        self.position += 8
+        return value
+
+    def read_double(self) -> float:
+        try:
+            (value,) = _DOUBLE.unpack_from(self.data, self.position)
+        except struct.error:
+            raise ValueError("Truncated structured clone") from None
+        self.position += 8
+        return value
+
+    def read_bytes(self, length: int) -> bytes:
+        end = self.position + length
+        if end > len(self.data):
+            raise ValueError("Truncated structured clone")
+        value = self.data[self.position:end]
+        self.position = end + (-length % 8)
+        return value
+
+    def read_value(self):
+        tag, data = self.read_pair()
+        if tag <= SCTAG_FLOAT_MAX:
+            return _DOUBLE.unpack_from(self.data, self.position - 8)[0]
+        if tag == SCTAG_STRING:
+            return self.read_string(data)
+        if tag == SCTAG_INT32:
+            return data - 0x100000000 if data & 0x80000000 else data
+        if tag == SCTAG_OBJECT_OBJECT:
+            return self.read_object()
+        if tag == SCTAG_NULL or tag == SCTAG_UNDEFINED:
+            return None
+        if tag == SCTAG_BOOLEAN:
+            return bool(data)
+        if tag == SCTAG_ARRAY_OBJECT:
+            return self.read_array(data)
+        if tag == SCTAG_BACK_REFERENCE_OBJECT:
+            if data >= len(self.objects):
+                raise ValueError("Invalid structured clone back reference")
+            return self.objects[data]
+        if tag == SCTAG_BIGINT:
+            return self.read_bigint(data)
+        if tag == SCTAG_DATE_OBJECT or tag == SCTAG_NUMBER_OBJECT:
+            return self.remember(self.read_double())
+        if tag == SCTAG_BOOLEAN_OBJECT:
+            return self.remember(bool(data))
+        if tag == SCTAG_STRING_OBJECT:
+            slot = self.reserve()
+            return self.fill(slot, self.read_string_value())
+        if tag == SCTAG_BIGINT_OBJECT:
+            return self.remember(self.read_bigint(data))
+        if tag == SCTAG_REGEXP_OBJECT:
+            slot = self.reserve()
+            return self.fill(slot, self.read_string_value())
+        if tag == SCTAG_MAP_OBJECT:
+            return self.read_map()
+        if tag == SCTAG_SET_OBJECT:
+            return self.read_set()
+        if tag == SCTAG_ARRAY_BUFFER_OBJECT:
+            return self.remember(self.read_bytes(self.read_uint64()))
+        if tag == SCTAG_ARRAY_BUFFER_OBJECT_V2:
+            return self.remember(self.read_bytes(data))
+        if tag == SCTAG_RESIZABLE_ARRAY_BUFFER_OBJECT:
+            length = self.read_uint64()
+            self.read_uint64()
+            return self.remember(self.read_bytes(length))
+        if tag == SCTAG_TYPED_ARRAY_OBJECT:
+            return self.read_typed_array(data, self.read_uint64())
+        if tag == SCTAG_TYPED_ARRAY_OBJECT_V2:
+            return self.read_typed_array(self.read_uint64(), data)
+        if tag == SCTAG_DATA_VIEW_OBJECT:
+            return self.read_view(1, self.read_uint64())
+        if tag == SCTAG_DATA_VIEW_OBJECT_V2:
+            return self.read_view(1, data)
+        if SCTAG_TYPED_ARRAY_V1_MIN <= tag <= SCTAG_TYPED_ARRAY_V1_MAX:
+            element_size = self.element_size(tag - SCTAG_TYPED_ARRAY_V1_MIN)
+            return self.remember(self.read_bytes(data * element_size))
+        raise ValueError(f"Unsupported structured clone tag 0x{tag:08X}")
+
+    def read_string(self, data: int) -> str:
+        length = data & ~STRING_LATIN1_FLAG
+        if data & STRING_LATIN1_FLAG:
+            return self.read_bytes(length).decode("latin-1")
+        return self.read_bytes(length * 2).decode("utf-16-le", "surrogatepass")
+
+    def read_string_value(self) -> str:
+        tag, data = self.read_pair()
+        if tag != SCTAG_STRING:
+            raise ValueError("Expected a structured clone string")
+        return self.read_string(data)
+
+    def read_bigint(self, data: int) -> int:
+        length = data & ~BIGINT_NEGATIVE_FLAG
+        value = 0
+        for index in range(length):
+            value |= self.read_uint64() << (64 * index)
+        return -value if data & BIGINT_NEGATIVE_FLAG else value
+
+    def read_object(self) -> dict:
+        value: dict = self.remember({})
+        while True:
+            tag, data = self.read_pair()
+            if tag == SCTAG_END_OF_KEYS:
+                return value
+            if tag == SCTAG_STRING:
+                key = self.read_string(data)
+            elif tag == SCTAG_INT32:
+                key = str(data - 0x100000000 if data & 0x80000000 else data)
+            else:
+                raise ValueError("Invalid structured clone property key")
+            value[key] = self.read_value()
+
+    def read_array(self, length: int) -> list | dict:
+        # Each element takes at least an index pair and a value pair, so a
+        # longer declared length is a sparse (or corrupt) array; never size a
+        # list from it.
+        if length <= (len(self.data) - self.position) // 16:
+            value: list | dict = self.remember([None] * length)
+        else:
+            value = self.remember({})
+        while True:
+            tag, data = self.read_pair()
+            if tag == SCTAG_END_OF_KEYS:
+                return value
+            if tag == SCTAG_INT32 and data < length:
+                value[data] = self.read_value()
+            elif tag == SCTAG_STRING:
+                # Named properties on arrays have no place in the list.
+                self.read_string(data)
+                self.read_value()
+            else:
+                raise ValueError("Invalid structured clone array index")
+
+    def read_map(self) -> dict:
+        value: dict = self.remember({})
+        while not self.at_end_of_keys():
+            key = self.read_value()
+            try:
+                value[key] = self.read_value()
+            except TypeError:
+                raise ValueError("Unhashable structured clone map key") from None
+        return value
+
+    def read_set(self) -> list:
+        value: list = self.remember([])
+        while not self.at_end_of_keys():
+            value.append(self.read_value())
+        return value
+
+    def read_typed_array(self, array_type: int, element_count: int) -> bytes:
+        return self.read_view(self.element_size(array_type), element_count)
+
+    def read_view(self, element_size: int, element_count: int) -> bytes:
+        slot = self.reserve()
+        buffer = self.read_value()
+        byte_offset = self.read_uint64()
+        if not isinstance(buffer, bytes):
+            raise ValueError("Structured clone view without a buffer")
+        end = byte_offset + element_count * element_size
+        if end > len(buffer):
+            raise ValueError("Structured clone view outside its buffer")
+        return self.fill(slot, buffer[byte_offset:end])
+
+    def at_end_of_keys(self) -> bool:
+        tag, _ = self.read_pair()
+        if tag == SCTAG_END_OF_KEYS:
+            return True
+        self.position -= 8
+        return False
+
+    def element_size(self, array_type: int) -> int:
+        if array_type >= len(TYPED_ARRAY_ELEMENT_SIZES):
+            raise ValueError(f"Unsupported typed array type {array_type}")
+        return TYPED_ARRAY_ELEMENT_SIZES[array_type]
+
+    def remember(self, value):
+        self.objects.append(value)
+        return value
+
+    def reserve(self) -> int:
+        self.objects.append(None)
+        return len(self.objects) - 1
+
+    def fill(self, slot: int, value):
+        self.objects[slot] = value
+        return value
@@ -0,0 +1,215 @@
+"""Keep-alive HTTPS connections shared by the media download workers.
+
+Every status file used to open its own TCP connection and TLS session. The
+pool hands out idle connections per host instead, opens at most
+``max_connections_per_host`` at a time and puts a connection back once its
+response has been read to the end.
+"""
+
+import http.client
+import ssl
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+
+# Errors that mean an idle keep-alive connection was closed by the server
+# before it was reused; the request is retried once on a new connection.
+STALE_CONNECTION_ERRORS = (
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+)
+
+
+class HTTPSConnectionPool:
+    """Per-host pool of ``http.client.HTTPSConnection`` objects.
+
+    ``address_overrides`` maps a host name to the ``(host, port)`` actually
+    connected to, and ``ssl_context`` replaces the default verifying context;
+    together they let a local HTTPS server stand in for the real host.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 6,
+        timeout: float = 30,
+        idle_seconds: float = 60,
+        ssl_context: ssl.SSLContext | None = None,
+        address_overrides: dict[str, tuple[str, int]] | None = None,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.idle_seconds = idle_seconds
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.address_overrides = dict(address_overrides or {})
+        self._condition = threading.Condition()
+        self._idle: dict[str, deque[tuple[float, http.client.HTTPSConnection]]] = {}
+        self._open_counts: dict[str, int] = {}
+        self.stats = {"connections_opened": 0, "connections_reused": 0, "requests": 0}
+
+    def request(self, url: str, headers: dict[str, str] | None = None) -> "PooledResponse":
+        """Send a GET for ``url`` and return its response once the headers are in.
+
+        The connection goes back to the pool when the response is read to the
+        end or closed; use the response as a context manager.
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "https" or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+
+        host = parts.netloc
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        # An explicit Host header keeps the real host name when
+        # ``address_overrides`` points the connection somewhere else.
+        request_headers = {**(headers or {}), "Host": host}
+        for attempt in range(2):
+            connection, reused = self._acquire(host)
+            try:
+                connection.request("GET", path, headers=request_headers)
+                response = connection.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                self._discard(host, connection)
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                self._discard(host, connection)
+                raise
+
+            with self._condition:
+                self.stats["requests"] += 1
+            return PooledResponse(self, host, connection, response)
+        raise http.client.RemoteDisconnected("Connection closed before a response")
+
+    def close(self) -> None:
+        """Close every idle connection; connections in use close when released."""
+        with self._condition:
+            idle_connections = [
+                connection
+                for host_idle in self._idle.values()
+                for _, connection in host_idle
+            ]
+            for host, host_idle in self._idle.items():
+                self._open_counts[host] -= len(host_idle)
+                host_idle.clear()
+            self._condition.notify_all()
+        for connection in idle_connections:
+            connection.close()
+
+    def _acquire(self, host: str) -> tuple[http.client.HTTPSConnection, bool]:
+        expired: list[http.client.HTTPSConnection] = []
+        try:
+            with self._condition:
+                host_idle = self._idle.setdefault(host, deque())
+                while True:
+                    now = time.monotonic()
+                    while host_idle:
+                        released_at, connection = host_idle.pop()
+                        if now - released_at <= self.idle_seconds:
+                            self.stats["connections_reused"] += 1
+                            return connection, True
+                        expired.append(connection)
+                        self._open_counts[host] -= 1
+
+                    if self._open_counts.get(host, 0) < self.max_connections_per_host:
+                        self._open_counts[host] = self._open_counts.get(host, 0) + 1
+                        self.stats["connections_opened"] += 1
+                        break
+                    self._condition.wait()
+        finally:
+            for connection in expired:
+                connection.close()
+
+        try:
+            return self._connect(host), False
+        except BaseException:
+            with self._condition:
+                self._open_counts[host] -= 1
+                self._condition.notify()
+            raise
+
+    def _connect(self, host: str) -> http.client.HTTPSConnection:
+        parts = urlsplit(f"https://{host}")
+        connect_host, connect_port = self.address_overrides.get(
+            parts.hostname,
+            (parts.hostname, parts.port or 443),
+        )
+        return http.client.HTTPSConnection(
+            connect_host,
+            connect_port,
+            timeout=self.timeout,
+            context=self.ssl_context,
+        )
+
+    def _release(self, host: str, connection: http.client.HTTPSConnection) -> None:
+        with self._condition:
+            self._idle.setdefault(host, deque()).append((time.monotonic(), connection))
+            self._condition.notify()
+
+    def _discard(self, host: str, connection: http.client.HTTPSConnection) -> None:
+        connection.close()
+        with self._condition:
+            self._open_counts[host] -= 1
+            self._condition.notify()
+
+
+class PooledResponse:
+    """An ``http.client.HTTPResponse`` that returns its connection to the pool."""
+
+    def __init__(
+        self,
+        pool: HTTPSConnectionPool,
+        host: str,
+        connection: http.client.HTTPSConnection,
+        response: http.client.HTTPResponse,
+    ):
+        self._pool = pool
+        self._host = host
+        self._connection = connection
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self._truncated = False
+
+    def read(self, amount: int | None = None) -> bytes:
+        data = self._response.read(amount)
+        if not data and amount != 0 and self._response.length:
+            # http.client reports a connection dropped mid-body as a plain
+            # end of data when reading in chunks.
+            self._truncated = True
+            self.close()
+            raise http.client.IncompleteRead(b"", self._response.length)
+        if self._response.isclosed():
+            self.close()
+        return data
+
+    def getheader(self, name: str, default: str | None = None) -> str | None:
+        return self._response.getheader(name, default)
+
+    def close(self) -> None:
+        connection = self._connection
+        if connection is None:
+            return
+        self._connection = None
+
+        # Only a response read to the end leaves the connection ready for
+        # the next request.
+        if self._response.isclosed() and not self._response.will_close and not self._truncated:
+            self._pool._release(self._host, connection)
+        else:
+            self._response.close()
+            self._pool._discard(self._host, connection)
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -11,7 +11,6 @@ import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from dataclasses import replace
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -81,11 +80,27 @@ _FIREFOX_ITEMS = (
 )
 
 
-def merge_cached_text_hydration(records: list["StatusRecord"]) -> list["StatusRecord"]:
+def load_text_hydration_cache() -> dict:
+    return _load_cache()
+
+
+def text_hydration_cache_signature() -> tuple[int, int] | None:
+    try:
+        stat_result = os.stat(TEXT_HYDRATION_CACHE_FILE)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def merge_cached_text_hydration(
+    records: list["StatusRecord"],
+    cache: dict | None = None,
+) -> list["StatusRecord"]:
     if not records:
         return records
 
-    cache = _load_cache()
+    if cache is None:
+        cache = _load_cache()
     sources = cache.get("sources", {})
     now = time.time()
     merged_records: list["StatusRecord"] = []
@@ -107,8 +122,7 @@ def merge_cached_text_hydration(records: list["StatusRecord"]) -> list["StatusRe
             continue
 
         merged_records.append(
-            replace(
-                record,
+            record.with_changes(
                 text_value=(item.get("text_value") or record.text_value),
                 text_subtype=(item.get("text_subtype") or record.text_subtype),
                 background_color=_coerce_int(item.get("background_color"), record.background_color),
@@ -121,11 +135,15 @@ def merge_cached_text_hydration(records: list["StatusRecord"]) -> list["StatusRe
     return merged_records
 
 
-def records_need_live_hydration(records: list["StatusRecord"]) -> bool:
+def records_need_live_hydration(
+    records: list["StatusRecord"],
+    cache: dict | None = None,
+) -> bool:
     if not records:
         return False
 
-    cache = _load_cache()
+    if cache is None:
+        cache = _load_cache()
     sources = cache.get("sources", {})
     now = time.time()
 
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 import flet as ft
@@ -13,5 +14,6 @@ def validate_python_version():
         raise RuntimeError(f"WhatsApp Status Saver requires Python {version}+.")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     validate_python_version()
     ft.run(main)
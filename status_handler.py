@@ -1,17 +1,22 @@
 import os
-import shutil
 import asyncio
-import concurrent.futures
 import subprocess
 import sys
+from cache_manager import prune_caches
+from file_clone import clone_file
 from utils import get_all_status_files
 from webview_status_source import (
+    MEDIA_PRIORITY_PREFETCH,
+    MEDIA_PRIORITY_USER,
+    MEDIA_PRIORITY_VISIBLE,
     StatusRecord,
     ensure_record_cached,
     get_cached_record_path,
-    get_webview_status_files,
-    get_webview_status_records,
+    get_indexed_cache_paths,
     invalidate_status_source_cache,
+    materialize_webview_records,
+    query_webview_status_records,
+    stream_webview_status_records,
 )
 
 def _paginate(files, page=1, items_per_page=None):
@@ -23,7 +28,36 @@ def _paginate(files, page=1, items_per_page=None):
     return files[start:end]
 
 
-def load_statuses(
+def _build_query_result(items, page=1, items_per_page=None):
+    return {
+        "items": _paginate(items, page=page, items_per_page=items_per_page),
+        "total_count": len(items),
+        "newest_key": get_status_item_key(items[0]) if items else None,
+    }
+
+
+def _build_record_query_result(page_records, total_count, newest_record):
+    return {
+        "items": page_records,
+        "total_count": total_count,
+        "newest_key": get_status_item_key(newest_record) if newest_record else None,
+    }
+
+
+def _list_saved_files(save_dir):
+    if not os.path.isdir(save_dir):
+        return []
+
+    all_files = [
+        os.path.join(save_dir, f)
+        for f in os.listdir(save_dir)
+        if os.path.isfile(os.path.join(save_dir, f))
+    ]
+    all_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+    return all_files
+
+
+def query_statuses(
     file_type,
     save_dir,
     page=1,
@@ -33,20 +67,19 @@ def load_statuses(
     selected_web_browser="chrome",
     selected_web_profile=None,
 ):
+    """Load one page, the total count and the newest item key in a single pass.
+
+    Returns a dict with ``items``, ``total_count`` and ``newest_key``.
+    """
     try:
         if file_type == "downloads":
-            if not os.path.isdir(save_dir):
-                return []
-
-            all_files = [
-                os.path.join(save_dir, f)
-                for f in os.listdir(save_dir)
-                if os.path.isfile(os.path.join(save_dir, f))
-            ]
-            all_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            return _paginate(all_files, page=page, items_per_page=items_per_page)
-
-        webview_records = get_webview_status_records(
+            return _build_query_result(
+                _list_saved_files(save_dir),
+                page=page,
+                items_per_page=items_per_page,
+            )
+
+        page_records, total_count, newest_record = query_webview_status_records(
             file_type,
             page=page,
             items_per_page=items_per_page,
@@ -54,64 +87,86 @@ def load_statuses(
             selected_web_browser=selected_web_browser,
             selected_web_profile=selected_web_profile,
         )
-        if webview_records:
+        if total_count:
+            result = _build_record_query_result(page_records, total_count, newest_record)
             if materialize:
-                return get_webview_status_files(
-                    file_type,
-                    page=page,
-                    items_per_page=items_per_page,
-                    source_mode=source_mode,
-                    selected_web_browser=selected_web_browser,
-                    selected_web_profile=selected_web_profile,
-                )
-            return webview_records
+                result["items"] = materialize_webview_records(result["items"])
+            return result
 
         if source_mode != "desktop":
-            return []
+            return _build_query_result([])
 
         all_files = get_all_status_files(file_type)
         all_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        return _paginate(all_files, page=page, items_per_page=items_per_page)
+        return _build_query_result(all_files, page=page, items_per_page=items_per_page)
     except Exception as e:
         print(f"Error loading statuses: {str(e)}")
-        return []
+        return _build_query_result([])
 
 
-def count_statuses(
+def stream_statuses(
     file_type,
-    save_dir,
     source_mode="desktop",
     selected_web_browser="chrome",
     selected_web_profile=None,
 ):
-    try:
-        if file_type == "downloads":
-            if not os.path.isdir(save_dir):
-                return 0
-            return sum(
-                1
-                for file_name in os.listdir(save_dir)
-                if os.path.isfile(os.path.join(save_dir, file_name))
-            )
+    """Yield provisional record batches while the selected sources are scanned.
+
+    Yields nothing when the sources are already indexed; call query_statuses
+    afterwards for the final, sorted page.
+    """
+    if file_type == "downloads":
+        return
 
-        webview_records = get_webview_status_records(
+    try:
+        yield from stream_webview_status_records(
             file_type,
-            page=1,
-            items_per_page=None,
             source_mode=source_mode,
             selected_web_browser=selected_web_browser,
             selected_web_profile=selected_web_profile,
         )
-        if webview_records:
-            return len(webview_records)
+    except Exception as e:
+        print(f"Error streaming statuses: {str(e)}")
 
-        if source_mode != "desktop":
-            return 0
 
-        return len(get_all_status_files(file_type))
-    except Exception as e:
-        print(f"Error counting statuses: {str(e)}")
-        return 0
+def load_statuses(
+    file_type,
+    save_dir,
+    page=1,
+    items_per_page=None,
+    materialize=True,
+    source_mode="desktop",
+    selected_web_browser="chrome",
+    selected_web_profile=None,
+):
+    return query_statuses(
+        file_type,
+        save_dir,
+        page=page,
+        items_per_page=items_per_page,
+        materialize=materialize,
+        source_mode=source_mode,
+        selected_web_browser=selected_web_browser,
+        selected_web_profile=selected_web_profile,
+    )["items"]
+
+
+def count_statuses(
+    file_type,
+    save_dir,
+    source_mode="desktop",
+    selected_web_browser="chrome",
+    selected_web_profile=None,
+):
+    return query_statuses(
+        file_type,
+        save_dir,
+        items_per_page=1,
+        materialize=False,
+        source_mode=source_mode,
+        selected_web_browser=selected_web_browser,
+        selected_web_profile=selected_web_profile,
+    )["total_count"]
 
 def get_status_preview_path(item):
     if isinstance(item, StatusRecord):
@@ -119,17 +174,19 @@ def get_status_preview_path(item):
     return item if isinstance(item, str) and os.path.exists(item) else None
 
 
-def warm_status_previews(items):
+def warm_status_previews(items, prefetch=False):
+    """Cache the given statuses; prefetched items wait behind on-screen ones."""
     warmed_paths = []
     records = [item for item in items if isinstance(item, StatusRecord)]
     direct_paths = [item for item in items if isinstance(item, str) and os.path.exists(item)]
 
     if records:
-        worker_count = min(6, len(records))
-        with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
-            for cached_path in executor.map(ensure_record_cached, records):
-                if cached_path:
-                    warmed_paths.append(cached_path)
+        warmed_paths.extend(
+            materialize_webview_records(
+                records,
+                priority=MEDIA_PRIORITY_PREFETCH if prefetch else MEDIA_PRIORITY_VISIBLE,
+            )
+        )
 
     warmed_paths.extend(direct_paths)
     return warmed_paths
@@ -157,6 +214,15 @@ def refresh_status_cache(
         get_all_status_files.cache_clear()
 
 
+def prune_status_caches(budget_mb):
+    """Shrink the media and thumbnail caches to ``budget_mb``; blocks, so run it in a thread."""
+    try:
+        return prune_caches(budget_mb * 1024 * 1024, get_indexed_cache_paths())
+    except Exception as e:
+        print(f"Error pruning caches: {str(e)}")
+        return None
+
+
 async def download_status(file_path, dest_dir):
     try:
         if not os.path.exists(dest_dir):
@@ -167,12 +233,55 @@ async def download_status(file_path, dest_dir):
             if not source_path:
                 return "Error downloading: could not fetch the selected status"
 
-        await asyncio.to_thread(shutil.copy, source_path, dest_dir)
+        await asyncio.to_thread(_save_file_to_dir, source_path, dest_dir)
         return f"Downloaded: {os.path.basename(source_path)} to {dest_dir}"
     except Exception as e:
         return f"Error downloading: {str(e)}"
 
 
+async def download_statuses(items, dest_dir):
+    """Save every given status, fetching the uncached ones as one batch."""
+    try:
+        os.makedirs(dest_dir, exist_ok=True)
+        records = [item for item in items if isinstance(item, StatusRecord)]
+        source_paths = [item for item in items if isinstance(item, str) and os.path.exists(item)]
+        if records:
+            source_paths.extend(
+                await asyncio.to_thread(
+                    materialize_webview_records,
+                    records,
+                    MEDIA_PRIORITY_USER,
+                )
+            )
+
+        saved_count = await asyncio.to_thread(
+            _save_files_to_dir,
+            list(dict.fromkeys(source_paths)),
+            dest_dir,
+        )
+        if saved_count < len(items):
+            return f"Downloaded {saved_count} of {len(items)} statuses to {dest_dir}"
+        return f"Downloaded {saved_count} statuses to {dest_dir}"
+    except Exception as e:
+        return f"Error downloading: {str(e)}"
+
+
+def _save_file_to_dir(source_path, dest_dir):
+    # Hardlinks or reflinks the cached file where the file system allows it.
+    return clone_file(source_path, os.path.join(dest_dir, os.path.basename(source_path)))
+
+
+def _save_files_to_dir(source_paths, dest_dir):
+    saved_count = 0
+    for source_path in source_paths:
+        try:
+            _save_file_to_dir(source_path, dest_dir)
+            saved_count += 1
+        except OSError as e:
+            print(f"Error downloading {source_path}: {str(e)}")
+    return saved_count
+
+
 async def open_status_item(item):
     try:
         file_path = item
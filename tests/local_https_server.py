@@ -0,0 +1,197 @@
+"""Local HTTPS stand-in for the WhatsApp media host, used by the download tests.
+
+The server listens on 127.0.0.1 with a throwaway self-signed certificate for
+``mmg.whatsapp.net``; ``make_pool`` returns an ``HTTPSConnectionPool`` that
+connects to it and trusts that certificate.
+"""
+
+import datetime
+import ipaddress
+import os
+import re
+import shutil
+import ssl
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from https_pool import HTTPSConnectionPool
+
+
+MEDIA_HOST = "mmg.whatsapp.net"
+
+
+class LocalHTTPSServer:
+    """Serves ``files`` by path, with knobs for the failure modes under test.
+
+    * ``truncate_after[path]``: send only this many body bytes, then drop
+      the connection (once).
+    * ``close_after_response``: paths after which the server closes the
+      keep-alive connection without announcing it.
+    * ``ignore_range``: paths answered with the whole file and 200 even
+      when a ``Range`` header is sent.
+    * ``delay_seconds[path]``: wait this long before answering.
+
+    ``requests`` records ``(path, range_header)`` for every request and
+    ``max_active`` the most requests ever handled at the same time.
+    """
+
+    def __init__(self, host: str = MEDIA_HOST):
+        self.host = host
+        self.files: dict[str, bytes] = {}
+        self.truncate_after: dict[str, int] = {}
+        self.close_after_response: set[str] = set()
+        self.ignore_range: set[str] = set()
+        self.delay_seconds: dict[str, float] = {}
+        self.requests: list[tuple[str, str | None]] = []
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._cert_dir = tempfile.mkdtemp()
+        self._httpd = None
+
+    def __enter__(self) -> "LocalHTTPSServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        cert_file, key_file = self._write_certificate()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._httpd.daemon_threads = True
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert_file, key_file)
+        self._httpd.socket = server_context.wrap_socket(self._httpd.socket, server_side=True)
+        self.client_context = ssl.create_default_context(cafile=cert_file)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        shutil.rmtree(self._cert_dir, ignore_errors=True)
+
+    def url(self, path: str) -> str:
+        return f"https://{self.host}{path}"
+
+    def make_pool(self, **pool_options) -> HTTPSConnectionPool:
+        return HTTPSConnectionPool(
+            ssl_context=self.client_context,
+            address_overrides={self.host: self._httpd.server_address[:2]},
+            **pool_options,
+        )
+
+    def _write_certificate(self) -> tuple[str, str]:
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, self.host)])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(
+                x509.SubjectAlternativeName(
+                    [x509.DNSName(self.host), x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+                ),
+                critical=False,
+            )
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .sign(key, hashes.SHA256())
+        )
+        cert_file = os.path.join(self._cert_dir, "cert.pem")
+        key_file = os.path.join(self._cert_dir, "key.pem")
+        with open(cert_file, "wb") as handle:
+            handle.write(certificate.public_bytes(serialization.Encoding.PEM))
+        with open(key_file, "wb") as handle:
+            handle.write(
+                key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption(),
+                )
+            )
+        return cert_file, key_file
+
+
+def _make_handler(server: LocalHTTPSServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            with server._lock:
+                server.connections += 1
+            super().setup()
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            range_header = self.headers.get("Range")
+            with server._lock:
+                server.requests.append((self.path, range_header))
+                server.active += 1
+                server.max_active = max(server.max_active, server.active)
+            try:
+                self._respond(range_header)
+            finally:
+                with server._lock:
+                    server.active -= 1
+
+        def _respond(self, range_header):
+            time.sleep(server.delay_seconds.get(self.path, 0))
+            body = server.files.get(self.path)
+            if body is None:
+                self._send(404, b"not found")
+                return
+
+            start = 0
+            headers = {}
+            status = 200
+            if range_header and self.path not in server.ignore_range:
+                start = int(re.match(r"bytes=(\d+)-", range_header).group(1))
+                if start >= len(body):
+                    self._send(416, b"", {"Content-Range": f"bytes */{len(body)}"})
+                    return
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+
+            payload = body[start:]
+            truncate_after = server.truncate_after.pop(self.path, None)
+            if truncate_after is not None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload[:truncate_after])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+
+            self._send(status, payload, headers)
+            if self.path in server.close_after_response:
+                self.close_connection = True
+
+        def _send(self, status, payload, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
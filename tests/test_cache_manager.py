@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+try:
+    import cache_manager
+except NotImplementedError:
+    # config.py only knows the Windows and macOS settings locations.
+    cache_manager = None
+
+HOUR = 60 * 60
+
+
+@unittest.skipIf(cache_manager is None, "cache_manager needs a supported OS")
+class PruneCachesTest(unittest.TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, True)
+        self.media_dir = os.path.join(root, "status_media_cache")
+        self.thumbnail_dir = os.path.join(root, "thumbnail_cache")
+        for name, value in (
+            ("STATUS_MEDIA_CACHE_DIR", self.media_dir),
+            ("THUMBNAIL_CACHE_DIR", self.thumbnail_dir),
+            ("CACHE_ACCESS_INDEX_FILE", os.path.join(root, "cache_access_index.sqlite")),
+        ):
+            patcher = mock.patch.object(cache_manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        cache_manager._PENDING_CACHE_ACCESSES.clear()
+        self.addCleanup(cache_manager._PENDING_CACHE_ACCESSES.clear)
+        self.now = time.time()
+
+    def make_file(self, relative_path, size=1000, idle_hours=1.0, root=None):
+        path = os.path.join(root or self.media_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(b"\x00" * size)
+        modified_at = self.now - idle_hours * HOUR
+        os.utime(path, (modified_at, modified_at))
+        return path
+
+    def test_evicts_least_recently_read_entries_until_within_budget(self):
+        oldest = self.make_file("photos/a.jpg", idle_hours=5)
+        middle = self.make_file("videos/b.mp4", idle_hours=4)
+        thumbnail = self.make_file("c.jpg", idle_hours=3, root=self.thumbnail_dir)
+        newest = self.make_file("photos/d.jpg", idle_hours=2)
+
+        stats = cache_manager.prune_caches(2500)
+
+        self.assertFalse(os.path.exists(oldest))
+        self.assertFalse(os.path.exists(middle))
+        self.assertTrue(os.path.exists(thumbnail))
+        self.assertTrue(os.path.exists(newest))
+        self.assertEqual(stats, {"removed_files": 2, "removed_bytes": 2000, "cache_bytes": 2000})
+
+    def test_recorded_reads_count_as_use(self):
+        read_recently = self.make_file("photos/a.jpg", idle_hours=5)
+        untouched = self.make_file("photos/b.jpg", idle_hours=2)
+        cache_manager.record_cache_access([read_recently])
+
+        cache_manager.prune_caches(1000)
+
+        self.assertTrue(os.path.exists(read_recently))
+        self.assertFalse(os.path.exists(untouched))
+
+    def test_entries_read_moments_ago_are_kept_over_budget(self):
+        paths = [self.make_file(f"photos/{index}.jpg", idle_hours=0) for index in range(3)]
+
+        stats = cache_manager.prune_caches(0)
+
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertEqual(stats["cache_bytes"], 3000)
+
+    def test_entries_past_the_maximum_age_are_removed_within_budget(self):
+        expired = self.make_file("photos/a.jpg", idle_hours=8 * 24)
+        recent = self.make_file("photos/b.jpg", idle_hours=1)
+
+        cache_manager.prune_caches(10**9)
+
+        self.assertFalse(os.path.exists(expired))
+        self.assertTrue(os.path.exists(recent))
+
+    def test_partial_downloads_in_progress_are_kept(self):
+        in_progress = self.make_file("photos/a.jpg.part", size=5000, idle_hours=0.5)
+        abandoned = self.make_file("photos/b.jpg.part", size=5000, idle_hours=25)
+        self.make_file("photos/c.jpg", idle_hours=2)
+
+        stats = cache_manager.prune_caches(1000)
+
+        self.assertTrue(os.path.exists(in_progress))
+        self.assertFalse(os.path.exists(abandoned))
+        # Partial files do not count toward the budget either.
+        self.assertEqual(stats, {"removed_files": 1, "removed_bytes": 5000, "cache_bytes": 1000})
+
+    def test_orphaned_media_is_removed_after_the_grace_period(self):
+        live = self.make_file("photos/live.jpg", idle_hours=7)
+        orphan = self.make_file("photos/orphan.jpg", idle_hours=7)
+        recent_orphan = self.make_file("videos/recent.mp4", idle_hours=1)
+        text_image = self.make_file("texts/v3-status.png", idle_hours=7)
+        thumbnail = self.make_file("orphan.jpg", idle_hours=7, root=self.thumbnail_dir)
+
+        cache_manager.prune_caches(10**9, {live})
+
+        self.assertTrue(os.path.exists(live))
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(recent_orphan))
+        # Text images are named after hydrated text the indexes do not hold.
+        self.assertTrue(os.path.exists(text_image))
+        self.assertTrue(os.path.exists(thumbnail))
+
+    def test_orphan_rule_is_skipped_without_loaded_indexes(self):
+        orphan = self.make_file("photos/orphan.jpg", idle_hours=7)
+
+        cache_manager.prune_caches(10**9, None)
+
+        self.assertTrue(os.path.exists(orphan))
+
+    def test_hardlinked_entries_do_not_count_toward_the_budget(self):
+        saved = self.make_file("photos/saved.jpg", size=5000, idle_hours=5)
+        os.link(saved, os.path.join(os.path.dirname(self.media_dir), "saved copy.jpg"))
+        cached = self.make_file("photos/cached.jpg", idle_hours=4)
+
+        stats = cache_manager.prune_caches(1000)
+
+        self.assertTrue(os.path.exists(saved))
+        self.assertTrue(os.path.exists(cached))
+        self.assertEqual(stats, {"removed_files": 0, "removed_bytes": 0, "cache_bytes": 1000})
+
+
+if __name__ == "__main__":
+    unittest.main()
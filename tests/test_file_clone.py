@@ -0,0 +1,128 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import file_clone
+
+
+def _unsupported(*args, **kwargs):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+
+class CloneFileTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.source = os.path.join(self.root, "cache.mp4")
+        self.dest = os.path.join(self.root, "saved", "status.mp4")
+        os.makedirs(os.path.dirname(self.dest))
+        self.data = os.urandom(3 * 1024 * 1024 + 17)
+        with open(self.source, "wb") as handle:
+            handle.write(self.data)
+        self.source_mtime = 1_600_000_000
+        os.utime(self.source, (self.source_mtime, self.source_mtime))
+
+    def assert_saved_copy(self):
+        with open(self.dest, "rb") as handle:
+            self.assertEqual(handle.read(), self.data)
+        self.assertEqual(os.listdir(os.path.dirname(self.dest)), ["status.mp4"])
+
+    def no_hardlink(self):
+        return mock.patch.object(file_clone.os, "link", side_effect=_unsupported)
+
+    def no_reflink(self):
+        return mock.patch.object(
+            file_clone,
+            "fcntl",
+            mock.Mock(ioctl=mock.Mock(side_effect=OSError(errno.EOPNOTSUPP, "Not supported"))),
+        )
+
+    def test_hardlink_shares_the_cache_file_and_keeps_its_mtime(self):
+        self.assertEqual(file_clone.clone_file(self.source, self.dest), "hardlink")
+
+        self.assertTrue(os.path.samefile(self.source, self.dest))
+        self.assertEqual(os.stat(self.source).st_mtime, self.source_mtime)
+        self.assert_saved_copy()
+
+    def test_saving_an_existing_hardlink_again_leaves_it_alone(self):
+        os.link(self.source, self.dest)
+
+        self.assertEqual(file_clone.clone_file(self.source, self.dest), "existing")
+        self.assertEqual(os.stat(self.source).st_mtime, self.source_mtime)
+
+    def test_reflink_is_tried_when_hardlinks_are_unavailable(self):
+        def fake_ficlone(dest_fd, request, source_fd):
+            self.assertEqual(request, file_clone.FICLONE)
+            os.write(dest_fd, self.data)
+
+        with self.no_hardlink(), mock.patch.object(
+            file_clone, "fcntl", mock.Mock(ioctl=mock.Mock(side_effect=fake_ficlone))
+        ):
+            self.assertEqual(file_clone.clone_file(self.source, self.dest), "reflink")
+
+        self.assert_saved_copy()
+        self.assertGreater(os.stat(self.dest).st_mtime, self.source_mtime)
+
+    @unittest.skipUnless(hasattr(os, "copy_file_range"), "needs os.copy_file_range")
+    def test_copy_file_range_copies_in_chunks(self):
+        with self.no_hardlink(), self.no_reflink(), mock.patch.object(file_clone, "COPY_CHUNK_BYTES", 1024 * 1024):
+            self.assertEqual(file_clone.clone_file(self.source, self.dest), "copy_file_range")
+
+        self.assert_saved_copy()
+        self.assertFalse(os.path.samefile(self.source, self.dest))
+        self.assertGreater(os.stat(self.dest).st_mtime, self.source_mtime)
+
+    def test_short_copy_file_range_falls_back_to_a_full_copy(self):
+        calls = []
+
+        def stalling_copy_file_range(source_fd, dest_fd, count):
+            calls.append(count)
+            if len(calls) > 1:
+                return 0
+            return os.write(dest_fd, self.data[:1000])
+
+        with self.no_hardlink(), self.no_reflink(), mock.patch.object(
+            file_clone.os, "copy_file_range", stalling_copy_file_range, create=True
+        ):
+            self.assertEqual(file_clone.clone_file(self.source, self.dest), "copy")
+
+        self.assertEqual(len(calls), 2)
+        self.assert_saved_copy()
+
+    def test_unsupported_copy_file_range_falls_back_to_a_copy(self):
+        with self.no_hardlink(), self.no_reflink(), mock.patch.object(
+            file_clone.os, "copy_file_range", _unsupported, create=True
+        ):
+            self.assertEqual(file_clone.clone_file(self.source, self.dest), "copy")
+
+        self.assert_saved_copy()
+
+    def test_plain_copy_without_kernel_helpers(self):
+        with self.no_hardlink(), mock.patch.object(file_clone, "fcntl", None), mock.patch.object(
+            file_clone.os, "copy_file_range", None, create=True
+        ):
+            self.assertEqual(file_clone.clone_file(self.source, self.dest), "copy")
+
+        self.assert_saved_copy()
+        self.assertGreater(os.stat(self.dest).st_mtime, self.source_mtime)
+
+    def test_replaces_an_older_save(self):
+        with open(self.dest, "wb") as handle:
+            handle.write(b"old")
+
+        file_clone.clone_file(self.source, self.dest)
+
+        self.assert_saved_copy()
+
+    def test_failure_leaves_no_temporary_file(self):
+        with self.assertRaises(OSError):
+            file_clone.clone_file(os.path.join(self.root, "missing.mp4"), self.dest)
+
+        self.assertEqual(os.listdir(os.path.dirname(self.dest)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
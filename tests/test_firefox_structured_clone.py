@@ -0,0 +1,187 @@
+import struct
+import unittest
+
+from firefox_structured_clone import (
+    SCTAG_ARRAY_OBJECT,
+    SCTAG_BACK_REFERENCE_OBJECT,
+    SCTAG_BOOLEAN,
+    SCTAG_END_OF_KEYS,
+    SCTAG_HEADER,
+    SCTAG_INT32,
+    SCTAG_NULL,
+    SCTAG_OBJECT_OBJECT,
+    SCTAG_STRING,
+    STRING_LATIN1_FLAG,
+    _decompress_snappy_block,
+    decode_structured_clone,
+)
+
+
+def _pair(tag, data=0):
+    return struct.pack("<II", data & 0xFFFFFFFF, tag)
+
+
+def _string(value):
+    try:
+        raw, length = value.encode("latin-1"), len(value) | STRING_LATIN1_FLAG
+    except UnicodeEncodeError:
+        raw, length = value.encode("utf-16-le"), len(value)
+    return _pair(SCTAG_STRING, length) + raw + b"\x00" * (-len(raw) % 8)
+
+
+def _value(value):
+    if value is None:
+        return _pair(SCTAG_NULL)
+    if isinstance(value, bool):
+        return _pair(SCTAG_BOOLEAN, int(value))
+    if isinstance(value, int):
+        return _pair(SCTAG_INT32, value)
+    if isinstance(value, float):
+        return struct.pack("<d", value)
+    if isinstance(value, str):
+        return _string(value)
+    if isinstance(value, dict):
+        body = b"".join(_string(key) + _value(item) for key, item in value.items())
+        return _pair(SCTAG_OBJECT_OBJECT) + body + _pair(SCTAG_END_OF_KEYS)
+    if isinstance(value, list):
+        body = b"".join(_pair(SCTAG_INT32, index) + _value(item) for index, item in enumerate(value))
+        return _pair(SCTAG_ARRAY_OBJECT, len(value)) + body + _pair(SCTAG_END_OF_KEYS)
+    raise TypeError(value)
+
+
+def _clone(value):
+    return _pair(SCTAG_HEADER, 2) + _value(value)
+
+
+def _varint(value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _snappy_literals(data):
+    """A valid raw snappy block holding ``data`` as literals only."""
+    out = bytearray(_varint(len(data)))
+    for start in range(0, len(data), 256):
+        chunk = data[start:start + 256]
+        if len(chunk) <= 60:
+            out.append((len(chunk) - 1) << 2)
+        else:
+            out += bytes([60 << 2, len(chunk) - 1])
+        out += chunk
+    return bytes(out)
+
+
+MESSAGE = {
+    "id": "false_status@broadcast_3EB0ABCDEF_254700000001@c.us",
+    "type": "chat",
+    "t": 1_700_000_000,
+    "body": "Habari ✨",
+    "backgroundColor": -16777216,
+    "isViewOnce": False,
+    "caption": None,
+    "size": 1.5,
+    "mentionedJidList": ["254700000002@c.us", "254700000003@c.us"],
+    "embeddedMusic": {"title": "Song", "overlapDurationInMs": 15000},
+}
+
+
+class DecodeStructuredCloneTest(unittest.TestCase):
+    def test_decodes_a_message(self):
+        self.assertEqual(decode_structured_clone(_clone(MESSAGE)), MESSAGE)
+
+    def test_decodes_a_snappy_compressed_message(self):
+        self.assertEqual(decode_structured_clone(_snappy_literals(_clone(MESSAGE))), MESSAGE)
+
+    def test_back_references_return_the_same_object(self):
+        shared = _pair(SCTAG_OBJECT_OBJECT) + _string("a") + _value(1) + _pair(SCTAG_END_OF_KEYS)
+        data = (
+            _pair(SCTAG_HEADER, 2)
+            + _pair(SCTAG_OBJECT_OBJECT)
+            + _string("first") + shared
+            + _string("second") + _pair(SCTAG_BACK_REFERENCE_OBJECT, 1)
+            + _pair(SCTAG_END_OF_KEYS)
+        )
+        value = decode_structured_clone(data)
+        self.assertIs(value["first"], value["second"])
+
+    def test_truncated_values_raise_value_error(self):
+        data = _clone(MESSAGE)
+        for length in (0, 7, 8, 12, 16, len(data) // 2, len(data) - 1):
+            with self.subTest(length=length), self.assertRaises(ValueError):
+                decode_structured_clone(data[:length])
+
+    def test_garbage_raises_value_error(self):
+        for data in (b"\x00" * 64, b"\xff" * 64, b"not a structured clone", bytes(range(256))):
+            with self.subTest(data=data[:8]), self.assertRaises(ValueError):
+                decode_structured_clone(data)
+
+    def test_unknown_tag_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            decode_structured_clone(_pair(SCTAG_HEADER, 2) + _pair(0xFFFF00FE))
+
+    def test_oversized_array_length_is_not_allocated(self):
+        data = _pair(SCTAG_HEADER, 2) + _pair(SCTAG_ARRAY_OBJECT, 0x7FFFFFFF) + _pair(SCTAG_END_OF_KEYS)
+        self.assertEqual(decode_structured_clone(data), {})
+
+        with self.assertRaises(ValueError):
+            decode_structured_clone(data[:-8])
+
+    def test_sparse_array_keeps_its_elements_by_index(self):
+        data = (
+            _pair(SCTAG_HEADER, 2)
+            + _pair(SCTAG_ARRAY_OBJECT, 1_000_000)
+            + _pair(SCTAG_INT32, 999_999) + _string("last")
+            + _pair(SCTAG_END_OF_KEYS)
+        )
+        self.assertEqual(decode_structured_clone(data), {999_999: "last"})
+
+    def test_oversized_string_length_raises_value_error(self):
+        data = _pair(SCTAG_HEADER, 2) + _pair(SCTAG_STRING, 0x7FFFFFFF) + b"abc"
+        with self.assertRaises(ValueError):
+            decode_structured_clone(data)
+
+    def test_deep_nesting_raises_value_error(self):
+        data = _pair(SCTAG_HEADER, 2) + (_pair(SCTAG_OBJECT_OBJECT) + _string("a")) * 100_000
+        with self.assertRaises(ValueError):
+            decode_structured_clone(data)
+
+
+class DecompressSnappyBlockTest(unittest.TestCase):
+    def test_literals(self):
+        data = bytes(range(256)) * 3
+        self.assertEqual(_decompress_snappy_block(_snappy_literals(data)), data)
+
+    def test_copies_including_overlapping_ones(self):
+        # "abcd" as a literal, then a 1-byte-offset copy of 8 bytes ("dddddddd")
+        # and a 4-byte-offset copy of 4 bytes ("dddd").
+        block = _varint(16) + bytes([3 << 2]) + b"abcd" + bytes([(4 << 2) | 1, 1]) + bytes([(3 << 2) | 2, 4, 0])
+        self.assertEqual(_decompress_snappy_block(block), b"abcd" + b"d" * 12)
+
+    def test_truncated_input_raises_value_error(self):
+        block = _snappy_literals(b"x" * 200)
+        for length in (0, 1, 2, 50, len(block) - 1):
+            with self.subTest(length=length), self.assertRaises(ValueError):
+                _decompress_snappy_block(block[:length])
+
+    def test_garbage_raises_value_error(self):
+        for block in (b"\xff" * 16, b"\x10\x01\x00", b"\x04" + bytes([(0 << 2) | 1, 9])):
+            with self.subTest(block=block), self.assertRaises(ValueError):
+                _decompress_snappy_block(block)
+
+    def test_oversized_declared_length_raises_value_error(self):
+        block = _varint(0xFFFFFFFF) + _snappy_literals(b"abc")[1:]
+        with self.assertRaises(ValueError):
+            _decompress_snappy_block(block)
+
+    def test_copy_beyond_declared_length_raises_value_error(self):
+        block = _varint(6) + bytes([3 << 2]) + b"abcd" + bytes([(4 << 2) | 1, 1])
+        with self.assertRaises(ValueError):
+            _decompress_snappy_block(block)
+
+
+if __name__ == "__main__":
+    unittest.main()
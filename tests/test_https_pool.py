@@ -0,0 +1,95 @@
+import http.client
+import os
+import threading
+import unittest
+
+from tests.local_https_server import LocalHTTPSServer
+
+
+class HTTPSConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalHTTPSServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.server.files["/media.enc"] = os.urandom(200_000)
+
+    def fetch(self, pool, path="/media.enc", headers=None):
+        with pool.request(self.server.url(path), headers) as response:
+            return response.status, response.read()
+
+    def test_reuses_keep_alive_connections(self):
+        pool = self.server.make_pool()
+        self.addCleanup(pool.close)
+
+        for _ in range(5):
+            status, body = self.fetch(pool)
+            self.assertEqual(status, 200)
+            self.assertEqual(body, self.server.files["/media.enc"])
+
+        self.assertEqual(pool.stats["connections_opened"], 1)
+        self.assertEqual(pool.stats["connections_reused"], 4)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_limits_connections_per_host(self):
+        self.server.delay_seconds["/media.enc"] = 0.2
+        pool = self.server.make_pool(max_connections_per_host=2)
+        self.addCleanup(pool.close)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.fetch(pool)))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([status for status, _ in results], [200] * 6)
+        self.assertEqual(self.server.max_active, 2)
+        self.assertEqual(pool.stats["connections_opened"], 2)
+        self.assertEqual(pool.stats["connections_reused"], 4)
+
+    def test_retries_a_stale_keep_alive_connection(self):
+        self.server.close_after_response.add("/media.enc")
+        pool = self.server.make_pool()
+        self.addCleanup(pool.close)
+
+        self.fetch(pool)
+        # The idle connection was closed by the server; the pool notices on
+        # reuse and repeats the request on a new connection.
+        status, body = self.fetch(pool)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body, self.server.files["/media.enc"])
+        self.assertEqual(pool.stats["connections_reused"], 1)
+        self.assertEqual(pool.stats["connections_opened"], 2)
+        self.assertEqual(pool.stats["requests"], 2)
+
+    def test_truncated_body_raises_incomplete_read(self):
+        self.server.truncate_after["/media.enc"] = 1000
+        pool = self.server.make_pool()
+        self.addCleanup(pool.close)
+
+        received = b""
+        with self.assertRaises(http.client.IncompleteRead):
+            with pool.request(self.server.url("/media.enc")) as response:
+                while chunk := response.read(256):
+                    received += chunk
+
+        self.assertEqual(received, self.server.files["/media.enc"][:1000])
+        # The broken connection is not handed out again.
+        self.assertEqual(self.fetch(pool)[0], 200)
+        self.assertEqual(pool.stats["connections_opened"], 2)
+
+    def test_passes_error_statuses_and_request_headers_through(self):
+        pool = self.server.make_pool()
+        self.addCleanup(pool.close)
+
+        self.assertEqual(self.fetch(pool, "/missing")[0], 404)
+        self.assertEqual(self.fetch(pool, headers={"Range": "bytes=10-"})[1], self.server.files["/media.enc"][10:])
+        self.assertEqual(self.server.requests[-1], ("/media.enc", "bytes=10-"))
+
+
+if __name__ == "__main__":
+    unittest.main()
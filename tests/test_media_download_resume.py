@@ -0,0 +1,155 @@
+import base64
+import hashlib
+import hmac
+import http.client
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from tests.local_https_server import LocalHTTPSServer
+
+try:
+    import webview_status_source
+except (ImportError, NotImplementedError):
+    # config.py only knows the Windows and macOS WhatsApp locations.
+    webview_status_source = None
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _encrypt_media(plaintext):
+    media_key = os.urandom(32)
+    expanded_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=112,
+        salt=None,
+        info=b"WhatsApp Image Keys",
+    ).derive(media_key)
+    iv, cipher_key, mac_key = expanded_key[:16], expanded_key[16:48], expanded_key[48:80]
+    padder = padding.PKCS7(128).padder()
+    padded = padder.update(plaintext) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(cipher_key), modes.CBC(iv)).encryptor()
+    ciphertext = encryptor.update(padded) + encryptor.finalize()
+    mac = hmac.new(mac_key, iv + ciphertext, hashlib.sha256).digest()[:10]
+    return media_key, ciphertext + mac
+
+
+@unittest.skipIf(webview_status_source is None, "webview_status_source needs a supported OS")
+class MediaDownloadResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalHTTPSServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        pool = self.server.make_pool()
+        self.addCleanup(pool.close)
+        patcher = mock.patch.object(webview_status_source, "_MEDIA_HTTP_POOL", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.cache_path = os.path.join(self.cache_dir, "photos", "status.jpg")
+        self.partial_path = self.cache_path + webview_status_source.MEDIA_PARTIAL_SUFFIX
+
+        self.plaintext = b"\xff\xd8\xff" + os.urandom(1_500_000)
+        media_key, self.payload = _encrypt_media(self.plaintext)
+        self.server.files["/v/t62/status.enc"] = self.payload
+        self.url = self.server.url("/v/t62/status.enc")
+        self.record = webview_status_source._new_status_record(
+            status_id="false_status@broadcast_TEST",
+            kind="photos",
+            mimetype="image/jpeg",
+            url=self.url,
+            direct_path="/v/t62/status.enc",
+            filehash=_b64(hashlib.sha256(self.plaintext).digest()),
+            enc_filehash=_b64(hashlib.sha256(self.payload).digest()),
+            media_key=_b64(media_key),
+            source_file="test",
+            source_offset=0,
+            timestamp=0.0,
+            author_jid=None,
+            source=webview_status_source._source_info_for_config(
+                {"key": "test", "label": "Test", "indexeddb_dir": self.cache_dir, "blob_dir": None}
+            ),
+        )
+
+    def download(self):
+        return webview_status_source._download_media_to_cache(
+            self.record,
+            self.url,
+            self.cache_path,
+            self.partial_path,
+        )
+
+    def write_partial(self, data):
+        os.makedirs(os.path.dirname(self.partial_path), exist_ok=True)
+        with open(self.partial_path, "wb") as handle:
+            handle.write(data)
+
+    def assert_cached_plaintext(self):
+        with open(self.cache_path, "rb") as handle:
+            self.assertEqual(handle.read(), self.plaintext)
+        self.assertFalse(os.path.exists(self.partial_path))
+
+    def test_dropped_transfer_resumes_with_range(self):
+        self.server.truncate_after["/v/t62/status.enc"] = 600_000
+
+        with self.assertRaises(http.client.IncompleteRead):
+            self.download()
+        self.assertEqual(os.path.getsize(self.partial_path), 600_000)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+        self.assertTrue(self.download())
+        self.assertEqual(self.server.requests[-1], ("/v/t62/status.enc", "bytes=600000-"))
+        self.assert_cached_plaintext()
+
+    def test_server_ignoring_range_restarts_the_partial(self):
+        self.write_partial(self.payload[:400_000])
+        self.server.ignore_range.add("/v/t62/status.enc")
+
+        self.assertTrue(self.download())
+        self.assertEqual(self.server.requests[-1], ("/v/t62/status.enc", "bytes=400000-"))
+        self.assert_cached_plaintext()
+
+    def test_complete_partial_is_used_after_416(self):
+        self.write_partial(self.payload)
+
+        self.assertTrue(self.download())
+        self.assertEqual(self.server.requests[-1], ("/v/t62/status.enc", f"bytes={len(self.payload)}-"))
+        self.assert_cached_plaintext()
+
+    def test_corrupt_partial_is_deleted(self):
+        corrupt_prefix = bytearray(self.payload[:400_000])
+        corrupt_prefix[1000] ^= 0xFF
+        self.write_partial(bytes(corrupt_prefix))
+
+        self.assertFalse(self.download())
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertFalse(os.path.exists(self.partial_path))
+
+        # The next attempt starts from scratch and succeeds.
+        self.assertTrue(self.download())
+        self.assertEqual(self.server.requests[-1], ("/v/t62/status.enc", None))
+        self.assert_cached_plaintext()
+
+    def test_bad_mac_is_rejected_before_decrypting(self):
+        tampered = bytearray(self.payload)
+        tampered[-1] ^= 0xFF
+        self.server.files["/v/t62/status.enc"] = bytes(tampered)
+
+        with mock.patch.object(webview_status_source, "Cipher") as cipher:
+            self.assertFalse(self.download())
+        cipher.assert_not_called()
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from urllib.error import HTTPError
+
+try:
+    import webview_status_source
+except (ImportError, NotImplementedError):
+    # config.py only knows the Windows and macOS WhatsApp locations.
+    webview_status_source = None
+
+FILEHASH = "dGVzdC1maWxlaGFzaA"
+HOUR = 60 * 60
+
+
+@unittest.skipIf(webview_status_source is None, "webview_status_source needs a supported OS")
+class MediaNegativeCacheTest(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        self.cache_file = os.path.join(cache_dir, "_media_negative_cache.json")
+        for name, value in (
+            ("MEDIA_NEGATIVE_CACHE_FILE", self.cache_file),
+            ("_MEDIA_NEGATIVE_CACHE", None),
+        ):
+            patcher = mock.patch.object(webview_status_source, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.now = 1_700_000_000.0
+        clock = mock.patch.object(webview_status_source.time, "time", lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def is_suppressed(self, ignore_backoff=False):
+        return webview_status_source._media_fetch_is_suppressed(FILEHASH, ignore_backoff)
+
+    def reload_from_disk(self):
+        webview_status_source._MEDIA_NEGATIVE_CACHE = None
+
+    def test_transient_failures_back_off_exponentially_up_to_the_cap(self):
+        backoff = webview_status_source.MEDIA_RETRY_BACKOFF_SECONDS
+        expected_waits = []
+        for _ in range(8):
+            expected_waits.append(min(backoff, webview_status_source.MEDIA_RETRY_BACKOFF_MAX_SECONDS))
+            backoff *= 2
+        self.assertEqual(expected_waits[:3], [60, 120, 240])
+
+        for wait in expected_waits:
+            webview_status_source._remember_media_failure(FILEHASH, gone=False)
+            self.now += wait - 1
+            self.assertTrue(self.is_suppressed())
+            self.assertFalse(self.is_suppressed(ignore_backoff=True))
+            self.now += 1
+            self.assertFalse(self.is_suppressed())
+
+    def test_gone_media_stays_suppressed_until_the_entry_expires(self):
+        webview_status_source._remember_media_failure(FILEHASH, gone=True)
+
+        self.now += webview_status_source.MEDIA_RETRY_BACKOFF_MAX_SECONDS + 1
+        self.assertTrue(self.is_suppressed())
+        self.assertTrue(self.is_suppressed(ignore_backoff=True))
+
+        self.now += webview_status_source.MEDIA_NEGATIVE_CACHE_TTL_SECONDS
+        self.assertFalse(self.is_suppressed(ignore_backoff=True))
+        self.reload_from_disk()
+        self.assertFalse(self.is_suppressed(ignore_backoff=True))
+
+    def test_entries_survive_a_restart(self):
+        webview_status_source._remember_media_failure(FILEHASH, gone=True)
+
+        self.reload_from_disk()
+        self.assertTrue(self.is_suppressed())
+        with open(self.cache_file, encoding="utf-8") as handle:
+            self.assertIn(FILEHASH, json.load(handle)["entries"])
+
+    def test_success_clears_the_entry(self):
+        record = mock.Mock(filehash=FILEHASH)
+        webview_status_source._remember_media_failure(FILEHASH, gone=False)
+        webview_status_source._remember_media_failure(FILEHASH, gone=False)
+
+        with mock.patch.object(webview_status_source, "_candidate_urls", return_value=["https://mmg.whatsapp.net/a"]), \
+                mock.patch.object(webview_status_source, "_download_media_to_cache", return_value=True):
+            self.assertEqual(webview_status_source._fetch_record_to_cache(record, "/cache/a.jpg"), "/cache/a.jpg")
+
+        self.assertFalse(self.is_suppressed())
+        self.reload_from_disk()
+        self.assertNotIn(FILEHASH, webview_status_source._load_media_negative_cache())
+
+        # The backoff starts over after the next failure.
+        webview_status_source._remember_media_failure(FILEHASH, gone=False)
+        self.now += webview_status_source.MEDIA_RETRY_BACKOFF_SECONDS
+        self.assertFalse(self.is_suppressed())
+
+    def test_only_gone_responses_from_every_url_mark_media_gone(self):
+        record = mock.Mock(filehash=FILEHASH)
+        urls = ["https://mmg.whatsapp.net/a", "https://mmg.whatsapp.net/b"]
+
+        def fail_with(*errors):
+            responses = iter(errors)
+
+            def download(*args):
+                raise next(responses)
+
+            return download
+
+        cases = [
+            ((HTTPError(urls[0], 404, "Not Found", None, None), HTTPError(urls[1], 410, "Gone", None, None)), True),
+            ((HTTPError(urls[0], 404, "Not Found", None, None), HTTPError(urls[1], 503, "Unavailable", None, None)), False),
+            ((HTTPError(urls[0], 404, "Not Found", None, None), TimeoutError()), False),
+        ]
+        for errors, gone in cases:
+            with self.subTest(gone=gone, errors=errors):
+                webview_status_source._forget_media_failure(FILEHASH)
+                with mock.patch.object(webview_status_source, "_candidate_urls", return_value=urls), \
+                        mock.patch.object(webview_status_source, "_download_media_to_cache", fail_with(*errors)):
+                    self.assertIsNone(webview_status_source._fetch_record_to_cache(record, "/cache/a.jpg"))
+                self.assertEqual(webview_status_source._load_media_negative_cache()[FILEHASH]["gone"], gone)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -500,7 +500,7 @@ def build_unavailable_state(title, body, detail_lines):
     )
 
 
-def create_title_bar(page, refresh_current_view, theme_icon_ref):
+def create_title_bar(page, refresh_current_view, theme_icon_ref, save_all_ref):
     return ft.Container(
         content=ft.Row(
             [
@@ -536,6 +536,7 @@ def create_title_bar(page, refresh_current_view, theme_icon_ref):
                             tooltip="Refresh",
                             icon_size=20,
                         ),
+                        save_all_ref,
                         theme_icon_ref,
                     ],
                     spacing=0,
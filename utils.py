@@ -4,6 +4,7 @@ import hashlib
 from PIL import Image
 import cv2
 from functools import lru_cache
+from cache_manager import record_cache_access
 from config import WHATSAPP_STATUS_PATH
 from config import THUMBNAIL_CACHE_DIR
 
@@ -29,11 +30,13 @@ def get_cached_thumbnail(file_path, size=(150, 150)):
     cache_file = get_thumbnail_cache_path(file_path, size)
     
     if os.path.exists(cache_file):
+        record_cache_access([cache_file])
         return cache_file
     
     thumbnail = create_thumbnail(file_path, size)
     if thumbnail:
         thumbnail.save(cache_file, "PNG")
+        record_cache_access([cache_file])
         return cache_file
     
     return None
@@ -46,7 +49,10 @@ def get_thumbnail_cache_path(file_path, size=(150, 150)):
 
 def get_existing_thumbnail(file_path, size=(150, 150)):
     cache_file = get_thumbnail_cache_path(file_path, size)
-    return cache_file if os.path.exists(cache_file) else None
+    if not os.path.exists(cache_file):
+        return None
+    record_cache_access([cache_file])
+    return cache_file
 
 def create_thumbnail(file_path, size=(150, 150)):
     if file_path.lower().endswith(('.png', '.jpg', '.jpeg')):
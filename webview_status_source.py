@@ -1,35 +1,51 @@
 import base64
+import bisect
 import concurrent.futures
 import hashlib
+import hmac
 import http.client
+import itertools
 import json
 import mimetypes
+import mmap
 import os
+import pathlib
+import queue
 import re
 import sqlite3
+import sys
 import tempfile
+import threading
 import time
-from dataclasses import asdict, dataclass
+import zlib
+from collections import deque
+from dataclasses import dataclass, field, fields, replace
 from io import BytesIO
 from datetime import datetime
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, Iterator
 from urllib.error import HTTPError, URLError
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from urllib.parse import urljoin, urlparse
 
 from cryptography.hazmat.primitives import hashes, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from PIL import Image, ImageDraw, ImageFont
 
+from cache_manager import record_cache_access
 from config import (
+    MESSAGE_DECODE_WORKERS,
     STATUS_MEDIA_CACHE_DIR,
     get_status_source_config,
     get_supported_web_browsers,
     get_web_profiles,
 )
+from firefox_structured_clone import decode_structured_clone, decompress_snappy
+from https_pool import HTTPSConnectionPool
 from live_text_hydration import (
     hydrate_live_text_records,
+    load_text_hydration_cache,
+    text_hydration_cache_signature,
     merge_cached_text_hydration,
     records_need_live_hydration,
 )
@@ -46,6 +62,7 @@ try:
         ccl_blink_value_deserializer,
         ccl_v8_value_deserializer,
     )
+    from ccl_chromium_reader.storage_formats import ccl_leveldb
 
     HAS_INDEXEDDB_MESSAGE_PARSER = True
 except ImportError:
@@ -61,15 +78,114 @@ MEDIA_KEY_PATTERN = rb'mediaKey",([A-Za-z0-9+/=]+)"'
 STATUS_MARKER = b"status@broadcast"
 WINDOW_BYTES_BEFORE = 1800
 WINDOW_BYTES_AFTER = 2200
+REGEX_SCAN_CHUNK_BYTES = 64 * 1024 * 1024
+# Longest field value (URLs, paths) a window may need beyond its fixed reach.
+REGEX_FIELD_SLACK_BYTES = 1024
+# Each field is located by its literal key and its pattern is only matched
+# there: CPython's re is far slower at a combined alternation than at plain
+# substring searches.
+REGEX_FALLBACK_FIELDS = (
+    ("url", b'deprecatedMms3Url"', re.compile(STATUS_URL_PATTERN)),
+    ("direct_path", b'directPath"', re.compile(DIRECT_PATH_PATTERN)),
+    ("mimetype", b'mimetype"', re.compile(MIME_PATTERN)),
+    ("filehash", b'filehash",', re.compile(FILEHASH_PATTERN)),
+    ("enc_filehash", b'encFilehash",', re.compile(ENC_FILEHASH_PATTERN)),
+    ("media_key", b'mediaKey",', re.compile(MEDIA_KEY_PATTERN)),
+)
 
 STATUS_KEY_NEEDLE_UTF16 = STATUS_MARKER.decode("ascii").encode("utf-16-be")
+LEVELDB_DATA_FILE_PATTERN = re.compile(r"^[0-9]{6}\.(ldb|log|sst)$")
 MESSAGE_DATABASE_NAME = "model-storage"
 MESSAGE_OBJECT_STORE_NAME = "message"
 INDEX_CACHE_MAX_AGE_SECONDS = 15 * 60
-INDEX_CACHE_SCHEMA_VERSION = 3
+INDEX_CACHE_SCHEMA_VERSION = 4
+INDEX_CACHE_SOURCE_COLUMNS = (
+    "source_key",
+    "source_label",
+    "source_indexeddb_dir",
+    "source_blob_dir",
+    "source_file",
+)
+INDEX_CACHE_RECORD_COLUMNS = (
+    "status_id",
+    "kind",
+    "mimetype",
+    "url",
+    "direct_path",
+    "filehash",
+    "enc_filehash",
+    "media_key",
+    "source_offset",
+    "timestamp",
+    "author_jid",
+    "text_value",
+    "text_subtype",
+    "background_color",
+    "text_color",
+    "font_id",
+    "thumbnail_direct_path",
+    "thumbnail_filehash",
+    "thumbnail_enc_filehash",
+    "thumbnail_inline",
+    "music_title",
+    "music_artist",
+    "music_artwork_direct_path",
+    "music_artwork_filehash",
+    "music_artwork_enc_filehash",
+    "music_artwork_media_key",
+    "music_track_duration_ms",
+)
+TEXT_INDEX_MAX_AGE_SECONDS = 60
+STATUS_KINDS = ("photos", "videos", "texts")
 TEXT_ASSET_SCHEMA_VERSION = 4
-MAX_CACHE_WORKERS = 6
+MAX_SOURCE_WORKERS = 6
+MEDIA_DOWNLOAD_WORKERS = 6
+MEDIA_FETCH_QUEUE_LIMIT = 512
+MEDIA_STREAM_CHUNK_BYTES = 256 * 1024
+MEDIA_MAC_BYTES = 10
+# Ciphertext is spooled in memory up to this size, then to a temporary file.
+MEDIA_SPOOL_MEMORY_BYTES = 4 * 1024 * 1024
+MEDIA_PARTIAL_SUFFIX = ".part"
+MEDIA_MAX_REDIRECTS = 3
+MEDIA_KEY_CACHE_SIZE = 512
+MEDIA_NEGATIVE_CACHE_FILE = os.path.join(STATUS_MEDIA_CACHE_DIR, "_media_negative_cache.json")
+MEDIA_NEGATIVE_CACHE_SCHEMA_VERSION = 1
+# Statuses live for 24 hours, so media the server reports as gone stays gone;
+# entries are kept a while longer and then pruned.
+MEDIA_GONE_STATUSES = {404, 410}
+MEDIA_NEGATIVE_CACHE_TTL_SECONDS = 48 * 60 * 60
+MEDIA_RETRY_BACKOFF_SECONDS = 60
+MEDIA_RETRY_BACKOFF_MAX_SECONDS = 60 * 60
+BLOB_STORE_REFRESH_SECONDS = 60
+BLOB_HASH_CACHE_SCHEMA_VERSION = 1
+MEDIA_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+PLAINTEXT_MEDIA_SIGNATURES = (b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"RIFF")
+MEDIA_THROUGHPUT_WINDOW_SECONDS = 30
+# Lower values are fetched first.
+MEDIA_PRIORITY_USER = 0
+MEDIA_PRIORITY_VISIBLE = 1
+MEDIA_PRIORITY_PREFETCH = 2
+MESSAGE_DECODE_PARALLEL_MIN_RECORDS = 256
+MESSAGE_STREAM_CHUNK_RECORDS = 2048
+STREAM_BATCH_RECORDS = 256
+MESSAGE_STRING_FIELDS = (
+    "type",
+    "mimetype",
+    "filehash",
+    "directPath",
+    "deprecatedMms3Url",
+    "id",
+    "internalId",
+    "encFilehash",
+    "mediaKey",
+    "subtype",
+    "thumbnailDirectPath",
+    "thumbnail",
+)
+MESSAGE_NUMBER_FIELDS = ("t", "backgroundColor", "textColor", "font")
 FIREFOX_REQUIRED_TABLES = {"database", "object_store", "object_data"}
+FIREFOX_MARKER_CACHE_LIMIT = 200_000
+FIREFOX_ROW_CHUNK_ROWS = 512
 FIREFOX_STATUS_ID_PATTERN = re.compile(
     rb"(status@broadcast_[A-Za-z0-9:_-]+@[A-Za-z]+)"
 )
@@ -78,12 +194,32 @@ FIREFOX_FILEHASH_PATTERN = re.compile(
     rb"filehash[\x00-\xff]{0,16}([A-Za-z0-9+/=]{20,})"
 )
 BASE64_TOKEN_PATTERN = re.compile(rb"[A-Za-z0-9+/=]{20,}")
+FIREFOX_ASCII_RUN_PATTERN = re.compile(rb"[A-Za-z0-9 _.,'()!?:;&/-]{3,120}")
+FIREFOX_INT_PATTERN = re.compile(rb"(\d{1,8})")
+FIREFOX_TIMESTAMP_MARKER = b".8\x00\x08fro"
+FIREFOX_BLOB_MARKERS = (
+    b"encF",
+    b"mediaKey",
+    b"subtype",
+    b"backgroundColor",
+    b"textColor",
+    b"font",
+    b"title",
+    b"author",
+    b"artworkDirectPath",
+    b"artworkSha256",
+    b"artworkEncSha256",
+    b"artworkMediaKey",
+    b"overlapDurationInMs",
+    FIREFOX_TIMESTAMP_MARKER,
+)
 URL_SAFE_BYTES = (
     b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
     b"abcdefghijklmnopqrstuvwxyz"
     b"0123456789"
     b"-._~:/?#[]@!$&'()*+,;=%"
 )
+URL_SAFE_RUN_PATTERN = re.compile(b"[" + re.escape(URL_SAFE_BYTES) + b"]*")
 
 IMAGE_EXTENSIONS = {
     "image/jpeg": ".jpg",
@@ -105,10 +241,84 @@ HTTP_HEADERS = {
     "Referer": "https://web.whatsapp.com/",
 }
 
-_STATUS_RECORD_CACHE: dict[str, tuple[str, list["StatusRecord"]]] = {}
+_STATUS_RECORD_CACHE: dict[str, tuple[str, "_StatusIndex"]] = {}
+_SOURCE_INFO_CACHE: dict[tuple, "SourceInfo"] = {}
+_MERGED_STATUS_INDEX_CACHE: dict[tuple, tuple[tuple, "_StatusIndex"]] = {}
+_MESSAGE_STORE_TAILS: dict[str, "_MessageStoreTail"] = {}
+_FIREFOX_DATABASE_STATES: dict[tuple[str, str], "_FirefoxDatabaseState"] = {}
+# Whether a compressed Firefox value mentions the status marker, by digest.
+_FIREFOX_MARKER_CACHE: dict[int, bool] = {}
+_SNAPSHOT_CACHE: dict[str, tuple[tuple, str]] = {}
+_DIRECTORY_LISTING_CACHE: dict[str, tuple[int, str, list[str]]] = {}
+_MESSAGE_STORE_TAIL_LOCKS: dict[str, threading.Lock] = {}
+_MESSAGE_STORE_TAIL_LOCKS_GUARD = threading.Lock()
+_SOURCE_LOAD_TIMINGS: dict[str, float] = {}
+_MESSAGE_DECODE_EXECUTOR: concurrent.futures.ProcessPoolExecutor | None = None
+_MESSAGE_DECODE_EXECUTOR_BROKEN = False
+_MESSAGE_DECODE_EXECUTOR_LOCK = threading.Lock()
+_MEDIA_FETCH_QUEUE: queue.PriorityQueue = queue.PriorityQueue(maxsize=MEDIA_FETCH_QUEUE_LIMIT)
+_MEDIA_FETCH_JOBS: dict[str, "_MediaFetchJob"] = {}
+_MEDIA_FETCH_SEQUENCE = itertools.count()
+_MEDIA_FETCH_LOCK = threading.Lock()
+_MEDIA_FETCH_WORKERS: list[threading.Thread] = []
+_MEDIA_FETCH_STATS = {
+    "active_downloads": 0,
+    "completed": 0,
+    "failed": 0,
+    "downloaded_bytes": 0,
+    "rejected_payloads": 0,
+    "skipped_unavailable": 0,
+    "served_from_blob_store": 0,
+}
+_MEDIA_TRANSFERS: deque[tuple[float, int]] = deque()
+_MEDIA_NEGATIVE_CACHE: dict[str, dict] | None = None
+_MEDIA_NEGATIVE_CACHE_LOCK = threading.Lock()
+_BLOB_STORE_INDEXES: dict[str, "_BlobStoreIndex"] = {}
+_BLOB_STORE_INDEX_LOCK = threading.Lock()
+_BLOB_STORE_REFRESHES: set[str] = set()
+# Shared by every download worker; replace it to point downloads at a local
+# HTTPS stand-in (see HTTPSConnectionPool.address_overrides).
+_MEDIA_HTTP_POOL = HTTPSConnectionPool(max_connections_per_host=MEDIA_DOWNLOAD_WORKERS)
+
+
+@dataclass(frozen=True, slots=True)
+class SourceInfo:
+    """Where records were discovered; one instance is shared per source."""
+
+    key: str
+    label: str
+    indexeddb_dir: str
+    blob_dir: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class StatusExtras:
+    """Thumbnail and embedded-music details that only some records carry."""
+
+    thumbnail_direct_path: str | None = None
+    thumbnail_filehash: str | None = None
+    thumbnail_enc_filehash: str | None = None
+    thumbnail_inline: str | None = None
+    music_title: str | None = None
+    music_artist: str | None = None
+    music_artwork_direct_path: str | None = None
+    music_artwork_filehash: str | None = None
+    music_artwork_enc_filehash: str | None = None
+    music_artwork_media_key: str | None = None
+    music_track_duration_ms: int | None = None
+
+
+STATUS_EXTRA_FIELDS = tuple(extra_field.name for extra_field in fields(StatusExtras))
+
 
+def _extras_property(name: str) -> property:
+    def getter(record: "StatusRecord"):
+        return getattr(record.extras, name) if record.extras is not None else None
 
-@dataclass(frozen=True)
+    return property(getter)
+
+
+@dataclass(frozen=True, slots=True)
 class StatusRecord:
     status_id: str
     kind: str
@@ -122,26 +332,171 @@ class StatusRecord:
     source_offset: int
     timestamp: float
     author_jid: str | None
-    source_key: str
-    source_label: str
-    source_indexeddb_dir: str
-    source_blob_dir: str | None
+    source: SourceInfo
     text_value: str | None = None
     text_subtype: str | None = None
     background_color: int | None = None
     text_color: int | None = None
     font_id: int | None = None
-    thumbnail_direct_path: str | None = None
-    thumbnail_filehash: str | None = None
-    thumbnail_enc_filehash: str | None = None
-    thumbnail_inline: str | None = None
-    music_title: str | None = None
-    music_artist: str | None = None
-    music_artwork_direct_path: str | None = None
-    music_artwork_filehash: str | None = None
-    music_artwork_enc_filehash: str | None = None
-    music_artwork_media_key: str | None = None
-    music_track_duration_ms: int | None = None
+    extras: StatusExtras | None = None
+
+    thumbnail_direct_path = _extras_property("thumbnail_direct_path")
+    thumbnail_filehash = _extras_property("thumbnail_filehash")
+    thumbnail_enc_filehash = _extras_property("thumbnail_enc_filehash")
+    thumbnail_inline = _extras_property("thumbnail_inline")
+    music_title = _extras_property("music_title")
+    music_artist = _extras_property("music_artist")
+    music_artwork_direct_path = _extras_property("music_artwork_direct_path")
+    music_artwork_filehash = _extras_property("music_artwork_filehash")
+    music_artwork_enc_filehash = _extras_property("music_artwork_enc_filehash")
+    music_artwork_media_key = _extras_property("music_artwork_media_key")
+    music_track_duration_ms = _extras_property("music_track_duration_ms")
+
+    @property
+    def source_key(self) -> str:
+        return self.source.key
+
+    @property
+    def source_label(self) -> str:
+        return self.source.label
+
+    @property
+    def source_indexeddb_dir(self) -> str:
+        return self.source.indexeddb_dir
+
+    @property
+    def source_blob_dir(self) -> str | None:
+        return self.source.blob_dir
+
+    def with_changes(self, **changes) -> "StatusRecord":
+        """Like dataclasses.replace, but also accepts the extras fields."""
+        extra_changes = {
+            name: changes.pop(name)
+            for name in STATUS_EXTRA_FIELDS
+            if name in changes
+        }
+        if extra_changes:
+            current_extras = self.extras or StatusExtras()
+            changes["extras"] = _compact_status_extras(replace(current_extras, **extra_changes))
+        return replace(self, **changes)
+
+
+def _new_status_record(**record_fields) -> StatusRecord:
+    extras = StatusExtras(
+        **{
+            name: record_fields.pop(name)
+            for name in STATUS_EXTRA_FIELDS
+            if name in record_fields
+        }
+    )
+    record_fields["extras"] = _compact_status_extras(extras)
+    record_fields["source_file"] = sys.intern(record_fields["source_file"])
+    return StatusRecord(**record_fields)
+
+
+def _compact_status_extras(extras: StatusExtras) -> StatusExtras | None:
+    if all(getattr(extras, name) is None for name in STATUS_EXTRA_FIELDS):
+        return None
+    return extras
+
+
+def _source_info(
+    key: str,
+    label: str,
+    indexeddb_dir: str,
+    blob_dir: str | None,
+) -> SourceInfo:
+    cache_key = (key, label, indexeddb_dir, blob_dir)
+    source_info = _SOURCE_INFO_CACHE.get(cache_key)
+    if source_info is None:
+        source_info = _SOURCE_INFO_CACHE.setdefault(cache_key, SourceInfo(*cache_key))
+    return source_info
+
+
+def _source_info_for_config(source_config: dict) -> SourceInfo:
+    return _source_info(
+        source_config["key"],
+        source_config["label"],
+        source_config["indexeddb_dir"],
+        source_config.get("blob_dir"),
+    )
+
+
+@dataclass
+class _StatusIndex:
+    """Records of one source (or merged view), partitioned by kind.
+
+    Every list is sorted newest first and shared between callers, so paging is
+    a slice and counting is ``len``; callers must not mutate them.
+    """
+
+    records: list[StatusRecord]
+    by_kind: dict[str, list[StatusRecord]]
+    prepared_texts: tuple[tuple | None, float, list[StatusRecord]] | None = None
+
+
+@dataclass
+class _MessageStoreTail:
+    """Consumed state of a Chromium message store between refreshes.
+
+    Tracks which LevelDB data files (and how far into each live ``.log``) have
+    already been decoded, so a refresh only has to read what was written since.
+    ``blob_records`` keeps the newest blob-entry record per key, which is all
+    a later refresh needs to resolve values stored outside LevelDB.
+    """
+
+    indexeddb_dir: str
+    blob_dir: str | None
+    database_id: int
+    object_store_id: int
+    prefix: bytes
+    blob_prefix: bytes
+    consumed_files: dict[str, tuple[int, int]] = field(default_factory=dict)
+    log_watermarks: dict[str, int] = field(default_factory=dict)
+    key_sequences: dict[bytes, int] = field(default_factory=dict)
+    key_status_ids: dict[bytes, str] = field(default_factory=dict)
+    blob_records: dict[bytes, object] = field(default_factory=dict)
+    latest_messages: dict[str, tuple[int, str, "StatusRecord | None"]] = field(default_factory=dict)
+
+
+@dataclass
+class _FirefoxDatabaseState:
+    """Decoded rows of one Firefox IndexedDB file between refreshes.
+
+    ``object_data`` is a WITHOUT ROWID table, so rows are tracked by key with
+    a digest of their value; only new or rewritten rows are decoded again.
+    """
+
+    signature: tuple
+    rows: dict[bytes, tuple[int, "StatusRecord | None"]] = field(default_factory=dict)
+
+
+@dataclass
+class _MediaFetchJob:
+    """One record travelling through the media fetch pipeline.
+
+    Jobs are shared by every caller asking for the same cache path; a job
+    resubmitted with a better priority is queued again and the stale entry is
+    skipped once a worker has started it.
+    """
+
+    cache_path: str
+    record: "StatusRecord"
+    priority: int
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+    started: bool = False
+
+
+@dataclass
+class _BlobStoreIndex:
+    """Files of one browser blob directory, keyed by their base64 SHA-256.
+
+    Digests are persisted per source with each file's size and mtime, so a
+    refresh only hashes files that are new or changed.
+    """
+
+    refreshed_at: float
+    paths_by_digest: dict[str, str] = field(default_factory=dict)
 
 
 def has_webview_status_source(
@@ -178,36 +533,39 @@ def get_webview_status_files(
         selected_web_browser=selected_web_browser,
         selected_web_profile=selected_web_profile,
     )
+    return materialize_webview_records(records)
+
+
+def materialize_webview_records(
+    records: list[StatusRecord],
+    priority: int = MEDIA_PRIORITY_VISIBLE,
+) -> list[str]:
     if not records:
         return []
 
-    unique_records_by_cache_path: dict[str, StatusRecord] = {}
+    resolved_paths: dict[str, str | None] = {}
+    pending_fetches: dict[str, concurrent.futures.Future] = {}
     for record in records:
-        unique_records_by_cache_path.setdefault(_cache_path_for_record(record), record)
+        cache_path = _cache_path_for_record(record)
+        if cache_path in resolved_paths or cache_path in pending_fetches:
+            continue
+        if os.path.exists(cache_path):
+            resolved_paths[cache_path] = cache_path
+        else:
+            pending_fetches[cache_path] = _submit_media_fetch(record, cache_path, priority)
 
-    resolved_paths: dict[str, str | None] = {}
-    workers = min(MAX_CACHE_WORKERS, len(unique_records_by_cache_path))
-    if workers <= 1:
-        for cache_path, record in unique_records_by_cache_path.items():
-            resolved_paths[cache_path] = ensure_record_cached(record)
-    else:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-            future_map = {
-                executor.submit(ensure_record_cached, record): cache_path
-                for cache_path, record in unique_records_by_cache_path.items()
-            }
-            for future in concurrent.futures.as_completed(future_map):
-                cache_path = future_map[future]
-                try:
-                    resolved_paths[cache_path] = future.result()
-                except Exception:
-                    resolved_paths[cache_path] = None
+    for cache_path, future in pending_fetches.items():
+        try:
+            resolved_paths[cache_path] = future.result()
+        except Exception:
+            resolved_paths[cache_path] = None
 
     accessible_files: list[str] = []
     for record in records:
         cache_path = resolved_paths.get(_cache_path_for_record(record))
         if cache_path:
             accessible_files.append(cache_path)
+    record_cache_access(accessible_files)
     return accessible_files
 
 
@@ -219,36 +577,140 @@ def get_webview_status_records(
     selected_web_browser: str = "chrome",
     selected_web_profile: str | None = None,
 ) -> list[StatusRecord]:
-    if file_type not in {"photos", "videos", "texts"}:
-        return []
+    records = get_webview_status_index(
+        file_type,
+        source_mode=source_mode,
+        selected_web_browser=selected_web_browser,
+        selected_web_profile=selected_web_profile,
+    )
+    return _paginate_records(records, page, items_per_page)
 
-    records = [
-        record
-        for record in _load_all_status_records(
+
+def query_webview_status_records(
+    file_type: str,
+    page: int = 1,
+    items_per_page: int | None = None,
+    source_mode: str = "desktop",
+    selected_web_browser: str = "chrome",
+    selected_web_profile: str | None = None,
+) -> tuple[list[StatusRecord], int, StatusRecord | None]:
+    """Return one page, the total count and the newest record of one kind."""
+    if file_type not in STATUS_KINDS:
+        return [], 0, None
+
+    if file_type != "texts" and source_mode != "all" and page == 1 and items_per_page:
+        cold_page = _query_cold_source_page(
+            file_type,
+            items_per_page,
             source_mode,
             selected_web_browser,
             selected_web_profile,
         )
-        if record.kind == file_type
-    ]
-    if file_type == "texts":
-        records = _prepare_text_records(records)
+        if cold_page is not None:
+            return cold_page
+
+    records = get_webview_status_index(
+        file_type,
+        source_mode=source_mode,
+        selected_web_browser=selected_web_browser,
+        selected_web_profile=selected_web_profile,
+    )
+    return (
+        _paginate_records(records, page, items_per_page),
+        len(records),
+        records[0] if records else None,
+    )
+
+
+def _query_cold_source_page(
+    file_type: str,
+    items_per_page: int,
+    source_mode: str,
+    selected_web_browser: str,
+    selected_web_profile: str | None,
+) -> tuple[list[StatusRecord], int, StatusRecord | None] | None:
+    # On a cold start only the first screen is read from the on-disk index;
+    # the full source index is loaded by the next query that needs it.
+    source_configs = _iter_source_configs(
+        source_mode,
+        selected_web_browser,
+        selected_web_profile,
+    )
+    if not source_configs:
+        return None
 
+    source_config = source_configs[0]
+    source_key = source_config["key"]
+    if source_key in _STATUS_RECORD_CACHE or not os.path.isdir(source_config["indexeddb_dir"]):
+        return None
+
+    snapshot = _build_indexeddb_snapshot(source_config)
+    cached_page = _load_cached_records_page(source_key, snapshot, file_type, 0, items_per_page)
+    if cached_page is None:
+        return None
+
+    records, total_count = cached_page
+    return records, total_count, records[0] if records else None
+
+
+def _paginate_records(
+    records: list[StatusRecord],
+    page: int = 1,
+    items_per_page: int | None = None,
+) -> list[StatusRecord]:
     if items_per_page is None or items_per_page <= 0:
         return records
 
     start = max(0, (page - 1) * items_per_page)
     stop = start + items_per_page
-    paged_records = records[start:stop]
-    return paged_records
+    return records[start:stop]
+
+
+def get_webview_status_index(
+    file_type: str,
+    source_mode: str = "desktop",
+    selected_web_browser: str = "chrome",
+    selected_web_profile: str | None = None,
+) -> list[StatusRecord]:
+    """Return every displayable record of one kind, newest first.
+
+    This is the single filtered list that paging, counting and change
+    detection all slice from, so a UI query only checks the sources once.
+    """
+    if file_type not in STATUS_KINDS:
+        return []
+
+    status_index = _load_status_index(
+        source_mode,
+        selected_web_browser,
+        selected_web_profile,
+    )
+    if file_type != "texts":
+        return status_index.by_kind[file_type]
+
+    # Hydrated text is merged in from a separate cache file, so the prepared
+    # list is reused only while that file is untouched.
+    hydration_signature = text_hydration_cache_signature()
+    prepared_texts = status_index.prepared_texts
+    if (
+        prepared_texts
+        and prepared_texts[0] == hydration_signature
+        and time.time() - prepared_texts[1] <= TEXT_INDEX_MAX_AGE_SECONDS
+    ):
+        return prepared_texts[2]
+
+    records = _prepare_text_records(status_index.by_kind["texts"])
+    status_index.prepared_texts = (text_hydration_cache_signature(), time.time(), records)
+    return records
 
 
 def _prepare_text_records(records: list[StatusRecord]) -> list[StatusRecord]:
     if not records:
         return []
 
-    merged_records = merge_cached_text_hydration(records)
-    if records_need_live_hydration(merged_records):
+    hydration_cache = load_text_hydration_cache()
+    merged_records = merge_cached_text_hydration(records, hydration_cache)
+    if records_need_live_hydration(merged_records, hydration_cache):
         try:
             hydrate_live_text_records(merged_records)
         except Exception:
@@ -262,60 +724,268 @@ def _prepare_text_records(records: list[StatusRecord]) -> list[StatusRecord]:
     ]
 
 
+def stream_webview_status_records(
+    file_type: str,
+    source_mode: str = "desktop",
+    selected_web_browser: str = "chrome",
+    selected_web_profile: str | None = None,
+) -> Iterator[list[StatusRecord]]:
+    """Yield provisional batches of one kind while sources are being scanned.
+
+    Sources whose index is already cached yield nothing. An index held in
+    memory is not even probed: the query that follows checks its freshness,
+    so a refresh still costs one check per source. Once the generator is
+    exhausted every scanned source has its final index stored, so the next
+    query returns the reconciled, sorted view.
+    """
+    if file_type not in STATUS_KINDS:
+        return
+
+    source_configs = [
+        source_config
+        for source_config in _iter_source_configs(
+            source_mode,
+            selected_web_browser,
+            selected_web_profile,
+        )
+        if os.path.isdir(source_config["indexeddb_dir"])
+    ]
+    if source_mode != "all":
+        source_configs = source_configs[:1]
+    source_configs = [
+        source_config
+        for source_config in source_configs
+        if source_config["key"] not in _STATUS_RECORD_CACHE
+        and not _source_index_is_current(source_config)
+    ]
+    if not source_configs:
+        return
+
+    hydration_cache = load_text_hydration_cache() if file_type == "texts" else None
+    for batch in _stream_source_batches(source_configs):
+        records = [record for record in batch if record.kind == file_type]
+        if hydration_cache is not None:
+            records = [
+                record
+                for record in merge_cached_text_hydration(records, hydration_cache)
+                if (record.text_value or "").strip()
+            ]
+        if records:
+            yield records
+
+
+def _stream_source_batches(source_configs: list[dict]) -> Iterator[list[StatusRecord]]:
+    if len(source_configs) == 1:
+        source_config = source_configs[0]
+        started_at = time.perf_counter()
+        try:
+            yield from _stream_index_for_source_config(source_config)
+        finally:
+            _SOURCE_LOAD_TIMINGS[source_config["key"]] = time.perf_counter() - started_at
+        return
+
+    # Several sources are scanned on their own threads, as in
+    # _load_source_indexes_concurrently, with batches handed over a queue.
+    batch_queue: queue.Queue = queue.Queue()
+    finished = object()
+
+    def scan_source(source_config: dict) -> None:
+        started_at = time.perf_counter()
+        try:
+            for batch in _stream_index_for_source_config(source_config):
+                batch_queue.put(batch)
+        except Exception as error:
+            print(f"Error loading statuses from {source_config['key']}: {str(error)}")
+        finally:
+            _SOURCE_LOAD_TIMINGS[source_config["key"]] = time.perf_counter() - started_at
+            batch_queue.put(finished)
+
+    workers = min(MAX_SOURCE_WORKERS, len(source_configs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for source_config in source_configs:
+            executor.submit(scan_source, source_config)
+
+        remaining = len(source_configs)
+        while remaining:
+            batch = batch_queue.get()
+            if batch is finished:
+                remaining -= 1
+                continue
+            yield batch
+
+
 def iter_status_records(
     file_type: str,
     source_mode: str = "desktop",
     selected_web_browser: str = "chrome",
     selected_web_profile: str | None = None,
 ) -> Iterable[StatusRecord]:
-    for record in _load_all_status_records(
+    status_index = _load_status_index(
         source_mode,
         selected_web_browser,
         selected_web_profile,
-    ):
-        if record.kind == file_type:
-            yield record
+    )
+    yield from status_index.by_kind.get(file_type, [])
 
 
-def ensure_record_cached(record: StatusRecord) -> str | None:
+def ensure_record_cached(
+    record: StatusRecord,
+    priority: int = MEDIA_PRIORITY_USER,
+) -> str | None:
     cache_path = _cache_path_for_record(record)
-    if os.path.exists(cache_path):
-        return cache_path
+    if not os.path.exists(cache_path):
+        cache_path = _submit_media_fetch(record, cache_path, priority).result()
+    record_cache_access([cache_path])
+    return cache_path
+
+
+def get_media_fetch_metrics() -> dict[str, float]:
+    """Queue depths, worker activity and recent download throughput of the fetch pipeline."""
+    with _MEDIA_FETCH_LOCK:
+        _trim_media_transfers(time.monotonic())
+        window_bytes = sum(size for _, size in _MEDIA_TRANSFERS)
+        return {
+            **_MEDIA_FETCH_STATS,
+            "queued_downloads": _MEDIA_FETCH_QUEUE.qsize(),
+            "in_flight": len(_MEDIA_FETCH_JOBS),
+            "download_bytes_per_second": window_bytes / MEDIA_THROUGHPUT_WINDOW_SECONDS,
+            "media_key_cache_hits": _expand_media_key.cache_info().hits,
+            **_MEDIA_HTTP_POOL.stats,
+        }
 
-    if record.kind == "texts":
-        return _generate_text_status_asset(record, cache_path)
 
-    payload = _download_plaintext_payload(record)
-    if not payload:
-        return None
+def _submit_media_fetch(
+    record: StatusRecord,
+    cache_path: str,
+    priority: int,
+) -> concurrent.futures.Future:
+    with _MEDIA_FETCH_LOCK:
+        _start_media_fetch_workers()
+        job = _MEDIA_FETCH_JOBS.get(cache_path)
+        if job is None:
+            job = _MediaFetchJob(cache_path=cache_path, record=record, priority=priority)
+            _MEDIA_FETCH_JOBS[cache_path] = job
+        elif job.started or priority >= job.priority:
+            return job.future
+        else:
+            job.priority = priority
+        entry = (priority, next(_MEDIA_FETCH_SEQUENCE), job)
+
+    # Outside the lock: a full queue blocks the caller until a worker frees a slot.
+    _MEDIA_FETCH_QUEUE.put(entry)
+    return job.future
+
+
+def _start_media_fetch_workers() -> None:
+    if _MEDIA_FETCH_WORKERS:
+        return
+
+    for worker_index in range(MEDIA_DOWNLOAD_WORKERS):
+        _MEDIA_FETCH_WORKERS.append(
+            threading.Thread(
+                target=_run_media_download_worker,
+                name=f"media-download-{worker_index}",
+                daemon=True,
+            )
+        )
+    for worker in _MEDIA_FETCH_WORKERS:
+        worker.start()
+
+
+def _run_media_download_worker() -> None:
+    while True:
+        _, _, job = _MEDIA_FETCH_QUEUE.get()
+        with _MEDIA_FETCH_LOCK:
+            if job.started:
+                continue
+            job.started = True
+            _MEDIA_FETCH_STATS["active_downloads"] += 1
+
+        try:
+            if os.path.exists(job.cache_path):
+                _finish_media_fetch(job, job.cache_path)
+            elif job.record.kind == "texts":
+                _finish_media_fetch(job, _generate_text_status_asset(job.record, job.cache_path))
+            elif _copy_from_blob_store(job.record, job.cache_path):
+                with _MEDIA_FETCH_LOCK:
+                    _MEDIA_FETCH_STATS["served_from_blob_store"] += 1
+                _finish_media_fetch(job, job.cache_path)
+            elif _media_fetch_is_suppressed(
+                job.record.filehash,
+                ignore_backoff=job.priority == MEDIA_PRIORITY_USER,
+            ):
+                with _MEDIA_FETCH_LOCK:
+                    _MEDIA_FETCH_STATS["skipped_unavailable"] += 1
+                _finish_media_fetch(job, None)
+            else:
+                _finish_media_fetch(job, _fetch_record_to_cache(job.record, job.cache_path))
+        except Exception as error:
+            _finish_media_fetch(job, None, error)
+        finally:
+            with _MEDIA_FETCH_LOCK:
+                _MEDIA_FETCH_STATS["active_downloads"] -= 1
+
+
+def _finish_media_fetch(
+    job: _MediaFetchJob,
+    cache_path: str | None,
+    error: Exception | None = None,
+) -> None:
+    with _MEDIA_FETCH_LOCK:
+        if _MEDIA_FETCH_JOBS.get(job.cache_path) is job:
+            del _MEDIA_FETCH_JOBS[job.cache_path]
+        _MEDIA_FETCH_STATS["completed" if cache_path else "failed"] += 1
+
+    if error is not None:
+        job.future.set_exception(error)
+    else:
+        job.future.set_result(cache_path)
 
-    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    temp_file = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            dir=os.path.dirname(cache_path),
-            suffix=".tmp",
-        ) as temp_handle:
-            temp_handle.write(payload)
-            temp_file = temp_handle.name
-        os.replace(temp_file, cache_path)
-        return cache_path
-    finally:
-        if temp_file and os.path.exists(temp_file):
-            os.unlink(temp_file)
+
+def _record_media_transfer(size: int) -> None:
+    with _MEDIA_FETCH_LOCK:
+        now = time.monotonic()
+        _MEDIA_FETCH_STATS["downloaded_bytes"] += size
+        _MEDIA_TRANSFERS.append((now, size))
+        _trim_media_transfers(now)
+
+
+def _trim_media_transfers(now: float) -> None:
+    while _MEDIA_TRANSFERS and _MEDIA_TRANSFERS[0][0] < now - MEDIA_THROUGHPUT_WINDOW_SECONDS:
+        _MEDIA_TRANSFERS.popleft()
 
 
 def get_cached_record_path(record: StatusRecord) -> str | None:
     cache_path = _cache_path_for_record(record)
-    return cache_path if os.path.exists(cache_path) else None
+    if not os.path.exists(cache_path):
+        return None
+    record_cache_access([cache_path])
+    return cache_path
+
 
+def get_indexed_cache_paths() -> set[str] | None:
+    """Media cache paths of every record in the source indexes loaded so far.
 
-def _load_all_status_records(
+    Text records are left out: their image names include the hydrated text,
+    which the indexes do not hold. Returns None before any source has been
+    indexed.
+    """
+    status_indexes = [status_index for _, status_index in list(_STATUS_RECORD_CACHE.values())]
+    if not status_indexes:
+        return None
+    return {
+        _cache_path_for_record(record)
+        for status_index in status_indexes
+        for record in status_index.records
+        if record.kind != "texts"
+    }
+
+
+def _load_status_index(
     source_mode: str = "desktop",
     selected_web_browser: str = "chrome",
     selected_web_profile: str | None = None,
-) -> list[StatusRecord]:
+) -> _StatusIndex:
     source_configs = _iter_source_configs(
         source_mode,
         selected_web_browser,
@@ -323,21 +993,91 @@ def _load_all_status_records(
     )
 
     if source_mode == "all":
+        loaded_sources = _load_source_indexes_concurrently(
+            [
+                source_config
+                for source_config in source_configs
+                if os.path.isdir(source_config["indexeddb_dir"])
+            ]
+        )
+        source_snapshots = [
+            (source_key, snapshot)
+            for source_key, snapshot, _ in loaded_sources
+        ]
+        source_indexes = [source_index for _, _, source_index in loaded_sources]
+
+        cache_key = (source_mode, selected_web_browser, selected_web_profile)
+        merged_snapshot = tuple(source_snapshots)
+        cached_index = _MERGED_STATUS_INDEX_CACHE.get(cache_key)
+        if cached_index and cached_index[0] == merged_snapshot:
+            return cached_index[1]
+
         combined_records: list[StatusRecord] = []
-        for source_config in source_configs:
-            if not os.path.isdir(source_config["indexeddb_dir"]):
-                continue
-            combined_records.extend(_load_records_for_source_config(source_config))
-        return _merge_status_records(combined_records)
+        for source_index in source_indexes:
+            combined_records.extend(source_index.records)
+        merged_index = _build_status_index(_merge_status_records(combined_records))
+        _MERGED_STATUS_INDEX_CACHE[cache_key] = (merged_snapshot, merged_index)
+        return merged_index
 
     if not source_configs:
-        return []
+        return _build_status_index([])
 
     source_config = source_configs[0]
     if not os.path.isdir(source_config["indexeddb_dir"]):
+        return _build_status_index([])
+
+    return _timed_load_index_for_source_config(source_config)[1]
+
+
+def _load_source_indexes_concurrently(
+    source_configs: list[dict],
+) -> list[tuple[str, str, _StatusIndex]]:
+    """Load every source on its own thread, keeping the input order.
+
+    Sources are independent files on disk, so the combined view waits for the
+    slowest source instead of the sum of all of them. A source that fails to
+    load is left out rather than hiding the others.
+    """
+    if not source_configs:
         return []
 
-    return _load_records_for_source_config(source_config)
+    workers = min(MAX_SOURCE_WORKERS, len(source_configs))
+    loaded_sources: list[tuple[str, str, _StatusIndex]] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_timed_load_index_for_source_config, source_config)
+            for source_config in source_configs
+        ]
+        for source_config, future in zip(source_configs, futures):
+            try:
+                snapshot, source_index = future.result()
+            except Exception as error:
+                print(f"Error loading statuses from {source_config['key']}: {str(error)}")
+                continue
+            loaded_sources.append((source_config["key"], snapshot, source_index))
+    return loaded_sources
+
+
+def _timed_load_index_for_source_config(source_config: dict) -> tuple[str, _StatusIndex]:
+    started_at = time.perf_counter()
+    try:
+        return _load_index_for_source_config(source_config)
+    finally:
+        _SOURCE_LOAD_TIMINGS[source_config["key"]] = time.perf_counter() - started_at
+
+
+def get_source_load_timings() -> dict[str, float]:
+    """Seconds spent on the most recent load of each source, keyed by source key."""
+    return dict(_SOURCE_LOAD_TIMINGS)
+
+
+def _build_status_index(records: list[StatusRecord]) -> _StatusIndex:
+    # Stable sort: records sharing a timestamp keep their loader order.
+    sorted_records = sorted(records, key=lambda record: record.timestamp or 0.0, reverse=True)
+    by_kind: dict[str, list[StatusRecord]] = {kind: [] for kind in STATUS_KINDS}
+    for record in sorted_records:
+        by_kind.setdefault(record.kind, []).append(record)
+    return _StatusIndex(records=sorted_records, by_kind=by_kind)
 
 
 def _iter_source_configs(
@@ -376,40 +1116,83 @@ def _iter_source_configs(
     return unique_configs
 
 
-def _load_records_for_source_config(source_config: dict) -> list[StatusRecord]:
-    global _STATUS_RECORD_CACHE
+def _load_index_for_source_config(source_config: dict) -> tuple[str, _StatusIndex]:
+    return _drain_record_stream(_stream_index_for_source_config(source_config))
 
+
+def _stream_index_for_source_config(
+    source_config: dict,
+) -> Iterator[list[StatusRecord]]:
+    """Scan one source, yielding provisional batches, and return its final index.
+
+    Nothing is yielded when the index comes from the memory or disk cache.
+    """
     source_key = source_config["key"]
 
     snapshot = _build_indexeddb_snapshot(source_config)
     cached_snapshot = _STATUS_RECORD_CACHE.get(source_key)
     if cached_snapshot and cached_snapshot[0] == snapshot:
-        return list(cached_snapshot[1])
+        return cached_snapshot
 
     cached_records = _load_cached_records(source_key, snapshot)
     if cached_records is not None:
-        _STATUS_RECORD_CACHE[source_key] = (snapshot, cached_records)
-        return list(cached_records)
+        return _store_source_index(source_key, snapshot, cached_records, persist=False)
 
     if _is_firefox_source(source_config):
-        records = _load_records_from_firefox_message_store(source_config)
+        records = yield from _stream_firefox_records(source_config, _iter_firefox_message_records)
         if not records:
-            records = _load_records_from_firefox_blob_fallback(source_config)
-        _STATUS_RECORD_CACHE[source_key] = (snapshot, records)
-        _write_cached_records(source_key, snapshot, records)
-        return list(records)
+            records = yield from _stream_firefox_records(source_config, _iter_firefox_raw_records)
+        return _store_source_index(source_key, snapshot, records)
 
     if HAS_INDEXEDDB_MESSAGE_PARSER:
-        records = _load_records_from_message_store(source_config)
+        records = yield from _stream_records_from_message_store(source_config)
         if records:
-            _STATUS_RECORD_CACHE[source_key] = (snapshot, records)
-            _write_cached_records(source_key, snapshot, records)
-            return list(records)
+            return _store_source_index(source_key, snapshot, records)
 
-    records = _load_records_from_regex_fallback(source_config)
-    _STATUS_RECORD_CACHE[source_key] = (snapshot, records)
-    _write_cached_records(source_key, snapshot, records)
-    return list(records)
+    records = yield from _stream_records_from_regex_fallback(source_config)
+    return _store_source_index(source_key, snapshot, records)
+
+
+def _source_index_is_current(source_config: dict) -> bool:
+    source_key = source_config["key"]
+    snapshot = _build_indexeddb_snapshot(source_config)
+    cached_snapshot = _STATUS_RECORD_CACHE.get(source_key)
+    if cached_snapshot and cached_snapshot[0] == snapshot:
+        return True
+
+    connection = _open_cached_index(source_key, snapshot)
+    if connection is None:
+        return False
+    connection.close()
+    return True
+
+
+def _drain_record_stream(stream: Iterator[list[StatusRecord]]):
+    """Run a record stream to completion and return its final value."""
+    while True:
+        try:
+            next(stream)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _store_source_index(
+    source_key: str,
+    snapshot: str,
+    records: list[StatusRecord],
+    persist: bool = True,
+) -> tuple[str, _StatusIndex]:
+    cached_snapshot = (snapshot, _build_status_index(records))
+    _STATUS_RECORD_CACHE[source_key] = cached_snapshot
+    if persist:
+        _write_cached_records(source_key, snapshot, cached_snapshot[1].records)
+
+    # Start indexing the blob store once the records are known, so it is
+    # usually ready before their first downloads.
+    blob_dir = records[0].source_blob_dir if records else None
+    if blob_dir and os.path.isdir(blob_dir):
+        _get_blob_store_index(source_key, blob_dir)
+    return cached_snapshot
 
 
 def invalidate_status_source_cache(
@@ -425,12 +1208,22 @@ def invalidate_status_source_cache(
     for source_config in source_configs:
         source_key = source_config["key"]
         _STATUS_RECORD_CACHE.pop(source_key, None)
-        index_cache_file = _index_cache_file_for_source(source_key)
-        if os.path.exists(index_cache_file):
-            try:
-                os.remove(index_cache_file)
-            except OSError:
-                pass
+        _SNAPSHOT_CACHE.pop(source_key, None)
+        _MESSAGE_STORE_TAILS.pop(source_key, None)
+        for state_key in [key for key in _FIREFOX_DATABASE_STATES if key[0] == source_key]:
+            _FIREFOX_DATABASE_STATES.pop(state_key, None)
+        _MERGED_STATUS_INDEX_CACHE.clear()
+        _BLOB_STORE_INDEXES.pop(source_config.get("blob_dir"), None)
+        for index_cache_file in (
+            _index_cache_file_for_source(source_key),
+            _legacy_index_cache_file_for_source(source_key),
+            _regex_scan_cache_file_for_source(source_key),
+        ):
+            if os.path.exists(index_cache_file):
+                try:
+                    os.remove(index_cache_file)
+                except OSError:
+                    pass
 
 
 def _merge_status_records(records: list[StatusRecord]) -> list[StatusRecord]:
@@ -476,66 +1269,33 @@ def _is_firefox_source(source_config: dict) -> bool:
 
 
 def _load_records_from_firefox_message_store(source_config: dict) -> list[StatusRecord]:
-    indexeddb_dir = source_config["indexeddb_dir"]
-    if not os.path.isdir(indexeddb_dir):
-        return []
-
-    latest_records: dict[str, StatusRecord] = {}
-    for file_name in sorted(os.listdir(indexeddb_dir), reverse=True):
-        if not file_name.endswith(".sqlite"):
-            continue
-
-        source_path = os.path.join(indexeddb_dir, file_name)
-        for source_offset, message_blob in _iter_firefox_message_blobs(source_path):
-            record = _build_status_record_from_firefox_message(
-                message_blob,
-                source_path,
-                source_offset,
-                source_config,
-            )
-            if not record:
-                continue
+    return _drain_record_stream(
+        _stream_firefox_records(source_config, _iter_firefox_message_records)
+    )
 
-            previous = latest_records.get(record.status_id)
-            if previous is None or (
-                record.timestamp,
-                record.source_offset,
-                record.source_file,
-            ) > (
-                previous.timestamp,
-                previous.source_offset,
-                previous.source_file,
-            ):
-                latest_records[record.status_id] = record
 
-    return sorted(
-        latest_records.values(),
-        key=lambda record: (record.timestamp, record.status_id),
-        reverse=True,
+def _load_records_from_firefox_blob_fallback(source_config: dict) -> list[StatusRecord]:
+    return _drain_record_stream(
+        _stream_firefox_records(source_config, _iter_firefox_raw_records)
     )
 
 
-def _load_records_from_firefox_blob_fallback(source_config: dict) -> list[StatusRecord]:
+def _stream_firefox_records(
+    source_config: dict,
+    iter_records,
+) -> Iterator[list[StatusRecord]]:
     indexeddb_dir = source_config["indexeddb_dir"]
     if not os.path.isdir(indexeddb_dir):
         return []
 
     latest_records: dict[str, StatusRecord] = {}
+    pending_records: list[StatusRecord] = []
     for file_name in sorted(os.listdir(indexeddb_dir), reverse=True):
         if not file_name.endswith(".sqlite"):
             continue
 
         source_path = os.path.join(indexeddb_dir, file_name)
-        for source_offset, message_blob in _iter_firefox_raw_blobs(source_path):
-            record = _build_status_record_from_firefox_message(
-                message_blob,
-                source_path,
-                source_offset,
-                source_config,
-            )
-            if not record:
-                continue
-
+        for record in iter_records(source_path, source_config):
             previous = latest_records.get(record.status_id)
             if previous is None or (
                 record.timestamp,
@@ -547,6 +1307,13 @@ def _load_records_from_firefox_blob_fallback(source_config: dict) -> list[Status
                 previous.source_file,
             ):
                 latest_records[record.status_id] = record
+                pending_records.append(record)
+                if len(pending_records) >= STREAM_BATCH_RECORDS:
+                    yield pending_records
+                    pending_records = []
+
+    if pending_records:
+        yield pending_records
 
     return sorted(
         latest_records.values(),
@@ -555,12 +1322,89 @@ def _load_records_from_firefox_blob_fallback(source_config: dict) -> list[Status
     )
 
 
-def _iter_firefox_message_blobs(source_path: str) -> Iterable[tuple[int, bytes]]:
+def _iter_firefox_message_records(
+    source_path: str,
+    source_config: dict,
+) -> Iterator[StatusRecord]:
+    """Yield the status records of one Firefox database, reusing unchanged rows.
+
+    A database whose file and WAL are untouched is not opened at all; otherwise
+    SQLite digests every status row and only rows whose digest changed are
+    fetched and decoded.
+    """
+    state_key = (source_config["key"], source_path)
+    signature = _firefox_database_signature(source_path)
+    state = _FIREFOX_DATABASE_STATES.get(state_key)
+    if state is not None and state.signature == signature:
+        for _, record in state.rows.values():
+            if record is not None:
+                yield record
+        return
+
+    known_rows = state.rows if state is not None else {}
+    rows: dict[bytes, tuple[int, StatusRecord | None]] = {}
+    try:
+        for source_offset, (key, digest, message_blob) in enumerate(
+            _iter_firefox_message_rows(source_path, known_rows)
+        ):
+            if message_blob is None:
+                record = known_rows[key][1]
+                # Offsets count status rows in key order and shift when rows
+                # are inserted before this one.
+                if record is not None and record.source_offset != source_offset:
+                    record = record.with_changes(source_offset=source_offset)
+            else:
+                record = _build_status_record_from_firefox_message(
+                    message_blob,
+                    source_path,
+                    source_offset,
+                    source_config,
+                )
+            rows[key] = (digest, record)
+            if record is not None:
+                yield record
+    except sqlite3.Error:
+        # A partial read is not remembered; the next refresh starts over.
+        return
+
+    _FIREFOX_DATABASE_STATES[state_key] = _FirefoxDatabaseState(signature=signature, rows=rows)
+
+
+def _iter_firefox_message_rows(
+    source_path: str,
+    known_rows: dict[bytes, tuple[int, "StatusRecord | None"]],
+) -> Iterator[tuple[bytes, int, bytes | None]]:
+    """Yield ``(key, digest, data)`` for status rows; ``data`` is None when unchanged.
+
+    Rows are fetched ``FIREFOX_ROW_CHUNK_ROWS`` at a time in key order, each
+    chunk over its own connection: record streams are resumed on whichever
+    executor thread is free, and a SQLite connection may only be used on the
+    thread that opened it.
+    """
+    after_key = None
+    while True:
+        message_rows, after_key = _read_firefox_message_row_chunk(source_path, known_rows, after_key)
+        yield from message_rows
+        if after_key is None:
+            return
+
+
+def _read_firefox_message_row_chunk(
+    source_path: str,
+    known_rows: dict[bytes, tuple[int, "StatusRecord | None"]],
+    after_key: bytes | None,
+) -> tuple[list[tuple[bytes, int, bytes | None]], bytes | None]:
+    """Read the next chunk of status rows after ``after_key``.
+
+    Returns the rows and the key to continue after, or None once the table
+    is exhausted.
+    """
     try:
         connection = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True, timeout=1)
     except sqlite3.Error:
-        return []
+        return [], None
 
+    message_rows: list[tuple[bytes, int, bytes | None]] = []
     try:
         cursor = connection.cursor()
         table_names = {
@@ -570,42 +1414,158 @@ def _iter_firefox_message_blobs(source_path: str) -> Iterable[tuple[int, bytes]]
             )
         }
         if not FIREFOX_REQUIRED_TABLES.issubset(table_names):
-            return []
+            return message_rows, None
 
         database_names = {row[0] for row in cursor.execute("SELECT name FROM database")}
         if MESSAGE_DATABASE_NAME not in database_names:
-            return []
+            return message_rows, None
 
         object_store_row = cursor.execute(
             "SELECT id FROM object_store WHERE name = ?",
             (MESSAGE_OBJECT_STORE_NAME,),
         ).fetchone()
         if not object_store_row:
-            return []
+            return message_rows, None
 
         object_store_id = int(object_store_row[0])
-        blobs: list[tuple[int, bytes]] = []
-        for source_offset, (_, data) in enumerate(
+        key_condition = "" if after_key is None else "AND key > ? "
+        parameters = (object_store_id,) if after_key is None else (object_store_id, after_key)
+        # SQLite drops non-status rows itself, so only matching rows ever
+        # reach Python.
+        _register_firefox_marker_function(connection)
+        if not known_rows:
             cursor.execute(
-                "SELECT key, data FROM object_data WHERE object_store_id = ?",
-                (object_store_id,),
+                "SELECT key, data FROM object_data "
+                f"WHERE object_store_id = ? {key_condition}AND has_status_marker(data) "
+                "ORDER BY key LIMIT ?",
+                (*parameters, FIREFOX_ROW_CHUNK_ROWS),
             )
-        ):
-            if not isinstance(data, bytes) or STATUS_MARKER not in data:
+            chunk = cursor.fetchall()
+            for key, data in chunk:
+                if isinstance(data, bytes):
+                    message_rows.append((key, _firefox_blob_digest(data), data))
+            return message_rows, _next_chunk_key(chunk)
+
+        connection.create_function(
+            "status_blob_digest",
+            1,
+            _firefox_blob_digest,
+            deterministic=True,
+        )
+        cursor.execute(
+            "SELECT key, status_blob_digest(data) FROM object_data "
+            f"WHERE object_store_id = ? {key_condition}AND has_status_marker(data) "
+            "ORDER BY key LIMIT ?",
+            (*parameters, FIREFOX_ROW_CHUNK_ROWS),
+        )
+        chunk = cursor.fetchall()
+        for key, digest in chunk:
+            known_row = known_rows.get(key)
+            if known_row is not None and known_row[0] == digest:
+                message_rows.append((key, digest, None))
                 continue
-            blobs.append((source_offset, data))
-        return blobs
-    except sqlite3.Error:
-        return []
+
+            data_row = cursor.execute(
+                "SELECT data FROM object_data WHERE object_store_id = ? AND key = ?",
+                (object_store_id, key),
+            ).fetchone()
+            if data_row and isinstance(data_row[0], bytes):
+                message_rows.append((key, digest, data_row[0]))
+        return message_rows, _next_chunk_key(chunk)
     finally:
         connection.close()
 
 
-def _iter_firefox_raw_blobs(source_path: str) -> Iterable[tuple[int, bytes]]:
+def _next_chunk_key(chunk: list[tuple]):
+    # A short chunk is the last one.
+    return chunk[-1][0] if len(chunk) >= FIREFOX_ROW_CHUNK_ROWS else None
+
+
+def _register_firefox_marker_function(connection: sqlite3.Connection) -> None:
+    connection.create_function(
+        "has_status_marker",
+        1,
+        _firefox_value_has_status_marker,
+        deterministic=True,
+    )
+
+
+def _firefox_value_has_status_marker(data) -> bool:
+    """Whether a stored value mentions ``status@broadcast`` once decompressed.
+
+    Snappy may split the marker across elements or copy part of it from an
+    earlier occurrence, so the compressed bytes alone do not tell. Results
+    are remembered by digest, so a refresh only decompresses changed rows.
+    """
+    if not isinstance(data, bytes):
+        return False
+    if STATUS_MARKER in data:
+        return True
+
+    digest = _firefox_blob_digest(data)
+    has_marker = _FIREFOX_MARKER_CACHE.get(digest)
+    if has_marker is None:
+        try:
+            has_marker = STATUS_MARKER in decompress_snappy(data)
+        except ValueError:
+            has_marker = False
+        if len(_FIREFOX_MARKER_CACHE) >= FIREFOX_MARKER_CACHE_LIMIT:
+            _FIREFOX_MARKER_CACHE.clear()
+        _FIREFOX_MARKER_CACHE[digest] = has_marker
+    return has_marker
+
+
+def _firefox_blob_digest(data) -> int | None:
+    if not isinstance(data, bytes):
+        return None
+    return (len(data) << 32) | zlib.crc32(data)
+
+
+def _firefox_database_signature(source_path: str) -> tuple:
+    signature = []
+    for path in (source_path, f"{source_path}-wal"):
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat_result.st_size, stat_result.st_mtime_ns))
+    return tuple(signature)
+
+
+def _iter_firefox_raw_records(
+    source_path: str,
+    source_config: dict,
+) -> Iterator[StatusRecord]:
+    for source_offset, message_blob in enumerate(_iter_firefox_raw_blobs(source_path)):
+        record = _build_status_record_from_firefox_message(
+            message_blob,
+            source_path,
+            source_offset,
+            source_config,
+        )
+        if record:
+            yield record
+
+
+def _iter_firefox_raw_blobs(source_path: str) -> Iterator[bytes]:
+    # Chunked over short-lived connections, like _iter_firefox_message_rows.
+    after_row = None
+    while True:
+        message_blobs, after_row = _read_firefox_raw_blob_chunk(source_path, after_row)
+        yield from message_blobs
+        if after_row is None:
+            return
+
+
+def _read_firefox_raw_blob_chunk(
+    source_path: str,
+    after_row: tuple[int, bytes] | None,
+) -> tuple[list[bytes], tuple[int, bytes] | None]:
     try:
         connection = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True, timeout=1)
     except sqlite3.Error:
-        return []
+        return [], None
 
     try:
         cursor = connection.cursor()
@@ -616,22 +1576,25 @@ def _iter_firefox_raw_blobs(source_path: str) -> Iterable[tuple[int, bytes]]:
             )
         }
         if "object_data" not in table_names:
-            return []
-
-        blobs: list[tuple[int, bytes]] = []
-        for source_offset, row in enumerate(
-            cursor.execute("SELECT data FROM object_data")
-        ):
-            data = row[0]
-            if not isinstance(data, bytes) or STATUS_MARKER not in data:
-                continue
-            blobs.append((source_offset, data))
-        return blobs
+            return [], None
+
+        _register_firefox_marker_function(connection)
+        row_condition = "" if after_row is None else "AND (object_store_id, key) > (?, ?) "
+        cursor.execute(
+            "SELECT object_store_id, key, data FROM object_data "
+            f"WHERE has_status_marker(data) {row_condition}"
+            "ORDER BY object_store_id, key LIMIT ?",
+            (*(after_row or ()), FIREFOX_ROW_CHUNK_ROWS),
+        )
+        chunk = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return [], None
     finally:
         connection.close()
 
+    next_row = chunk[-1][:2] if len(chunk) >= FIREFOX_ROW_CHUNK_ROWS else None
+    return [data for _, _, data in chunk if isinstance(data, bytes)], next_row
+
 
 def _build_status_record_from_firefox_message(
     message_blob: bytes,
@@ -639,7 +1602,39 @@ def _build_status_record_from_firefox_message(
     source_offset: int,
     source_config: dict,
 ) -> StatusRecord | None:
-    message_type = _extract_firefox_message_type(message_blob)
+    """Decode a Firefox message value and build its record like a Chromium one.
+
+    Values the structured-clone decoder rejects are still searched for the
+    known fields byte by byte.
+    """
+    try:
+        message = decode_structured_clone(message_blob)
+    except ValueError:
+        return _build_status_record_from_firefox_blob(
+            message_blob,
+            source_file,
+            source_offset,
+            source_config,
+        )
+
+    if not isinstance(message, dict):
+        return None
+    return _build_status_record_from_message(
+        _compact_message(message),
+        source_file,
+        source_offset,
+        source_config,
+    )
+
+
+def _build_status_record_from_firefox_blob(
+    message_blob: bytes,
+    source_file: str,
+    source_offset: int,
+    source_config: dict,
+) -> StatusRecord | None:
+    type_match = FIREFOX_TYPE_PATTERN.search(message_blob)
+    message_type = type_match.group(1).decode("utf-8", "ignore") if type_match else None
     if message_type == "imag":
         kind = "photos"
         mimetype = "image/jpeg"
@@ -652,125 +1647,363 @@ def _build_status_record_from_firefox_message(
     else:
         return None
 
-    direct_path = _extract_firefox_direct_path(message_blob)
-    filehash = _extract_firefox_filehash(message_blob)
+    direct_path = _path_after_offset(message_blob, message_blob.find(b"directPath"), max_gap=48)
+    filehash = _base64_after_offset(message_blob, message_blob.find(b"filehash"), len(b"filehash"))
     if kind != "texts" and (not direct_path or not filehash):
         return None
+
+    message_fields = _extract_firefox_fields(message_blob)
     if kind == "texts" and not filehash:
         filehash = _fallback_text_filehash(
-            _normalize_status_id(_extract_firefox_status_id(message_blob) or None),
+            _normalize_status_id(message_fields["status_id"] or None),
             source_config["key"],
             source_offset,
         )
 
-    status_id = _normalize_status_id(_extract_firefox_status_id(message_blob) or filehash)
+    status_id = _normalize_status_id(message_fields["status_id"] or filehash)
     normalized_direct_path = _normalize_direct_path(direct_path) if direct_path else None
     url = f"https://mmg.whatsapp.net{normalized_direct_path}" if normalized_direct_path else ""
 
-    music = _extract_embedded_music_from_blob(message_blob)
-
-    return StatusRecord(
+    return _new_status_record(
         status_id=status_id,
         kind=kind,
         mimetype=mimetype,
         url=url,
         direct_path=normalized_direct_path,
         filehash=filehash,
-        enc_filehash=_extract_firefox_enc_filehash(message_blob),
-        media_key=_extract_firefox_media_key(message_blob),
+        enc_filehash=message_fields["enc_filehash"],
+        media_key=message_fields["media_key"],
         source_file=source_file,
         source_offset=source_offset,
-        timestamp=_extract_firefox_timestamp(message_blob),
+        timestamp=message_fields["timestamp"],
         author_jid=None,
-        source_key=source_config["key"],
-        source_label=source_config["label"],
-        source_indexeddb_dir=source_config["indexeddb_dir"],
-        source_blob_dir=source_config.get("blob_dir"),
+        source=_source_info_for_config(source_config),
         text_value=None,
-        text_subtype=_extract_firefox_subtype(message_blob),
-        background_color=_extract_firefox_background_color(message_blob),
-        text_color=_extract_firefox_text_color(message_blob),
-        font_id=_extract_firefox_font_id(message_blob),
+        text_subtype=message_fields["subtype"],
+        background_color=message_fields["background_color"],
+        text_color=message_fields["text_color"],
+        font_id=message_fields["font_id"],
         thumbnail_direct_path=None,
         thumbnail_filehash=None,
         thumbnail_enc_filehash=None,
         thumbnail_inline=None,
-        music_title=music.get("title"),
-        music_artist=music.get("artist"),
-        music_artwork_direct_path=music.get("artwork_direct_path"),
-        music_artwork_filehash=music.get("artwork_filehash"),
-        music_artwork_enc_filehash=music.get("artwork_enc_filehash"),
-        music_artwork_media_key=music.get("artwork_media_key"),
-        music_track_duration_ms=music.get("duration_ms"),
+        music_title=message_fields["music_title"],
+        music_artist=message_fields["music_artist"],
+        music_artwork_direct_path=message_fields["music_artwork_direct_path"],
+        music_artwork_filehash=message_fields["music_artwork_filehash"],
+        music_artwork_enc_filehash=message_fields["music_artwork_enc_filehash"],
+        music_artwork_media_key=message_fields["music_artwork_media_key"],
+        music_track_duration_ms=message_fields["music_track_duration_ms"],
     )
 
 
 def _load_records_from_message_store(source_config: dict) -> list[StatusRecord]:
+    return _drain_record_stream(_stream_records_from_message_store(source_config))
+
+
+def _stream_records_from_message_store(source_config: dict) -> Iterator[list[StatusRecord]]:
+    source_key = source_config["key"]
+    with _MESSAGE_STORE_TAIL_LOCKS_GUARD:
+        tail_lock = _MESSAGE_STORE_TAIL_LOCKS.setdefault(source_key, threading.Lock())
+
+    with tail_lock:
+        tail = _MESSAGE_STORE_TAILS.get(source_key)
+        if tail is not None and tail.indexeddb_dir == source_config["indexeddb_dir"]:
+            try:
+                yield from _advance_message_store_tail(tail, source_config)
+            except Exception:
+                tail = None
+        else:
+            tail = None
+
+        if tail is None:
+            _MESSAGE_STORE_TAILS.pop(source_key, None)
+            tail = yield from _build_message_store_tail(source_config)
+            _MESSAGE_STORE_TAILS[source_key] = tail
+
+        records = [
+            record
+            for _, _, record in tail.latest_messages.values()
+            if record is not None
+        ]
+
+    records.sort(key=lambda record: (record.timestamp, record.status_id), reverse=True)
+    return records
+
+
+def _build_message_store_tail(source_config: dict) -> Iterator[list[StatusRecord]]:
     indexeddb_dir = source_config["indexeddb_dir"]
     source_blob_dir = source_config.get("blob_dir")
     blob_dir = source_blob_dir if source_blob_dir and os.path.isdir(source_blob_dir) else None
+    # Listed before the database is opened: a file that grows in between is
+    # simply consumed again on the next refresh.
+    data_files = _list_leveldb_data_files(indexeddb_dir)
     indexed_db = IndexedDb(indexeddb_dir, blob_dir)
     try:
         database_id = _get_database_id(indexed_db, MESSAGE_DATABASE_NAME)
         object_store_id = _get_object_store_id(indexed_db, database_id, MESSAGE_OBJECT_STORE_NAME)
-        prefix = IndexedDb.make_prefix(database_id, object_store_id, 1)
-        blink_deserializer = ccl_blink_value_deserializer.BlinkV8Deserializer()
-        latest_messages: dict[str, tuple[int, str, dict]] = {}
+        tail = _MessageStoreTail(
+            indexeddb_dir=indexeddb_dir,
+            blob_dir=blob_dir,
+            database_id=database_id,
+            object_store_id=object_store_id,
+            prefix=IndexedDb.make_prefix(database_id, object_store_id, 1),
+            blob_prefix=IndexedDb.make_prefix(database_id, object_store_id, 3),
+        )
+        fetched_records = indexed_db._fetched_records
+        yield from _stream_message_store_records(tail, indexed_db, fetched_records, source_config)
+        for raw_record in fetched_records:
+            _advance_log_watermark(tail, raw_record)
+        _remember_blob_records(tail, fetched_records)
+        tail.consumed_files = data_files
+        return tail
+    finally:
+        indexed_db.close()
+
+
+def _advance_message_store_tail(
+    tail: _MessageStoreTail,
+    source_config: dict,
+) -> Iterator[list[StatusRecord]]:
+    data_files = _list_leveldb_data_files(tail.indexeddb_dir)
+    changed_files = [
+        file_name
+        for file_name, signature in data_files.items()
+        if tail.consumed_files.get(file_name) != signature
+    ]
+    if not changed_files:
+        tail.consumed_files = data_files
+        return
+
+    for file_name in sorted(changed_files, key=_leveldb_file_number):
+        file_path = pathlib.Path(tail.indexeddb_dir, file_name)
+        if file_name.endswith(".log"):
+            leveldb_file = ccl_leveldb.LogFile(file_path)
+            watermark = tail.log_watermarks.get(file_name, -1)
+        else:
+            leveldb_file = ccl_leveldb.LdbFile(file_path)
+            watermark = -1
+
+        try:
+            raw_records = [
+                raw_record
+                for raw_record in leveldb_file.iterate_records_raw()
+                if raw_record.offset > watermark
+            ]
+        finally:
+            leveldb_file.close()
+
+        _remember_blob_records(tail, raw_records)
+        yield from _stream_message_store_records(
+            tail,
+            _open_blob_entry_reader(tail),
+            raw_records,
+            source_config,
+        )
+        for raw_record in raw_records:
+            _advance_log_watermark(tail, raw_record)
+
+    tail.consumed_files = data_files
+    tail.log_watermarks = {
+        file_name: offset
+        for file_name, offset in tail.log_watermarks.items()
+        if file_name in data_files
+    }
 
-        for raw_record in indexed_db._fetched_records:
-            if not raw_record.key.startswith(prefix):
-                continue
-            if STATUS_KEY_NEEDLE_UTF16 not in raw_record.key:
-                continue
 
-            message = _deserialize_message_record(
+def _remember_blob_records(tail: _MessageStoreTail, raw_records: Iterable) -> None:
+    # Compactions re-emit the same blob entries, so keep one per key and let
+    # the newest write (including a deletion) win.
+    for raw_record in raw_records:
+        if not raw_record.key.startswith(tail.blob_prefix):
+            continue
+        previous = tail.blob_records.get(raw_record.key)
+        if previous is None or raw_record.seq > previous.seq:
+            tail.blob_records[raw_record.key] = raw_record
+
+
+def _open_blob_entry_reader(tail: _MessageStoreTail) -> "IndexedDb":
+    """An ``IndexedDb`` that resolves external values from the tail's blob entries.
+
+    It never opens LevelDB: ``read_record_precursor`` only needs the blob
+    entries and the blob directory, and the full reader would decode every
+    record in the store again.
+    """
+    indexed_db = IndexedDb.__new__(IndexedDb)
+    indexed_db._blob_dir = tail.blob_dir
+    indexed_db._blob_lookup_cache = {}
+    indexed_db._fetched_records = [
+        raw_record
+        for raw_record in tail.blob_records.values()
+        if raw_record.value
+    ]
+    return indexed_db
+
+
+def _stream_message_store_records(
+    tail: _MessageStoreTail,
+    indexed_db: "IndexedDb",
+    raw_records: Iterable,
+    source_config: dict,
+) -> Iterator[list[StatusRecord]]:
+    # Newest writes first, in chunks, so the first screen fills from recent
+    # statuses. Older versions met in later chunks fail the per-key sequence
+    # check and are never decoded.
+    candidates = sorted(
+        (
+            raw_record
+            for raw_record in raw_records
+            if raw_record.key.startswith(tail.prefix)
+            and STATUS_KEY_NEEDLE_UTF16 in raw_record.key
+        ),
+        key=lambda raw_record: raw_record.seq,
+        reverse=True,
+    )
+    for start in range(0, len(candidates), MESSAGE_STREAM_CHUNK_RECORDS):
+        new_records = _consume_message_store_records(
+            tail,
+            indexed_db,
+            candidates[start:start + MESSAGE_STREAM_CHUNK_RECORDS],
+            source_config,
+        )
+        if new_records:
+            yield new_records
+
+
+def _consume_message_store_records(
+    tail: _MessageStoreTail,
+    indexed_db: "IndexedDb",
+    raw_records: Iterable,
+    source_config: dict,
+) -> list[StatusRecord]:
+    # Statuses are rewritten many times (views, receipts), so group the raw
+    # versions by key first and only decode the newest one of each.
+    versions_by_key: dict[bytes, list] = {}
+    for raw_record in raw_records:
+        if not raw_record.key.startswith(tail.prefix):
+            continue
+        if STATUS_KEY_NEEDLE_UTF16 not in raw_record.key:
+            continue
+        # Compactions rewrite records with their original sequence numbers,
+        # so anything at or below what this key already produced is stale.
+        if raw_record.seq <= tail.key_sequences.get(raw_record.key, -1):
+            continue
+        versions_by_key.setdefault(raw_record.key, []).append(raw_record)
+
+    new_records: dict[str, StatusRecord] = {}
+    for key, versions in list(versions_by_key.items()):
+        versions.sort(key=lambda raw_record: raw_record.seq)
+        deletions = [index for index, raw_record in enumerate(versions) if not raw_record.value]
+        if not deletions:
+            continue
+        if deletions[-1] == len(versions) - 1:
+            # WhatsApp expired or deleted this status after its last live
+            # version; older versions met later fail the sequence check.
+            deletion_seq = versions[-1].seq
+            del versions_by_key[key]
+            tail.key_sequences[key] = deletion_seq
+            status_id = tail.key_status_ids.pop(key, None)
+            previous = tail.latest_messages.get(status_id) if status_id else None
+            if previous is not None and previous[0] < deletion_seq:
+                del tail.latest_messages[status_id]
+                new_records.pop(status_id, None)
+        else:
+            # Only versions written after the last deletion are live.
+            del versions[:deletions[-1] + 1]
+
+    while versions_by_key:
+        winners = [versions.pop() for versions in versions_by_key.values()]
+        payloads = [
+            _read_message_payload(
                 indexed_db,
                 raw_record,
-                prefix,
-                database_id,
-                object_store_id,
-                blink_deserializer,
+                tail.prefix,
+                tail.database_id,
+                tail.object_store_id,
             )
-            if not isinstance(message, dict):
-                continue
+            for raw_record in winners
+        ]
+        messages = _decode_message_payloads(payloads)
 
-            status_id = _extract_status_id(message)
+        for raw_record, message in zip(winners, messages):
+            status_id = _extract_status_id(message) if isinstance(message, dict) else None
             if not status_id:
+                # Fall back to the next older version of this key, if any.
                 continue
 
-            previous = latest_messages.get(status_id)
+            del versions_by_key[raw_record.key]
+            tail.key_sequences[raw_record.key] = raw_record.seq
+            tail.key_status_ids[raw_record.key] = status_id
+            previous = tail.latest_messages.get(status_id)
             if previous is None or raw_record.seq > previous[0]:
-                latest_messages[status_id] = (
-                    raw_record.seq,
-                    str(raw_record.origin_file),
+                origin_file = str(raw_record.origin_file)
+                record = _build_status_record_from_message(
                     message,
+                    origin_file,
+                    raw_record.seq,
+                    source_config,
                 )
+                tail.latest_messages[status_id] = (raw_record.seq, origin_file, record)
+                if record is not None:
+                    new_records[status_id] = record
+                else:
+                    new_records.pop(status_id, None)
+
+        versions_by_key = {
+            key: versions
+            for key, versions in versions_by_key.items()
+            if versions
+        }
 
-        records: list[StatusRecord] = []
-        for sequence_number, origin_file, message in latest_messages.values():
-            record = _build_status_record_from_message(
-                message,
-                origin_file,
-                sequence_number,
-                source_config,
-            )
-            if record:
-                records.append(record)
+    return list(new_records.values())
 
-        records.sort(key=lambda record: (record.timestamp, record.status_id), reverse=True)
-        return records
-    finally:
-        indexed_db.close()
+
+def _advance_log_watermark(tail: _MessageStoreTail, raw_record) -> None:
+    file_name = os.path.basename(str(raw_record.origin_file))
+    if not file_name.endswith(".log"):
+        return
+    if raw_record.offset > tail.log_watermarks.get(file_name, -1):
+        tail.log_watermarks[file_name] = raw_record.offset
+
+
+def _list_leveldb_data_files(indexeddb_dir: str) -> dict[str, tuple[int, int]]:
+    data_files: dict[str, tuple[int, int]] = {}
+    try:
+        entries = list(os.scandir(indexeddb_dir))
+    except OSError:
+        return data_files
+
+    for entry in entries:
+        if not LEVELDB_DATA_FILE_PATTERN.match(entry.name):
+            continue
+        try:
+            stat_result = entry.stat()
+        except OSError:
+            continue
+        data_files[entry.name] = (stat_result.st_size, stat_result.st_mtime_ns)
+    return data_files
+
+
+def _leveldb_file_number(file_name: str) -> int:
+    try:
+        return int(file_name.split(".", 1)[0], 16)
+    except ValueError:
+        return -1
 
 
-def _deserialize_message_record(
-    indexed_db: IndexedDb,
+def _read_message_payload(
+    indexed_db: "IndexedDb",
     raw_record,
     prefix: bytes,
     database_id: int,
     object_store_id: int,
-    blink_deserializer,
-) -> dict | None:
+) -> bytes | None:
+    """Unwrap a raw IndexedDB value down to its V8-serialized bytes.
+
+    This stays in the calling process because external values are resolved
+    through the open IndexedDb reader; the bytes it returns can be decoded
+    anywhere.
+    """
     if not raw_record.value:
         return None
 
@@ -791,16 +2024,123 @@ def _deserialize_message_record(
             return None
 
         _, object_stream, _, _ = precursor
-        deserializer = ccl_v8_value_deserializer.Deserializer(
-            object_stream,
-            host_object_delegate=blink_deserializer.read,
-        )
-        value = deserializer.read()
-        return value if isinstance(value, dict) else None
+        return object_stream.read()
     except Exception:
         return None
 
 
+def _decode_message_payloads(payloads: list[bytes | None]) -> list[dict | None]:
+    """Decode V8 payloads, sharding them across worker processes when worthwhile.
+
+    Results keep the order of ``payloads``. Any failure of the process pool
+    falls back to decoding serially in this process.
+    """
+    executor = None
+    if MESSAGE_DECODE_WORKERS > 1 and len(payloads) >= MESSAGE_DECODE_PARALLEL_MIN_RECORDS:
+        executor = _get_message_decode_executor()
+    if executor is None:
+        return _decode_message_payload_shard(payloads)
+
+    shard_size = -(-len(payloads) // MESSAGE_DECODE_WORKERS)
+    shards = [
+        payloads[start:start + shard_size]
+        for start in range(0, len(payloads), shard_size)
+    ]
+    try:
+        messages: list[dict | None] = []
+        for decoded_shard in executor.map(_decode_message_payload_shard, shards):
+            messages.extend(decoded_shard)
+        return messages
+    except Exception:
+        _disable_message_decode_executor()
+        return _decode_message_payload_shard(payloads)
+
+
+def _decode_message_payload_shard(payloads: list[bytes | None]) -> list[dict | None]:
+    blink_deserializer = ccl_blink_value_deserializer.BlinkV8Deserializer()
+    messages: list[dict | None] = []
+    for payload in payloads:
+        if not payload:
+            messages.append(None)
+            continue
+        try:
+            deserializer = ccl_v8_value_deserializer.Deserializer(
+                BytesIO(payload),
+                host_object_delegate=blink_deserializer.read,
+            )
+            value = deserializer.read()
+        except Exception:
+            messages.append(None)
+            continue
+        messages.append(_compact_message(value) if isinstance(value, dict) else None)
+    return messages
+
+
+def _compact_message(message: dict) -> dict:
+    """Reduce a decoded message to the fields the record builders read.
+
+    The result contains only plain strings, numbers and dicts, so it is cheap
+    to send back from a worker process, and it yields the same record as the
+    full message.
+    """
+    compact: dict = {
+        name: message[name]
+        for name in MESSAGE_STRING_FIELDS
+        if isinstance(message.get(name), str)
+    }
+    for name in MESSAGE_NUMBER_FIELDS:
+        value = message.get(name)
+        if isinstance(value, (bool, int, float)):
+            compact[name] = value
+    for name in ("from", "author"):
+        compact[name] = _serialized_jid(message.get(name))
+    for name in ("thumbnailSha256", "thumbnailEncSha256"):
+        compact[name] = _bytes_to_base64(message.get(name))
+    compact["caption"] = _extract_text_value(message)
+
+    for path, value in _walk_values(message):
+        if path.endswith("embeddedMusic") and isinstance(value, dict):
+            compact["embeddedMusic"] = {
+                "title": _as_string(value.get("title")),
+                "author": _as_string(value.get("author")),
+                "artistAttribution": _as_string(value.get("artistAttribution")),
+                "artworkDirectPath": _as_string(value.get("artworkDirectPath")),
+                "artworkSha256": _bytes_to_base64(value.get("artworkSha256")),
+                "artworkEncSha256": _bytes_to_base64(value.get("artworkEncSha256")),
+                "artworkMediaKey": _bytes_to_base64(value.get("artworkMediaKey")),
+                "overlapDurationInMs": _coerce_int(value.get("overlapDurationInMs")),
+            }
+            break
+    return compact
+
+
+def _get_message_decode_executor() -> concurrent.futures.ProcessPoolExecutor | None:
+    global _MESSAGE_DECODE_EXECUTOR, _MESSAGE_DECODE_EXECUTOR_BROKEN
+
+    with _MESSAGE_DECODE_EXECUTOR_LOCK:
+        if _MESSAGE_DECODE_EXECUTOR_BROKEN:
+            return None
+        if _MESSAGE_DECODE_EXECUTOR is None:
+            try:
+                _MESSAGE_DECODE_EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=MESSAGE_DECODE_WORKERS,
+                )
+            except (OSError, ValueError, NotImplementedError):
+                _MESSAGE_DECODE_EXECUTOR_BROKEN = True
+                return None
+        return _MESSAGE_DECODE_EXECUTOR
+
+
+def _disable_message_decode_executor() -> None:
+    global _MESSAGE_DECODE_EXECUTOR, _MESSAGE_DECODE_EXECUTOR_BROKEN
+
+    with _MESSAGE_DECODE_EXECUTOR_LOCK:
+        _MESSAGE_DECODE_EXECUTOR_BROKEN = True
+        if _MESSAGE_DECODE_EXECUTOR is not None:
+            _MESSAGE_DECODE_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            _MESSAGE_DECODE_EXECUTOR = None
+
+
 def _build_status_record_from_message(
     message: dict,
     source_file: str,
@@ -837,7 +2177,7 @@ def _build_status_record_from_message(
 
     music = _extract_embedded_music(message)
 
-    return StatusRecord(
+    return _new_status_record(
         status_id=_normalize_status_id(_extract_status_id(message) or filehash),
         kind=kind,
         mimetype=mimetype,
@@ -850,10 +2190,7 @@ def _build_status_record_from_message(
         source_offset=source_offset,
         timestamp=float(message.get("t") or 0.0),
         author_jid=_serialized_jid(message.get("author")),
-        source_key=source_config["key"],
-        source_label=source_config["label"],
-        source_indexeddb_dir=source_config["indexeddb_dir"],
-        source_blob_dir=source_config.get("blob_dir"),
+        source=_source_info_for_config(source_config),
         text_value=_extract_text_value(message),
         text_subtype=_as_string(message.get("subtype")),
         background_color=_coerce_int(message.get("backgroundColor")),
@@ -928,133 +2265,534 @@ def _get_object_store_id(indexed_db: IndexedDb, database_id: int, object_store_n
 
 
 def _build_indexeddb_snapshot(source_config: dict) -> str:
-    snapshot_parts: list[str] = []
+    source_key = source_config["key"]
+    change_markers = _probe_source_change_markers(source_config)
+    cached_snapshot = _SNAPSHOT_CACHE.get(source_key)
+    if cached_snapshot and cached_snapshot[0] == change_markers:
+        return cached_snapshot[1]
+
+    digest = hashlib.sha256(repr(change_markers).encode("utf-8"))
     for root_dir in [source_config["indexeddb_dir"], source_config.get("blob_dir")]:
         if not root_dir or not os.path.exists(root_dir):
             continue
+        _update_directory_snapshot_digest(digest, root_dir, root_dir)
 
-        for current_root, _, files in os.walk(root_dir):
-            for file_name in sorted(files):
-                file_path = os.path.join(current_root, file_name)
-                try:
-                    stat_result = os.stat(file_path)
-                except OSError:
+    snapshot = digest.hexdigest()
+    _SNAPSHOT_CACHE[source_key] = (change_markers, snapshot)
+    return snapshot
+
+
+def _probe_source_change_markers(source_config: dict) -> tuple:
+    """Stat only the files that move whenever the store is written to.
+
+    LevelDB rewrites CURRENT/MANIFEST on compaction and appends every write to
+    the newest .log; Firefox writes through the .sqlite/-wal pair. New blob
+    files are always accompanied by one of those writes.
+    """
+    indexeddb_dir = source_config["indexeddb_dir"]
+    try:
+        directory_stat = os.stat(indexeddb_dir)
+        entries = list(os.scandir(indexeddb_dir))
+    except OSError:
+        return ()
+
+    if _is_firefox_source(source_config):
+        marker_entries = [
+            entry
+            for entry in entries
+            if entry.name.endswith((".sqlite", ".sqlite-wal"))
+        ]
+    else:
+        log_entries = [entry for entry in entries if entry.name.endswith(".log")]
+        latest_log = max(
+            log_entries,
+            key=lambda entry: _leveldb_file_number(entry.name),
+            default=None,
+        )
+        marker_entries = [
+            entry
+            for entry in entries
+            if entry.name == "CURRENT" or entry.name.startswith("MANIFEST-")
+        ]
+        if latest_log is not None:
+            marker_entries.append(latest_log)
+
+    markers = [(".", directory_stat.st_mtime_ns)]
+    for entry in sorted(marker_entries, key=lambda entry: entry.name):
+        try:
+            stat_result = entry.stat()
+        except OSError:
+            continue
+        markers.append((entry.name, stat_result.st_size, stat_result.st_mtime_ns))
+    return tuple(markers)
+
+
+def _update_directory_snapshot_digest(digest, root_dir: str, directory: str) -> None:
+    try:
+        directory_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return
+
+    # Directory mtimes only move when entries are added, removed or renamed,
+    # which is the only way blob files change. Files rewritten in place are
+    # covered by the change markers folded into the same digest.
+    cached_listing = _DIRECTORY_LISTING_CACHE.get(directory)
+    if cached_listing and cached_listing[0] == directory_mtime:
+        _, listing_digest, subdirectories = cached_listing
+    else:
+        listing_parts: list[str] = []
+        subdirectories = []
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    subdirectories.append(entry.path)
                     continue
-                rel_path = os.path.relpath(file_path, root_dir)
-                snapshot_parts.append(
-                    f"{root_dir}|{rel_path}|{stat_result.st_size}|{stat_result.st_mtime_ns}"
-                )
+                stat_result = entry.stat()
+            except OSError:
+                continue
+            rel_path = os.path.relpath(entry.path, root_dir)
+            listing_parts.append(
+                f"{root_dir}|{rel_path}|{stat_result.st_size}|{stat_result.st_mtime_ns}"
+            )
+        listing_digest = hashlib.sha256("\n".join(listing_parts).encode("utf-8")).hexdigest()
+        _DIRECTORY_LISTING_CACHE[directory] = (directory_mtime, listing_digest, subdirectories)
 
-    digest = hashlib.sha256()
-    for part in snapshot_parts:
-        digest.update(part.encode("utf-8"))
-    return digest.hexdigest()
+    digest.update(listing_digest.encode("ascii"))
+    for subdirectory in subdirectories:
+        _update_directory_snapshot_digest(digest, root_dir, subdirectory)
 
 
 def _index_cache_file_for_source(source_key: str) -> str:
-    safe_source_key = "".join(
-        char if char.isalnum() or char in {"-", "_"} else "-"
-        for char in source_key
+    return os.path.join(
+        STATUS_MEDIA_CACHE_DIR,
+        f"_status_index_cache_{_safe_source_key(source_key)}.sqlite",
     )
+
+
+def _regex_scan_cache_file_for_source(source_key: str) -> str:
     return os.path.join(
         STATUS_MEDIA_CACHE_DIR,
-        f"_status_index_cache_{safe_source_key}.json",
+        f"_regex_scan_cache_{_safe_source_key(source_key)}.sqlite",
     )
 
 
-def _load_cached_records(source_key: str, snapshot: str) -> list[StatusRecord] | None:
+def _blob_hash_cache_file_for_source(source_key: str) -> str:
+    return os.path.join(
+        STATUS_MEDIA_CACHE_DIR,
+        f"_blob_hash_cache_{_safe_source_key(source_key)}.sqlite",
+    )
+
+
+def _legacy_index_cache_file_for_source(source_key: str) -> str:
+    return os.path.join(
+        STATUS_MEDIA_CACHE_DIR,
+        f"_status_index_cache_{_safe_source_key(source_key)}.json",
+    )
+
+
+def _safe_source_key(source_key: str) -> str:
+    return "".join(
+        char if char.isalnum() or char in {"-", "_"} else "-"
+        for char in source_key
+    )
+
+
+def _open_cached_index(source_key: str, snapshot: str) -> sqlite3.Connection | None:
     index_cache_file = _index_cache_file_for_source(source_key)
     if not os.path.exists(index_cache_file):
         return None
 
     try:
-        with open(index_cache_file, "r", encoding="utf-8") as cache_file:
-            payload = json.load(cache_file)
-    except (OSError, ValueError, TypeError):
+        connection = sqlite3.connect(f"file:{index_cache_file}?mode=ro", uri=True, timeout=1)
+    except sqlite3.Error:
         return None
 
-    generated_at = payload.get("generated_at")
+    try:
+        meta = dict(connection.execute("SELECT name, value FROM meta"))
+    except sqlite3.Error:
+        connection.close()
+        return None
+
+    generated_at = meta.get("generated_at")
     is_recent = isinstance(generated_at, (int, float)) and (
         time.time() - float(generated_at) <= INDEX_CACHE_MAX_AGE_SECONDS
     )
+    if (
+        (meta.get("snapshot") != snapshot and not is_recent)
+        or meta.get("schema_version") != INDEX_CACHE_SCHEMA_VERSION
+    ):
+        connection.close()
+        return None
+    return connection
+
+
+def _read_cached_index_rows(
+    connection: sqlite3.Connection,
+    kind: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[StatusRecord]:
+    sources = {
+        row[0]: (_source_info(*row[1:5]), row[5])
+        for row in connection.execute(
+            f"SELECT id, {', '.join(INDEX_CACHE_SOURCE_COLUMNS)} FROM sources"
+        )
+    }
+    query = f"SELECT source_ref, {', '.join(INDEX_CACHE_RECORD_COLUMNS)} FROM records"
+    parameters: list = []
+    if kind is not None:
+        query += " WHERE kind = ?"
+        parameters.append(kind)
+    query += " ORDER BY position"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        parameters.extend([limit, max(0, offset)])
+
+    records: list[StatusRecord] = []
+    for row in connection.execute(query, parameters):
+        source, source_file = sources[row[0]]
+        record_fields = dict(zip(INDEX_CACHE_RECORD_COLUMNS, row[1:]))
+        records.append(_new_status_record(source=source, source_file=source_file, **record_fields))
+    return records
 
-    if payload.get("snapshot") != snapshot and not is_recent:
+
+def _load_cached_records(source_key: str, snapshot: str) -> list[StatusRecord] | None:
+    connection = _open_cached_index(source_key, snapshot)
+    if connection is None:
         return None
-    if payload.get("schema_version") != INDEX_CACHE_SCHEMA_VERSION:
+
+    try:
+        return _read_cached_index_rows(connection)
+    except (sqlite3.Error, KeyError, TypeError, ValueError):
         return None
+    finally:
+        connection.close()
 
-    records = payload.get("records")
-    if not isinstance(records, list):
+
+def _load_cached_records_page(
+    source_key: str,
+    snapshot: str,
+    kind: str,
+    offset: int = 0,
+    limit: int | None = None,
+) -> tuple[list[StatusRecord], int] | None:
+    connection = _open_cached_index(source_key, snapshot)
+    if connection is None:
         return None
 
     try:
-        return [StatusRecord(**record) for record in records]
-    except (TypeError, ValueError):
+        total_count = connection.execute(
+            "SELECT COUNT(*) FROM records WHERE kind = ?",
+            (kind,),
+        ).fetchone()[0]
+        return _read_cached_index_rows(connection, kind, offset, limit), int(total_count)
+    except (sqlite3.Error, KeyError, TypeError, ValueError):
         return None
+    finally:
+        connection.close()
 
 
 def _write_cached_records(source_key: str, snapshot: str, records: list[StatusRecord]) -> None:
     index_cache_file = _index_cache_file_for_source(source_key)
-    payload = {
-        "schema_version": INDEX_CACHE_SCHEMA_VERSION,
-        "generated_at": time.time(),
-        "snapshot": snapshot,
-        "records": [asdict(record) for record in records],
-    }
+    source_refs: dict[tuple, int] = {}
+    record_rows: list[tuple] = []
+    for position, record in enumerate(records):
+        source_fields = tuple(getattr(record, column) for column in INDEX_CACHE_SOURCE_COLUMNS)
+        source_ref = source_refs.setdefault(source_fields, len(source_refs))
+        record_rows.append(
+            (position, source_ref)
+            + tuple(getattr(record, column) for column in INDEX_CACHE_RECORD_COLUMNS)
+        )
 
     temp_file = None
     try:
         with tempfile.NamedTemporaryFile(
-            "w",
             delete=False,
             dir=os.path.dirname(index_cache_file),
             suffix=".tmp",
-            encoding="utf-8",
         ) as temp_handle:
-            json.dump(payload, temp_handle)
             temp_file = temp_handle.name
+
+        connection = sqlite3.connect(temp_file)
+        try:
+            connection.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value)")
+            connection.execute(
+                f"CREATE TABLE sources (id INTEGER PRIMARY KEY, {', '.join(INDEX_CACHE_SOURCE_COLUMNS)})"
+            )
+            connection.execute(
+                "CREATE TABLE records (position INTEGER PRIMARY KEY, source_ref INTEGER, "
+                f"{', '.join(INDEX_CACHE_RECORD_COLUMNS)})"
+            )
+            connection.execute("CREATE INDEX records_by_kind ON records (kind, position)")
+            connection.executemany(
+                "INSERT INTO meta (name, value) VALUES (?, ?)",
+                [
+                    ("schema_version", INDEX_CACHE_SCHEMA_VERSION),
+                    ("generated_at", time.time()),
+                    ("snapshot", snapshot),
+                ],
+            )
+            connection.executemany(
+                f"INSERT INTO sources VALUES (?, {', '.join('?' for _ in INDEX_CACHE_SOURCE_COLUMNS)})",
+                [(source_ref,) + source_fields for source_fields, source_ref in source_refs.items()],
+            )
+            connection.executemany(
+                f"INSERT INTO records VALUES (?, ?, {', '.join('?' for _ in INDEX_CACHE_RECORD_COLUMNS)})",
+                record_rows,
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
         os.replace(temp_file, index_cache_file)
-    except OSError:
+        temp_file = None
+        legacy_index_cache_file = _legacy_index_cache_file_for_source(source_key)
+        if os.path.exists(legacy_index_cache_file):
+            os.remove(legacy_index_cache_file)
+    except (OSError, sqlite3.Error):
+        pass
+    finally:
         if temp_file and os.path.exists(temp_file):
             os.unlink(temp_file)
 
 
 def _load_records_from_regex_fallback(source_config: dict) -> list[StatusRecord]:
-    status_url_pattern = re.compile(STATUS_URL_PATTERN)
-    direct_path_pattern = re.compile(DIRECT_PATH_PATTERN)
-    mime_pattern = re.compile(MIME_PATTERN)
-    filehash_pattern = re.compile(FILEHASH_PATTERN)
-    enc_filehash_pattern = re.compile(ENC_FILEHASH_PATTERN)
-    media_key_pattern = re.compile(MEDIA_KEY_PATTERN)
+    return _drain_record_stream(_stream_records_from_regex_fallback(source_config))
+
+
+def _stream_records_from_regex_fallback(source_config: dict) -> Iterator[list[StatusRecord]]:
+    records: list[StatusRecord] = []
+    dedupe_keys: set[str] = set()
+
+    indexeddb_dir = source_config["indexeddb_dir"]
+    if not os.path.isdir(indexeddb_dir):
+        return records
+
+    file_names = [
+        file_name
+        for file_name in sorted(os.listdir(indexeddb_dir), reverse=True)
+        if file_name.endswith((".ldb", ".log"))
+    ]
+    for file_name in file_names:
+        source_path = os.path.join(indexeddb_dir, file_name)
+        # The stream may be resumed on another thread after each yield and a
+        # SQLite connection only works on the thread that opened it, so the
+        # scan cache is opened and closed within every step.
+        scan_cache = _open_regex_scan_cache(source_config["key"])
+        try:
+            file_records = _load_regex_scan_results(scan_cache, source_path, source_config)
+        finally:
+            if scan_cache is not None:
+                scan_cache.close()
+
+        file_start = len(records)
+        for record in file_records:
+            dedupe_key = record.filehash or record.url
+            if dedupe_key in dedupe_keys:
+                continue
+            dedupe_keys.add(dedupe_key)
+            records.append(record)
+
+        if len(records) > file_start:
+            yield records[file_start:]
+
+    scan_cache = _open_regex_scan_cache(source_config["key"])
+    if scan_cache is not None:
+        try:
+            _prune_regex_scan_cache(scan_cache, file_names)
+        finally:
+            scan_cache.close()
+
+    return records
+
+
+def _load_regex_scan_results(
+    scan_cache: sqlite3.Connection | None,
+    source_path: str,
+    source_config: dict,
+) -> list[StatusRecord]:
+    # .ldb tables never change once written, so their results are reused
+    # until the table disappears. The live .log is always rescanned.
+    file_name = os.path.basename(source_path)
+    if scan_cache is None or not file_name.endswith(".ldb"):
+        return _scan_regex_fallback_file(source_path, source_config)
+
+    try:
+        stat_result = os.stat(source_path)
+    except OSError:
+        return []
+    signature = (stat_result.st_size, stat_result.st_mtime_ns)
+
+    try:
+        cached_signature = scan_cache.execute(
+            "SELECT size, mtime_ns FROM files WHERE file_name = ?",
+            (file_name,),
+        ).fetchone()
+        if cached_signature is not None and tuple(cached_signature) == signature:
+            source = _source_info_for_config(source_config)
+            return [
+                _new_status_record(
+                    source=source,
+                    source_file=source_path,
+                    **dict(zip(INDEX_CACHE_RECORD_COLUMNS, row)),
+                )
+                for row in scan_cache.execute(
+                    f"SELECT {', '.join(INDEX_CACHE_RECORD_COLUMNS)} FROM records "
+                    "WHERE file_name = ? ORDER BY position",
+                    (file_name,),
+                )
+            ]
+    except (sqlite3.Error, TypeError, ValueError):
+        pass
+
+    file_records = _scan_regex_fallback_file(source_path, source_config)
+    try:
+        with scan_cache:
+            scan_cache.execute("DELETE FROM records WHERE file_name = ?", (file_name,))
+            scan_cache.execute(
+                "INSERT OR REPLACE INTO files (file_name, size, mtime_ns) VALUES (?, ?, ?)",
+                (file_name,) + signature,
+            )
+            scan_cache.executemany(
+                f"INSERT INTO records VALUES (?, ?, {', '.join('?' for _ in INDEX_CACHE_RECORD_COLUMNS)})",
+                [
+                    (file_name, position)
+                    + tuple(getattr(record, column) for column in INDEX_CACHE_RECORD_COLUMNS)
+                    for position, record in enumerate(file_records)
+                ],
+            )
+    except sqlite3.Error:
+        pass
+    return file_records
+
+
+def _open_regex_scan_cache(source_key: str) -> sqlite3.Connection | None:
+    scan_cache_file = _regex_scan_cache_file_for_source(source_key)
+    try:
+        os.makedirs(os.path.dirname(scan_cache_file), exist_ok=True)
+        connection = sqlite3.connect(scan_cache_file, timeout=1)
+    except (OSError, sqlite3.Error):
+        return None
+
+    try:
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)")
+            schema_version = connection.execute(
+                "SELECT value FROM meta WHERE name = 'schema_version'"
+            ).fetchone()
+            if schema_version is None or schema_version[0] != INDEX_CACHE_SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS files")
+                connection.execute("DROP TABLE IF EXISTS records")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('schema_version', ?)",
+                    (INDEX_CACHE_SCHEMA_VERSION,),
+                )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files "
+                "(file_name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS records (file_name TEXT, position INTEGER, "
+                f"{', '.join(INDEX_CACHE_RECORD_COLUMNS)}, PRIMARY KEY (file_name, position))"
+            )
+    except sqlite3.Error:
+        connection.close()
+        return None
+    return connection
+
+
+def _prune_regex_scan_cache(scan_cache: sqlite3.Connection, file_names: list[str]) -> None:
+    current_files = set(file_names)
+    try:
+        stale_files = [
+            (row[0],)
+            for row in scan_cache.execute("SELECT file_name FROM files")
+            if row[0] not in current_files
+        ]
+        if not stale_files:
+            return
+        with scan_cache:
+            scan_cache.executemany("DELETE FROM records WHERE file_name = ?", stale_files)
+            scan_cache.executemany("DELETE FROM files WHERE file_name = ?", stale_files)
+    except sqlite3.Error:
+        pass
+
+
+def _scan_regex_fallback_file(source_path: str, source_config: dict) -> list[StatusRecord]:
+    try:
+        with open(source_path, "rb") as file_handle:
+            if os.fstat(file_handle.fileno()).st_size == 0:
+                return []
+            try:
+                mapped = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return _scan_status_fields(file_handle.read(), source_path, source_config)
+            with mapped:
+                return _scan_status_fields(mapped, source_path, source_config)
+    except OSError:
+        return []
 
-    records: list[StatusRecord] = []
-    dedupe_keys: set[str] = set()
 
-    indexeddb_dir = source_config["indexeddb_dir"]
-    if not os.path.isdir(indexeddb_dir):
-        return records
+def _scan_status_fields(data, source_path: str, source_config: dict) -> list[StatusRecord]:
+    """Extract media statuses from a raw LevelDB file mapped into memory.
 
-    for file_name in sorted(os.listdir(indexeddb_dir), reverse=True):
-        if not file_name.endswith((".ldb", ".log")):
-            continue
+    Only the neighbourhoods of ``status@broadcast`` anchors are scanned, each
+    byte once per field key. Every URL keeps the original rules: its
+    surrounding window must contain an anchor, and every other field is the
+    first match inside that window.
+    """
+    anchors = _find_status_anchors(data)
+    if not anchors:
+        return []
 
-        source_path = os.path.join(indexeddb_dir, file_name)
-        try:
-            with open(source_path, "rb") as file_handle:
-                blob = file_handle.read()
-        except OSError:
-            continue
+    data_size = len(data)
+    reach = WINDOW_BYTES_BEFORE + WINDOW_BYTES_AFTER + REGEX_FIELD_SLACK_BYTES
+    regions: list[list[int]] = []
+    for anchor in anchors:
+        region_start = max(0, anchor - reach)
+        region_end = min(data_size, anchor + len(STATUS_MARKER) + reach)
+        if regions and region_start <= regions[-1][1]:
+            regions[-1][1] = region_end
+        else:
+            regions.append([region_start, region_end])
 
-        matches = list(status_url_pattern.finditer(blob))
-        for match in reversed(matches):
-            start = max(0, match.start() - WINDOW_BYTES_BEFORE)
-            end = min(len(blob), match.end() + WINDOW_BYTES_AFTER)
-            window = blob[start:end]
-            if STATUS_MARKER not in window:
+    records: list[StatusRecord] = []
+    released_from = data_size
+    # Walked back to front so records keep the newest-bytes-first order.
+    for region_start, region_end in reversed(regions):
+        field_starts: dict[str, list[int]] = {}
+        field_matches: dict[str, list[tuple[int, bytes]]] = {}
+        url_matches = []
+        for field_name, field_key, field_pattern in REGEX_FALLBACK_FIELDS:
+            starts = field_starts[field_name] = []
+            matches = field_matches[field_name] = []
+            position = data.find(field_key, region_start, region_end)
+            while position != -1:
+                match = field_pattern.match(data, position)
+                if match:
+                    starts.append(position)
+                    matches.append((match.end(), match.group(1)))
+                    if field_name == "url":
+                        url_matches.append(match)
+                position = data.find(field_key, position + 1, region_end)
+
+        for match in reversed(url_matches):
+            window_start = max(0, match.start() - WINDOW_BYTES_BEFORE)
+            window_end = min(data_size, match.end() + WINDOW_BYTES_AFTER)
+            anchor_index = bisect.bisect_left(anchors, window_start)
+            if (
+                anchor_index >= len(anchors)
+                or anchors[anchor_index] + len(STATUS_MARKER) > window_end
+            ):
                 continue
 
-            mimetype = _extract_group(mime_pattern, window)
-            filehash = _extract_group(filehash_pattern, window)
+            window = (field_starts, field_matches, window_start, window_end)
+            mimetype = _first_field_in_window("mimetype", *window)
+            filehash = _first_field_in_window("filehash", *window)
             if not mimetype or not filehash:
                 continue
 
@@ -1062,96 +2800,196 @@ def _load_records_from_regex_fallback(source_config: dict) -> list[StatusRecord]
             if kind not in {"photos", "videos"}:
                 continue
 
-            direct_path = _extract_group(direct_path_pattern, window)
+            direct_path = _first_field_in_window("direct_path", *window)
             url = _normalize_extracted_url(match.group(1).decode("utf-8", "ignore"))
             if not url and direct_path:
                 url = f"https://mmg.whatsapp.net{_normalize_direct_path(direct_path)}"
             if not url:
                 continue
 
-            dedupe_key = filehash or url
-            if dedupe_key in dedupe_keys:
-                continue
-            dedupe_keys.add(dedupe_key)
-
             records.append(
-                StatusRecord(
+                _new_status_record(
                     status_id=filehash,
                     kind=kind,
                     mimetype=mimetype,
                     url=url,
                     direct_path=direct_path,
                     filehash=filehash,
-                    enc_filehash=_extract_group(enc_filehash_pattern, window),
-                    media_key=_extract_group(media_key_pattern, window),
+                    enc_filehash=_first_field_in_window("enc_filehash", *window),
+                    media_key=_first_field_in_window("media_key", *window),
                     source_file=source_path,
                     source_offset=match.start(),
                     timestamp=0.0,
                     author_jid=None,
-                    source_key=source_config["key"],
-                    source_label=source_config["label"],
-                    source_indexeddb_dir=source_config["indexeddb_dir"],
-                    source_blob_dir=source_config.get("blob_dir"),
+                    source=_source_info_for_config(source_config),
                 )
             )
 
+        if released_from - region_start >= REGEX_SCAN_CHUNK_BYTES:
+            _release_mapped_pages(data, region_start, released_from)
+            released_from = region_start
+
     return records
 
 
-def _extract_firefox_message_type(message_blob: bytes) -> str | None:
-    match = FIREFOX_TYPE_PATTERN.search(message_blob)
-    if not match:
+def _first_field_in_window(
+    field_name: str,
+    field_starts: dict[str, list[int]],
+    field_matches: dict[str, list[tuple[int, bytes]]],
+    window_start: int,
+    window_end: int,
+) -> str | None:
+    starts = field_starts.get(field_name)
+    if not starts:
         return None
-    return match.group(1).decode("utf-8", "ignore")
-
-
-def _extract_firefox_status_id(message_blob: bytes) -> str | None:
-    match = FIREFOX_STATUS_ID_PATTERN.search(message_blob)
-    if not match:
+    field_index = bisect.bisect_left(starts, window_start)
+    if field_index >= len(starts):
         return None
-    return match.group(1).decode("utf-8", "ignore")
+    field_end, value = field_matches[field_name][field_index]
+    if field_end > window_end:
+        return None
+    return value.decode("utf-8", "ignore")
+
+
+def _find_status_anchors(data) -> list[int]:
+    anchors: list[int] = []
+    data_size = len(data)
+    chunk_start = 0
+    while chunk_start < data_size:
+        chunk_end = min(data_size, chunk_start + REGEX_SCAN_CHUNK_BYTES)
+        # Chunks overlap by one marker length, so an anchor straddling the
+        # boundary is found exactly once.
+        search_end = min(data_size, chunk_end + len(STATUS_MARKER) - 1)
+        position = data.find(STATUS_MARKER, chunk_start, search_end)
+        while position != -1:
+            anchors.append(position)
+            position = data.find(STATUS_MARKER, position + 1, search_end)
+        _release_mapped_pages(data, chunk_start, chunk_end)
+        chunk_start = chunk_end
+    return anchors
+
+
+def _release_mapped_pages(data, start: int, end: int) -> None:
+    # Scanned pages are dropped from the working set so resident memory stays
+    # around one chunk however large the file is. The file itself is untouched.
+    if not isinstance(data, mmap.mmap) or not hasattr(mmap, "MADV_DONTNEED"):
+        return
+    page_start = start - start % mmap.PAGESIZE
+    if end <= page_start:
+        return
+    try:
+        data.madvise(mmap.MADV_DONTNEED, page_start, end - page_start)
+    except (OSError, ValueError):
+        pass
 
 
-def _extract_firefox_direct_path(message_blob: bytes) -> str | None:
-    marker_index = message_blob.find(b"directPath")
-    if marker_index < 0:
-        return None
+def _extract_firefox_fields(message_blob: bytes) -> dict[str, str | int | float | None]:
+    """Pull the remaining known fields out of a raw Firefox message blob.
 
-    path_index = message_blob.find(b"/", marker_index)
-    if path_index < 0 or path_index - marker_index > 48:
-        return None
+    The caller has already checked type, direct path and filehash. Each marker
+    is located once and its value is read in place with a bounded match; no
+    slices of the blob are copied.
+    """
+    offsets = {marker: message_blob.find(marker) for marker in FIREFOX_BLOB_MARKERS}
 
-    extracted = _extract_ascii_run(message_blob, path_index, URL_SAFE_BYTES)
-    return extracted if extracted and extracted.startswith("/") else None
+    status_id_match = FIREFOX_STATUS_ID_PATTERN.search(message_blob)
+
+    media_key = _base64_after_offset(message_blob, offsets[b"mediaKey"], len(b"mediaKey"))
+    if not media_key:
+        filehash_match = FIREFOX_FILEHASH_PATTERN.search(message_blob)
+        if filehash_match:
+            search_start = filehash_match.start()
+            search_end = min(len(message_blob), search_start + 900)
+            media_key = _base64_after_offset(
+                message_blob,
+                message_blob.find(b"Key", search_start, search_end),
+                len(b"Key"),
+            )
 
+    return {
+        "status_id": status_id_match.group(1).decode("utf-8", "ignore") if status_id_match else None,
+        "enc_filehash": _base64_after_offset(message_blob, offsets[b"encF"], len(b"encF")),
+        "media_key": media_key,
+        "timestamp": _timestamp_before_offset(message_blob, offsets[FIREFOX_TIMESTAMP_MARKER]),
+        "subtype": _ascii_after_offset(message_blob, offsets[b"subtype"], b"subtype"),
+        "background_color": _int_after_offset(message_blob, offsets[b"backgroundColor"], len(b"backgroundColor")),
+        "text_color": _int_after_offset(message_blob, offsets[b"textColor"], len(b"textColor")),
+        "font_id": _int_after_offset(message_blob, offsets[b"font"], len(b"font")),
+        "music_title": _ascii_after_offset(message_blob, offsets[b"title"], b"title"),
+        "music_artist": _ascii_after_offset(message_blob, offsets[b"author"], b"author"),
+        "music_artwork_direct_path": _path_after_offset(message_blob, offsets[b"artworkDirectPath"]),
+        "music_artwork_filehash": _base64_after_offset(
+            message_blob, offsets[b"artworkSha256"], len(b"artworkSha256")
+        ),
+        "music_artwork_enc_filehash": _base64_after_offset(
+            message_blob, offsets[b"artworkEncSha256"], len(b"artworkEncSha256")
+        ),
+        "music_artwork_media_key": _base64_after_offset(
+            message_blob, offsets[b"artworkMediaKey"], len(b"artworkMediaKey")
+        ),
+        "music_track_duration_ms": _int_after_offset(
+            message_blob, offsets[b"overlapDurationInMs"], len(b"overlapDurationInMs")
+        ),
+    }
 
-def _extract_firefox_filehash(message_blob: bytes) -> str | None:
-    return _extract_base64_after_marker(message_blob, b"filehash")
 
+def _base64_after_offset(
+    message_blob: bytes,
+    marker_index: int,
+    marker_length: int,
+    lookahead: int = 160,
+) -> str | None:
+    if marker_index < 0:
+        return None
+    start = marker_index + marker_length
+    match = BASE64_TOKEN_PATTERN.search(message_blob, start, start + lookahead)
+    if not match:
+        return None
+    return match.group(0).decode("utf-8", "ignore")
 
-def _extract_firefox_media_key(message_blob: bytes) -> str | None:
-    media_key = _extract_base64_after_marker(message_blob, b"mediaKey")
-    if media_key:
-        return media_key
 
-    filehash_match = FIREFOX_FILEHASH_PATTERN.search(message_blob)
-    if not filehash_match:
+def _ascii_after_offset(
+    message_blob: bytes,
+    marker_index: int,
+    marker: bytes,
+    lookahead: int = 160,
+) -> str | None:
+    if marker_index < 0:
         return None
+    start = marker_index + len(marker)
+    marker_text = marker.decode("utf-8", "ignore").lower()
+    for match in FIREFOX_ASCII_RUN_PATTERN.finditer(message_blob, start, start + lookahead):
+        decoded = match.group(0).decode("utf-8", "ignore").strip()
+        if decoded and decoded.lower() != marker_text:
+            return decoded
+    return None
 
-    search_start = filehash_match.start()
-    search_end = min(len(message_blob), search_start + 900)
-    key_index = message_blob.find(b"Key", search_start, search_end)
-    if key_index < 0:
+
+def _int_after_offset(message_blob: bytes, marker_index: int, marker_length: int) -> int | None:
+    if marker_index < 0:
+        return None
+    start = marker_index + marker_length
+    match = FIREFOX_INT_PATTERN.search(message_blob, start, start + 24)
+    if not match:
+        return None
+    try:
+        return int(match.group(1))
+    except ValueError:
         return None
-    return _extract_base64_after_marker(message_blob[key_index:], b"Key")
 
 
-def _extract_firefox_enc_filehash(message_blob: bytes) -> str | None:
-    return _extract_base64_after_marker(message_blob, b"encF")
+def _path_after_offset(message_blob: bytes, marker_index: int, max_gap: int | None = None) -> str | None:
+    if marker_index < 0:
+        return None
+    path_index = message_blob.find(b"/", marker_index)
+    if path_index < 0 or (max_gap is not None and path_index - marker_index > max_gap):
+        return None
+    match = URL_SAFE_RUN_PATTERN.match(message_blob, path_index)
+    extracted = match.group(0).decode("utf-8", "ignore")
+    return extracted if extracted.startswith("/") else None
 
 
-def _extract_firefox_timestamp(message_blob: bytes) -> float:
-    marker_index = message_blob.find(b".8\x00\x08fro")
+def _timestamp_before_offset(message_blob: bytes, marker_index: int) -> float:
     if marker_index < 4:
         return 0.0
 
@@ -1165,29 +3003,6 @@ def _extract_firefox_timestamp(message_blob: bytes) -> float:
     return 0.0
 
 
-def _extract_base64_after_marker(
-    message_blob: bytes,
-    marker: bytes,
-    lookahead: int = 160,
-) -> str | None:
-    marker_index = message_blob.find(marker)
-    if marker_index < 0:
-        return None
-
-    region = message_blob[marker_index + len(marker): marker_index + len(marker) + lookahead]
-    match = BASE64_TOKEN_PATTERN.search(region)
-    if not match:
-        return None
-    return match.group(0).decode("utf-8", "ignore")
-
-
-def _extract_ascii_run(message_blob: bytes, start_index: int, allowed_bytes: bytes) -> str:
-    end_index = start_index
-    while end_index < len(message_blob) and message_blob[end_index] in allowed_bytes:
-        end_index += 1
-    return message_blob[start_index:end_index].decode("utf-8", "ignore")
-
-
 def _fallback_text_filehash(
     status_id: str | None,
     source_key: str,
@@ -1267,163 +3082,582 @@ def _extract_embedded_music(message: dict) -> dict[str, str | int | None]:
     return result
 
 
-def _extract_embedded_music_from_blob(message_blob: bytes) -> dict[str, str | int | None]:
-    return {
-        "title": _extract_ascii_after_marker(message_blob, b"title"),
-        "artist": _extract_ascii_after_marker(message_blob, b"author"),
-        "artwork_direct_path": _extract_path_after_marker(message_blob, b"artworkDirectPath"),
-        "artwork_filehash": _extract_base64_after_marker(message_blob, b"artworkSha256"),
-        "artwork_enc_filehash": _extract_base64_after_marker(message_blob, b"artworkEncSha256"),
-        "artwork_media_key": _extract_base64_after_marker(message_blob, b"artworkMediaKey"),
-        "duration_ms": _extract_int_after_marker(message_blob, b"overlapDurationInMs"),
-    }
-
+def _fetch_record_to_cache(record: StatusRecord, cache_path: str) -> str | None:
+    partial_path = f"{cache_path}{MEDIA_PARTIAL_SUFFIX}"
+    urls = _candidate_urls(record)
+    gone = bool(urls)
+    for url in urls:
+        try:
+            if _download_media_to_cache(record, url, cache_path, partial_path):
+                _forget_media_failure(record.filehash)
+                return cache_path
+        except HTTPError as error:
+            gone = gone and error.code in MEDIA_GONE_STATUSES
+            continue
+        except (
+            URLError,
+            TimeoutError,
+            ValueError,
+            OSError,
+            http.client.HTTPException,
+        ):
+            pass
+        gone = False
 
-def _extract_ascii_after_marker(message_blob: bytes, marker: bytes, lookahead: int = 160) -> str | None:
-    marker_index = message_blob.find(marker)
-    if marker_index < 0:
-        return None
-    region = message_blob[marker_index + len(marker): marker_index + len(marker) + lookahead]
-    matches = re.findall(rb"[A-Za-z0-9 _.,'()!?:;&/-]{3,120}", region)
-    for match in matches:
-        decoded = match.decode("utf-8", "ignore").strip()
-        if decoded and decoded.lower() != marker.decode("utf-8", "ignore").lower():
-            return decoded
+    _remember_media_failure(record.filehash, gone)
     return None
 
 
-def _extract_path_after_marker(message_blob: bytes, marker: bytes) -> str | None:
-    marker_index = message_blob.find(marker)
-    if marker_index < 0:
-        return None
-    path_index = message_blob.find(b"/", marker_index)
-    if path_index < 0:
-        return None
-    extracted = _extract_ascii_run(message_blob, path_index, URL_SAFE_BYTES)
-    return extracted if extracted.startswith("/") else None
+def _copy_from_blob_store(record: StatusRecord, cache_path: str) -> bool:
+    """Fill ``cache_path`` from the source's local blob directory if it holds the media.
 
+    Both the plaintext (``filehash``) and the encrypted file
+    (``enc_filehash``) are looked up; either is verified again while it is
+    copied or decrypted into the cache.
+    """
+    blob_dir = record.source_blob_dir
+    if not blob_dir or not os.path.isdir(blob_dir):
+        return False
 
-def _extract_int_after_marker(message_blob: bytes, marker: bytes) -> int | None:
-    marker_index = message_blob.find(marker)
-    if marker_index < 0:
-        return None
-    region = message_blob[marker_index + len(marker): marker_index + len(marker) + 24]
-    match = re.search(rb"(\d{1,8})", region)
-    if not match:
+    blob_index = _get_blob_store_index(record.source_key, blob_dir)
+    if blob_index is None:
+        # Still being built; this record goes to the network instead of
+        # waiting for the whole store to be hashed.
+        return False
+
+    for expected_hash, encrypted in ((record.filehash, False), (record.enc_filehash, True)):
+        if not expected_hash or (encrypted and not record.media_key):
+            continue
+        blob_path = blob_index.paths_by_digest.get(expected_hash.rstrip("="))
+        if not blob_path:
+            continue
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            chunks = _iter_file_chunks(blob_path, os.path.getsize(blob_path))
+            if _write_verified_media(record, chunks, cache_path, encrypted):
+                return True
+        except (OSError, ValueError):
+            continue
+    return False
+
+
+def _get_blob_store_index(source_key: str, blob_dir: str) -> _BlobStoreIndex | None:
+    """Return the current index of ``blob_dir``, or None until the first one is built.
+
+    Building and refreshing walk and hash the store on a background thread,
+    so download workers never wait for it; a stale index only costs a
+    failed verification and a network download.
+    """
+    with _BLOB_STORE_INDEX_LOCK:
+        blob_index = _BLOB_STORE_INDEXES.get(blob_dir)
+        is_stale = (
+            blob_index is None
+            or time.monotonic() - blob_index.refreshed_at >= BLOB_STORE_REFRESH_SECONDS
+        )
+        if is_stale and blob_dir not in _BLOB_STORE_REFRESHES:
+            _BLOB_STORE_REFRESHES.add(blob_dir)
+            threading.Thread(
+                target=_refresh_blob_store_index,
+                args=(source_key, blob_dir),
+                name="blob-store-index",
+                daemon=True,
+            ).start()
+        return blob_index
+
+
+def _refresh_blob_store_index(source_key: str, blob_dir: str) -> None:
+    try:
+        paths_by_digest = _hash_blob_store_files(source_key, blob_dir)
+    except Exception as error:
+        # Keep what was indexed before and retry after the usual interval.
+        print(f"Error indexing blob store {blob_dir}: {error}")
+        paths_by_digest = None
+
+    with _BLOB_STORE_INDEX_LOCK:
+        _BLOB_STORE_REFRESHES.discard(blob_dir)
+        if paths_by_digest is None:
+            previous_index = _BLOB_STORE_INDEXES.get(blob_dir)
+            paths_by_digest = previous_index.paths_by_digest if previous_index else {}
+        _BLOB_STORE_INDEXES[blob_dir] = _BlobStoreIndex(
+            refreshed_at=time.monotonic(),
+            paths_by_digest=paths_by_digest,
+        )
+
+
+def _hash_blob_store_files(source_key: str, blob_dir: str) -> dict[str, str]:
+    hash_cache = _open_blob_hash_cache(source_key)
+    known_files: dict[str, tuple[int, int, str]] = {}
+    if hash_cache is not None:
+        try:
+            known_files = {
+                row[0]: (row[1], row[2], row[3])
+                for row in hash_cache.execute("SELECT path, size, mtime_ns, sha256 FROM blobs")
+            }
+        except sqlite3.Error:
+            known_files = {}
+
+    paths_by_digest: dict[str, str] = {}
+    hashed_files: list[tuple[str, int, int, str]] = []
+    seen_paths: set[str] = set()
+    for root, _, file_names in os.walk(blob_dir):
+        for file_name in file_names:
+            blob_path = os.path.join(root, file_name)
+            try:
+                stat_result = os.stat(blob_path)
+            except OSError:
+                continue
+            if not stat_result.st_size:
+                continue
+
+            seen_paths.add(blob_path)
+            known_file = known_files.get(blob_path)
+            if known_file is not None and known_file[:2] == (stat_result.st_size, stat_result.st_mtime_ns):
+                digest = known_file[2]
+            else:
+                try:
+                    digest = _sha256_file_base64(blob_path)
+                except OSError:
+                    continue
+                hashed_files.append((blob_path, stat_result.st_size, stat_result.st_mtime_ns, digest))
+            paths_by_digest[digest] = blob_path
+
+    if hash_cache is not None:
+        try:
+            with hash_cache:
+                hash_cache.executemany(
+                    "INSERT OR REPLACE INTO blobs (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                    hashed_files,
+                )
+                hash_cache.executemany(
+                    "DELETE FROM blobs WHERE path = ?",
+                    [(blob_path,) for blob_path in known_files if blob_path not in seen_paths],
+                )
+        except sqlite3.Error:
+            pass
+        finally:
+            hash_cache.close()
+    return paths_by_digest
+
+
+def _sha256_file_base64(path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(MEDIA_STREAM_CHUNK_BYTES), b""):
+            file_hash.update(chunk)
+    return base64.b64encode(file_hash.digest()).decode("ascii").rstrip("=")
+
+
+def _open_blob_hash_cache(source_key: str) -> sqlite3.Connection | None:
+    hash_cache_file = _blob_hash_cache_file_for_source(source_key)
+    try:
+        os.makedirs(os.path.dirname(hash_cache_file), exist_ok=True)
+        connection = sqlite3.connect(hash_cache_file, timeout=1)
+    except (OSError, sqlite3.Error):
         return None
+
     try:
-        return int(match.group(1))
-    except ValueError:
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)")
+            schema_version = connection.execute(
+                "SELECT value FROM meta WHERE name = 'schema_version'"
+            ).fetchone()
+            if schema_version is None or schema_version[0] != BLOB_HASH_CACHE_SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS blobs")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('schema_version', ?)",
+                    (BLOB_HASH_CACHE_SCHEMA_VERSION,),
+                )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS blobs "
+                "(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT)"
+            )
+    except sqlite3.Error:
+        connection.close()
         return None
+    return connection
 
 
-def _extract_firefox_subtype(message_blob: bytes) -> str | None:
-    return _extract_ascii_after_marker(message_blob, b"subtype")
+def _media_fetch_is_suppressed(filehash: str | None, ignore_backoff: bool = False) -> bool:
+    """Whether ``filehash`` recently failed and should not be fetched yet.
 
+    Media the server reported as gone is skipped until its entry expires;
+    other failures back off exponentially, which an explicit user request
+    (``ignore_backoff``) skips.
+    """
+    if not filehash:
+        return False
 
-def _extract_firefox_background_color(message_blob: bytes) -> int | None:
-    return _extract_int_after_marker(message_blob, b"backgroundColor")
+    with _MEDIA_NEGATIVE_CACHE_LOCK:
+        entry = _load_media_negative_cache().get(filehash)
+    now = time.time()
+    if entry is None or float(entry.get("failed_at") or 0) < now - MEDIA_NEGATIVE_CACHE_TTL_SECONDS:
+        return False
+    if entry.get("gone"):
+        return True
+    return not ignore_backoff and now < float(entry.get("retry_at") or 0)
 
 
-def _extract_firefox_text_color(message_blob: bytes) -> int | None:
-    return _extract_int_after_marker(message_blob, b"textColor")
+def _remember_media_failure(filehash: str | None, gone: bool) -> None:
+    if not filehash:
+        return
 
+    now = time.time()
+    with _MEDIA_NEGATIVE_CACHE_LOCK:
+        negative_cache = _load_media_negative_cache()
+        failures = int(negative_cache.get(filehash, {}).get("failures") or 0) + 1
+        backoff = min(
+            MEDIA_RETRY_BACKOFF_SECONDS * 2 ** (failures - 1),
+            MEDIA_RETRY_BACKOFF_MAX_SECONDS,
+        )
+        negative_cache[filehash] = {
+            "gone": gone,
+            "failures": failures,
+            "failed_at": now,
+            "retry_at": now + backoff,
+        }
+        _write_media_negative_cache(negative_cache, now)
 
-def _extract_firefox_font_id(message_blob: bytes) -> int | None:
-    return _extract_int_after_marker(message_blob, b"font")
 
+def _forget_media_failure(filehash: str | None) -> None:
+    with _MEDIA_NEGATIVE_CACHE_LOCK:
+        negative_cache = _load_media_negative_cache()
+        if filehash in negative_cache:
+            del negative_cache[filehash]
+            _write_media_negative_cache(negative_cache, time.time())
 
-def _download_plaintext_payload(record: StatusRecord) -> bytes | None:
-    if record.kind == "texts":
-        thumbnail_payload = _download_text_thumbnail_payload(record)
-        if thumbnail_payload:
-            return thumbnail_payload
-        return None
 
-    for url in _candidate_urls(record):
-        try:
-            encrypted_or_plain = _download_url(url)
-        except (
-            HTTPError,
-            URLError,
-            TimeoutError,
-            ValueError,
-            OSError,
-            http.client.InvalidURL,
-        ):
-            continue
+def _load_media_negative_cache() -> dict[str, dict]:
+    global _MEDIA_NEGATIVE_CACHE
 
-        if _matches_sha256(encrypted_or_plain, record.filehash):
-            return encrypted_or_plain
+    if _MEDIA_NEGATIVE_CACHE is not None:
+        return _MEDIA_NEGATIVE_CACHE
 
-        if record.media_key:
-            decrypted = _decrypt_media(record, encrypted_or_plain)
-            if decrypted and _matches_sha256(decrypted, record.filehash):
-                return decrypted
+    _MEDIA_NEGATIVE_CACHE = {}
+    try:
+        with open(MEDIA_NEGATIVE_CACHE_FILE, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError, TypeError):
+        return _MEDIA_NEGATIVE_CACHE
+
+    if payload.get("schema_version") == MEDIA_NEGATIVE_CACHE_SCHEMA_VERSION:
+        oldest_failure = time.time() - MEDIA_NEGATIVE_CACHE_TTL_SECONDS
+        _MEDIA_NEGATIVE_CACHE.update(
+            (filehash, entry)
+            for filehash, entry in (payload.get("entries") or {}).items()
+            if isinstance(entry, dict) and float(entry.get("failed_at") or 0) >= oldest_failure
+        )
+    return _MEDIA_NEGATIVE_CACHE
 
-    return None
+
+def _write_media_negative_cache(negative_cache: dict[str, dict], now: float) -> None:
+    oldest_failure = now - MEDIA_NEGATIVE_CACHE_TTL_SECONDS
+    for filehash in [
+        filehash
+        for filehash, entry in negative_cache.items()
+        if float(entry.get("failed_at") or 0) < oldest_failure
+    ]:
+        del negative_cache[filehash]
+
+    temp_file = f"{MEDIA_NEGATIVE_CACHE_FILE}.tmp"
+    try:
+        os.makedirs(os.path.dirname(MEDIA_NEGATIVE_CACHE_FILE), exist_ok=True)
+        with open(temp_file, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "schema_version": MEDIA_NEGATIVE_CACHE_SCHEMA_VERSION,
+                    "entries": negative_cache,
+                },
+                handle,
+            )
+        os.replace(temp_file, MEDIA_NEGATIVE_CACHE_FILE)
+    except OSError as e:
+        print(f"Error saving media negative cache: {str(e)}")
+
+
+def _download_media_to_cache(
+    record: StatusRecord,
+    url: str,
+    cache_path: str,
+    partial_path: str,
+) -> bool:
+    """Download ``url`` into ``cache_path``, resuming from an earlier partial file.
+
+    Every byte received is also appended to ``partial_path``. If the transfer
+    breaks off, the next attempt replays that file and asks the server only
+    for the rest with a ``Range`` request. The partial file is removed once
+    the download has been verified or found to be bad.
+    """
+    try:
+        resume_from = os.path.getsize(partial_path)
+    except OSError:
+        resume_from = 0
+
+    try:
+        response = _open_media_url(
+            url,
+            {"Range": f"bytes={resume_from}-"} if resume_from else None,
+        )
+    except HTTPError as error:
+        # 416: the partial file already holds the whole payload.
+        if error.code != 416 or not resume_from:
+            raise
+        response = None
+
+    try:
+        if response is not None and resume_from and not _response_resumes_at(response, resume_from):
+            resume_from = 0
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(partial_path, "ab" if resume_from else "wb") as partial_handle:
+            chunks = _iter_response_chunks(response, partial_handle) if response is not None else iter(())
+            if resume_from:
+                chunks = itertools.chain(_iter_file_chunks(partial_path, resume_from), chunks)
+            verified = _write_verified_media(record, chunks, cache_path)
+    finally:
+        if response is not None:
+            response.close()
+
+    os.unlink(partial_path)
+    return verified
+
+
+def _response_resumes_at(response, offset: int) -> bool:
+    content_range = response.getheader("Content-Range") or ""
+    return response.status == 206 and content_range.startswith(f"bytes {offset}-")
+
+
+def _write_verified_media(
+    record: StatusRecord,
+    chunks: Iterator[bytes],
+    cache_path: str,
+    encrypted: bool | None = None,
+) -> bool:
+    """Decrypt a media stream chunk by chunk into ``cache_path``.
+
+    Encrypted streams are spooled while their MAC and ciphertext hash are
+    checked, and only decrypted once both match. Unless
+    ``encrypted`` says otherwise, streams that already start like a media
+    file are hashed and written unchanged. The cache file only appears once
+    every check has passed.
+    """
+    first_chunk = next(chunks, b"")
+    if not first_chunk:
+        return False
+
+    temp_file = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            delete=False,
+            dir=os.path.dirname(cache_path),
+            suffix=".tmp",
+        ) as temp_handle:
+            temp_file = temp_handle.name
+            all_chunks = itertools.chain((first_chunk,), chunks)
+            if encrypted is None:
+                encrypted = bool(record.media_key) and not _looks_like_plaintext_media(first_chunk)
+            if not encrypted:
+                verified = _copy_plaintext_stream(record, all_chunks, temp_handle.write)
+            else:
+                verified = _decrypt_media_stream(record, all_chunks, temp_handle.write)
+        if not verified:
+            return False
+        os.replace(temp_file, cache_path)
+        return True
+    finally:
+        if temp_file and os.path.exists(temp_file):
+            os.unlink(temp_file)
+
+
+def _iter_response_chunks(response, partial_handle) -> Iterator[bytes]:
+    while True:
+        chunk = response.read(MEDIA_STREAM_CHUNK_BYTES)
+        if not chunk:
+            return
+        _record_media_transfer(len(chunk))
+        partial_handle.write(chunk)
+        yield chunk
+
+
+def _iter_file_chunks(path: str, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        while length > 0:
+            chunk = handle.read(min(MEDIA_STREAM_CHUNK_BYTES, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _looks_like_plaintext_media(head: bytes) -> bool:
+    # MP4/MOV files carry their ``ftyp`` box at offset 4.
+    return head.startswith(PLAINTEXT_MEDIA_SIGNATURES) or head[4:8] == b"ftyp"
+
+
+def _copy_plaintext_stream(record: StatusRecord, chunks: Iterable[bytes], write) -> bool:
+    plaintext_hash = hashlib.sha256()
+    for chunk in chunks:
+        plaintext_hash.update(chunk)
+        write(chunk)
+    return _matches_sha256_digest(plaintext_hash.digest(), record.filehash)
+
+
+def _decrypt_media_stream(record: StatusRecord, chunks: Iterable[bytes], write) -> bool:
+    """Verify an encrypted media stream, then decrypt it through ``write``.
+
+    The MAC and the ciphertext hash are checked over the whole stream before
+    any AES work, like ``_decrypt_media``, so a wrong payload costs one hash
+    pass. The ciphertext is spooled meanwhile so the stream is read once.
+    """
+    if record.kind not in MEDIA_INFO_BY_KIND:
+        return False
+
+    expanded_key = _expand_media_key(record.media_key, record.kind)
+    iv = expanded_key[:16]
+    mac = hmac.new(expanded_key[48:80], iv, hashlib.sha256)
+    encrypted_hash = hashlib.sha256()
+
+    with tempfile.SpooledTemporaryFile(max_size=MEDIA_SPOOL_MEMORY_BYTES) as spool:
+        # The last MEDIA_MAC_BYTES of the stream are the MAC, not ciphertext,
+        # so they are held back until the next chunk (or the end) proves
+        # otherwise.
+        held_back = b""
+        for chunk in chunks:
+            encrypted_hash.update(chunk)
+            data = held_back + chunk
+            ciphertext = data[:-MEDIA_MAC_BYTES]
+            held_back = data[-MEDIA_MAC_BYTES:]
+            if ciphertext:
+                mac.update(ciphertext)
+                spool.write(ciphertext)
+
+        if (
+            len(held_back) < MEDIA_MAC_BYTES
+            or not hmac.compare_digest(mac.digest()[:MEDIA_MAC_BYTES], held_back)
+            or (record.enc_filehash and not _matches_sha256_digest(encrypted_hash.digest(), record.enc_filehash))
+        ):
+            _count_rejected_payload()
+            return False
+
+        spool.seek(0)
+        decryptor = Cipher(algorithms.AES(expanded_key[16:48]), modes.CBC(iv)).decryptor()
+        unpadder = padding.PKCS7(128).unpadder()
+        plaintext_hash = hashlib.sha256()
+        while ciphertext := spool.read(MEDIA_STREAM_CHUNK_BYTES):
+            plaintext = unpadder.update(decryptor.update(ciphertext))
+            plaintext_hash.update(plaintext)
+            write(plaintext)
+
+    try:
+        plaintext = unpadder.update(decryptor.finalize()) + unpadder.finalize()
+    except ValueError:
+        return False
+    plaintext_hash.update(plaintext)
+    write(plaintext)
+    return _matches_sha256_digest(plaintext_hash.digest(), record.filehash)
 
 
 def _download_text_thumbnail_payload(record: StatusRecord) -> bytes | None:
     if not record.thumbnail_direct_path or not record.thumbnail_filehash:
         return None
 
-    thumbnail_record = StatusRecord(
-        status_id=f"{record.status_id}:thumbnail",
-        kind="photos",
-        mimetype="image/jpeg",
-        url=f"https://mmg.whatsapp.net{_normalize_direct_path(record.thumbnail_direct_path)}",
-        direct_path=record.thumbnail_direct_path,
-        filehash=record.thumbnail_filehash,
-        enc_filehash=record.thumbnail_enc_filehash,
-        media_key=record.media_key,
-        source_file=record.source_file,
-        source_offset=record.source_offset,
-        timestamp=record.timestamp,
-        author_jid=record.author_jid,
-        source_key=record.source_key,
-        source_label=record.source_label,
-        source_indexeddb_dir=record.source_indexeddb_dir,
-        source_blob_dir=record.source_blob_dir,
-    )
-    return _download_plaintext_payload(thumbnail_record)
+    url = f"https://mmg.whatsapp.net{_normalize_direct_path(record.thumbnail_direct_path)}"
+    try:
+        payload = _download_url(url)
+    except (
+        HTTPError,
+        URLError,
+        TimeoutError,
+        ValueError,
+        OSError,
+        http.client.HTTPException,
+    ):
+        return None
+
+    if _matches_sha256(payload, record.thumbnail_filehash):
+        return payload
+    if not record.media_key:
+        return None
+
+    # Thumbnails are encrypted with the status media key and image key info.
+    decrypted = _decrypt_media(payload, record.media_key, "photos")
+    if decrypted and _matches_sha256(decrypted, record.thumbnail_filehash):
+        return decrypted
+    return None
 
 
 def _download_url(url: str) -> bytes:
-    parsed = urlparse(url)
-    if parsed.scheme != "https" or parsed.netloc != "mmg.whatsapp.net":
-        raise ValueError(f"Refusing to download from unexpected host: {url}")
+    with _open_media_url(url) as response:
+        payload = response.read()
+    _record_media_transfer(len(payload))
+    return payload
+
+
+def _open_media_url(url: str, headers: dict[str, str] | None = None):
+    """Request ``url`` on a pooled keep-alive connection, following redirects on the media host."""
+    for _ in range(MEDIA_MAX_REDIRECTS + 1):
+        parsed = urlparse(url)
+        if parsed.scheme != "https" or parsed.netloc != "mmg.whatsapp.net":
+            raise ValueError(f"Refusing to download from unexpected host: {url}")
+
+        response = _MEDIA_HTTP_POOL.request(url, {**HTTP_HEADERS, **(headers or {})})
+        if 200 <= response.status < 300:
+            return response
+
+        # Error and redirect bodies are short; reading them to the end lets
+        # the connection go back to the pool.
+        with response:
+            response.read()
+        location = response.getheader("Location")
+        if response.status in MEDIA_REDIRECT_STATUSES and location:
+            url = urljoin(url, location)
+            continue
+        raise HTTPError(url, response.status, response.reason, response.headers, None)
 
-    request = Request(url, headers=HTTP_HEADERS)
-    with urlopen(request, timeout=30) as response:
-        return response.read()
+    raise URLError(f"Too many redirects for {url}")
 
 
-def _decrypt_media(record: StatusRecord, payload: bytes) -> bytes | None:
-    if not record.media_key or record.kind not in MEDIA_INFO_BY_KIND or len(payload) <= 10:
+def _decrypt_media(payload: bytes, media_key: str, kind: str) -> bytes | None:
+    """Decrypt a whole media payload, checking its trailing MAC before any AES work."""
+    if kind not in MEDIA_INFO_BY_KIND or len(payload) <= MEDIA_MAC_BYTES:
         return None
 
-    media_key = _decode_base64_value(record.media_key)
-    expanded_key = HKDF(
-        algorithm=hashes.SHA256(),
-        length=112,
-        salt=b"\x00" * 32,
-        info=MEDIA_INFO_BY_KIND[record.kind],
-    ).derive(media_key)
-
+    expanded_key = _expand_media_key(media_key, kind)
     iv = expanded_key[:16]
-    cipher_key = expanded_key[16:48]
-    ciphertext = payload[:-10]
-    decryptor = Cipher(algorithms.AES(cipher_key), modes.CBC(iv)).decryptor()
-    padded_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
+    ciphertext = memoryview(payload)[:-MEDIA_MAC_BYTES]
+    mac = hmac.new(expanded_key[48:80], iv, hashlib.sha256)
+    mac.update(ciphertext)
+    if not hmac.compare_digest(mac.digest()[:MEDIA_MAC_BYTES], payload[-MEDIA_MAC_BYTES:]):
+        _count_rejected_payload()
+        return None
 
     try:
+        decryptor = Cipher(algorithms.AES(expanded_key[16:48]), modes.CBC(iv)).decryptor()
+        padded_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
         unpadder = padding.PKCS7(128).unpadder()
         return unpadder.update(padded_plaintext) + unpadder.finalize()
     except ValueError:
         return None
 
 
+@lru_cache(maxsize=MEDIA_KEY_CACHE_SIZE)
+def _expand_media_key(media_key: str, kind: str) -> bytes:
+    """HKDF-expand a media key into iv, cipher key and MAC key (112 bytes).
+
+    Cached because text statuses, their thumbnails and retried downloads
+    expand the same key again and again.
+    """
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=112,
+        salt=b"\x00" * 32,
+        info=MEDIA_INFO_BY_KIND[kind],
+    ).derive(_decode_base64_value(media_key))
+
+
+def _count_rejected_payload() -> None:
+    with _MEDIA_FETCH_LOCK:
+        _MEDIA_FETCH_STATS["rejected_payloads"] += 1
+
+
 def _candidate_urls(record: StatusRecord) -> list[str]:
     urls = [record.url]
     if record.direct_path:
@@ -1713,17 +3947,14 @@ def _kind_from_mimetype(mimetype: str) -> str | None:
     return None
 
 
-def _extract_group(pattern, window: bytes) -> str | None:
-    match = pattern.search(window)
-    if not match:
-        return None
-    return match.group(1).decode("utf-8", "ignore")
+def _matches_sha256(payload: bytes, expected_hash: str | None) -> bool:
+    return _matches_sha256_digest(hashlib.sha256(payload).digest(), expected_hash)
 
 
-def _matches_sha256(payload: bytes, expected_hash: str | None) -> bool:
+def _matches_sha256_digest(digest: bytes, expected_hash: str | None) -> bool:
     if not expected_hash:
         return False
-    actual_hash = base64.b64encode(hashlib.sha256(payload).digest()).decode("ascii").rstrip("=")
+    actual_hash = base64.b64encode(digest).decode("ascii").rstrip("=")
     normalized_expected = expected_hash.rstrip("=")
     if actual_hash == normalized_expected:
         return True
@@ -1741,7 +3972,7 @@ def _decode_base64_value(value: str) -> bytes:
 
 
 def _normalize_direct_path(path: str) -> str:
-    normalized = "".join(char for char in path if char.isprintable())
+    normalized = path if path.isprintable() else "".join(char for char in path if char.isprintable())
     if normalized.startswith("../"):
         normalized = normalized[2:]
     if not normalized.startswith("/"):
@@ -1752,7 +3983,7 @@ def _normalize_direct_path(path: str) -> str:
 def _normalize_extracted_url(url: str | None) -> str | None:
     if not url:
         return None
-    sanitized = "".join(char for char in url if char.isprintable())
+    sanitized = url if url.isprintable() else "".join(char for char in url if char.isprintable())
     parsed = urlparse(sanitized)
     if parsed.scheme != "https" or parsed.netloc != "mmg.whatsapp.net":
         return None